@@ -11,6 +11,7 @@ from yaml import dump as yaml_dump
 
 from backend.utils import Config, Logger
 
+from .routers import WordlistValidationError
 from .routers.projects_router import ProjectsRouter
 from .routers.settings_router import SettingsRouter
 
@@ -80,6 +81,13 @@ def internal_exception_handler(request: Request, exc: Exception) -> JSONResponse
     )
 
 
+def wordlist_validation_handler(request: Request, exc: WordlistValidationError) -> JSONResponse:
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"detail": exc.detail, "positions": exc.positions},
+    )
+
+
 def create_api() -> FastAPI:
     logger = Logger.get_logger()
     with open("version.txt") as f:
@@ -111,6 +119,7 @@ def create_api() -> FastAPI:
     api.include_router(ProjectsRouter)
     api.include_router(SettingsRouter)
     api.add_exception_handler(status.HTTP_500_INTERNAL_SERVER_ERROR, internal_exception_handler)
+    api.add_exception_handler(WordlistValidationError, wordlist_validation_handler)
 
     @api.get(
         "/openapi.yaml",
@@ -1,12 +1,17 @@
 from .cell import Cell  # noqa: F401
 from .enums import (  # noqa: F401
     BoardImageEnum,
+    ColourModeEnum,
     DirectionEnum,
     LayoutEnum,
     PageTypeEnum,
+    PreviewFormatEnum,
+    PreviewPageEnum,
     SizeEnum,
 )
+from .grid import DIRECTION_BITS, PuzzleGrid  # noqa: F401
 from .grid_size import GridSize  # noqa: F401
+from .placement import WordPlacement  # noqa: F401
 from .profanity import ProfanityList, ProfanityPatch  # noqa: F401
 from .project_config import ProjectConfig  # noqa: F401
 from .projects import (  # noqa: F401
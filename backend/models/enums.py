@@ -24,6 +24,23 @@ class LayoutEnum(StrEnum):
     DOUBLE = "DOUBLE"
 
 
+class ColourModeEnum(StrEnum):
+    CMYK = "CMYK"
+    GRAYSCALE = "GRAYSCALE"
+    BILEVEL = "BILEVEL"
+
+
 class PageTypeEnum(StrEnum):
     RECTO = "RECTO"
     VERSO = "VERSO"
+
+
+class PreviewPageEnum(StrEnum):
+    PUZZLE = "PUZZLE"
+    WORDLIST = "WORDLIST"
+    SOLUTION = "SOLUTION"
+
+
+class PreviewFormatEnum(StrEnum):
+    PNG = "PNG"
+    SVG = "SVG"
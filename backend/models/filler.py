@@ -0,0 +1,113 @@
+import random
+
+from backend.utils import ProfanityAutomaton
+
+from .grid import PuzzleGrid
+
+LETTER_WEIGHTS: dict[str, float] = {
+    "E": 12.7,
+    "T": 9.1,
+    "A": 8.2,
+    "O": 7.5,
+    "I": 7.0,
+    "N": 6.7,
+    "S": 6.3,
+    "H": 6.1,
+    "R": 6.0,
+    "D": 4.3,
+    "L": 4.0,
+    "C": 2.8,
+    "U": 2.8,
+    "M": 2.4,
+    "W": 2.4,
+    "F": 2.2,
+    "G": 2.0,
+    "Y": 2.0,
+    "P": 1.9,
+    "B": 1.5,
+    "V": 0.98,
+    "K": 0.77,
+    "J": 0.16,
+    "X": 0.15,
+    "Q": 0.12,
+    "Z": 0.074,
+}
+
+LINE_STEPS: tuple[tuple[int, int], ...] = ((1, 0), (0, 1), (1, 1), (1, -1))
+
+
+class ProfanityAwareFiller:
+    """
+    Fills the empty cells of a grid with weighted random letters, without completing a word of
+    the profanity list along any of the eight line directions through a cell.
+
+    Cells are filled in row-major order. For each cell a letter is drawn with the usual letter
+    frequency weighting and run through the automaton along the row, column and both diagonals
+    through the cell, forwards and backwards, over the letters already decided within reach of
+    the longest profane word. A letter that completes a match covering the cell is rejected and
+    the draw is repeated without it. If every letter is rejected the cell gets an unconstrained
+    draw and the profanity check after generation reports it.
+
+    :ivar grid: The grid to fill, its answer cells are left untouched.
+    :type grid: PuzzleGrid
+    :ivar automaton: The automaton of the profanity list.
+    :type automaton: ProfanityAutomaton
+    :ivar rng: The random generator to draw letters from.
+    :type rng: random.Random
+    """
+
+    def __init__(self, grid: PuzzleGrid, automaton: ProfanityAutomaton, rng: random.Random) -> None:
+        self.grid: PuzzleGrid = grid
+        self.automaton: ProfanityAutomaton = automaton
+        self.rng: random.Random = rng
+
+    def fill(self) -> list[str]:
+        """
+        Chooses a letter for every empty cell.
+
+        :return: The letters for the empty cells in row-major order, as expected by ``PuzzleGrid.fill_empty``.
+        """
+        is_answer = self.grid.is_answer.tolist()
+        letters: list[list[str | None]] = [
+            [chr(letter) if answer else None for letter, answer in zip(row, answers)]
+            for row, answers in zip(self.grid.letters.tolist(), is_answer)
+        ]
+        filler: list[str] = []
+        for y in range(self.grid.rows):
+            for x in range(self.grid.columns):
+                if letters[y][x] is None:
+                    letters[y][x] = self._choose_letter(letters, x, y)
+                    filler.append(letters[y][x])
+        return filler
+
+    def _choose_letter(self, letters: list[list[str | None]], x: int, y: int) -> str:
+        population = list(LETTER_WEIGHTS.keys())
+        weights = list(LETTER_WEIGHTS.values())
+        while len(population) > 0:
+            letter = self.rng.choices(population=population, weights=weights)[0]
+            if not self._completes_profanity(letters, x, y, letter):
+                return letter
+            index = population.index(letter)
+            del population[index]
+            del weights[index]
+        return self.rng.choices(population=list(LETTER_WEIGHTS.keys()), weights=list(LETTER_WEIGHTS.values()))[0]
+
+    def _completes_profanity(self, letters: list[list[str | None]], x: int, y: int, letter: str) -> bool:
+        reach = self.automaton.max_length - 1
+        for step_x, step_y in LINE_STEPS:
+            before = self._decided_run(letters, x, y, -step_x, -step_y, reach)
+            after = self._decided_run(letters, x, y, step_x, step_y, reach)
+            line = "".join(reversed(before)) + letter + "".join(after)
+            centre = len(before)
+            for text, index in ((line, centre), (line[::-1], len(line) - 1 - centre)):
+                if any(start <= index < end for start, end, _ in self.automaton.search(text)):
+                    return True
+        return False
+
+    def _decided_run(self, letters: list[list[str | None]], x: int, y: int, step_x: int, step_y: int, reach: int) -> list[str]:
+        run: list[str] = []
+        x, y = x + step_x, y + step_y
+        while len(run) < reach and 0 <= x < self.grid.columns and 0 <= y < self.grid.rows and letters[y][x] is not None:
+            run.append(letters[y][x])
+            x, y = x + step_x, y + step_y
+        return run
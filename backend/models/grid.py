@@ -0,0 +1,374 @@
+import random
+from typing import Any, Iterator, NamedTuple
+
+import numpy as np
+from pydantic import GetCoreSchemaHandler
+from pydantic_core import core_schema
+
+from .cell import Cell
+from .enums import DirectionEnum
+
+EMPTY_LETTER = ord(".")
+
+DIRECTION_BITS: dict[DirectionEnum, int] = {
+    DirectionEnum.NS: 1,
+    DirectionEnum.EW: 2,
+    DirectionEnum.NESW: 4,
+    DirectionEnum.NWSE: 8,
+}
+
+DIRECTION_STEPS: dict[DirectionEnum, tuple[int, int]] = {
+    DirectionEnum.NS: (1, 0),
+    DirectionEnum.EW: (0, 1),
+    DirectionEnum.NESW: (-1, 1),
+    DirectionEnum.NWSE: (1, 1),
+}
+
+
+class WordSlot(NamedTuple):
+    row: int
+    col: int
+    direction: DirectionEnum
+    reversed: bool
+
+
+class PuzzleGrid:
+    """
+    Compact array backed storage for the cells of a puzzle board.
+
+    Each property of a cell is held in its own ``rows x columns`` numpy array so that
+    placement, density and profanity checks can work on whole rows, columns or the
+    entire board at once. :class:`Cell` models are only built as views when the grid
+    crosses the API/JSON boundary, where the grid is (de)serialised as ``list[list[Cell]]``
+    so the wire format is unchanged.
+
+    Alongside the arrays the grid keeps a bitboard index of its answer cells for the placement
+    hot path: one integer bitmask per letter, one for occupancy and one per direction. Cell
+    ``(x, y)`` is bit ``y * (columns + 1) + x``, the extra guard column is never set so that a
+    shifted mask cannot wrap from the end of one row into the next.
+
+    :ivar rows: The height of the grid in cells.
+    :type rows: int
+    :ivar columns: The width of the grid in cells.
+    :type columns: int
+    :ivar letters: The letter in each cell as an ASCII code, ``.`` for an empty cell.
+    :type letters: np.ndarray
+    :ivar directions: Bitmask of the answer directions passing through each cell, see ``DIRECTION_BITS``.
+    :type directions: np.ndarray
+    :ivar is_answer: Whether each cell is part of an answer.
+    :type is_answer: np.ndarray
+    :ivar is_profane: Whether each cell is part of a profane word.
+    :type is_profane: np.ndarray
+    """
+
+    def __init__(self, rows: int, columns: int) -> None:
+        self.rows: int = rows
+        self.columns: int = columns
+        self.letters: np.ndarray = np.full((rows, columns), EMPTY_LETTER, dtype=np.uint8)
+        self.directions: np.ndarray = np.zeros((rows, columns), dtype=np.uint8)
+        self.is_answer: np.ndarray = np.zeros((rows, columns), dtype=bool)
+        self.is_profane: np.ndarray = np.zeros((rows, columns), dtype=bool)
+        self._stride: int = columns + 1
+        self._board: int = sum(((1 << columns) - 1) << (y * self._stride) for y in range(rows))
+        self._letter_bits: dict[int, int] = {}
+        self._occupied_bits: int = 0
+        self._direction_bits: dict[DirectionEnum, int] = {direction: 0 for direction in DirectionEnum}
+        self._steps: dict[DirectionEnum, int] = {
+            DirectionEnum.NS: self._stride,
+            DirectionEnum.EW: 1,
+            DirectionEnum.NESW: -self._stride + 1,
+            DirectionEnum.NWSE: self._stride + 1,
+        }
+
+    def _rebuild_index(self) -> None:
+        self._letter_bits = {}
+        self._occupied_bits = 0
+        self._direction_bits = {direction: 0 for direction in DirectionEnum}
+        for y, x in zip(*np.nonzero(self.is_answer)):
+            self._index_cell(int(x), int(y))
+
+    def _index_cell(self, x: int, y: int) -> None:
+        bit = 1 << (y * self._stride + x)
+        letter = int(self.letters[y, x])
+        self._letter_bits[letter] = self._letter_bits.get(letter, 0) | bit
+        self._occupied_bits |= bit
+        for direction, direction_bit in DIRECTION_BITS.items():
+            if self.directions[y, x] & direction_bit:
+                self._direction_bits[direction] |= bit
+
+    def copy(self) -> "PuzzleGrid":
+        grid = PuzzleGrid(rows=self.rows, columns=self.columns)
+        grid.letters = self.letters.copy()
+        grid.directions = self.directions.copy()
+        grid.is_answer = self.is_answer.copy()
+        grid.is_profane = self.is_profane.copy()
+        grid._letter_bits = self._letter_bits.copy()
+        grid._occupied_bits = self._occupied_bits
+        grid._direction_bits = self._direction_bits.copy()
+        return grid
+
+    @property
+    def answer_count(self) -> int:
+        return int(np.count_nonzero(self.is_answer))
+
+    @staticmethod
+    def word_coords(row: int, col: int, direction: DirectionEnum, length: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the row and column indices of a word of ``length`` letters laid out from
+        ``(row, col)`` in ``direction``.
+
+        :param row: The row of the first letter.
+        :param col: The column of the first letter.
+        :param direction: The direction the word runs in.
+        :param length: The number of letters in the word.
+        :return: A tuple of row indices and column indices.
+        """
+        step_row, step_col = DIRECTION_STEPS[direction]
+        offsets = np.arange(length)
+        return row + step_row * offsets, col + step_col * offsets
+
+    def can_place(self, word: str, row: int, col: int, direction: DirectionEnum) -> bool:
+        """
+        Checks whether ``word`` fits at ``(row, col)`` in ``direction``, every cell must be
+        empty or already hold the same letter from an answer running in another direction.
+        """
+        rr, cc = self.word_coords(row, col, direction, len(word))
+        encoded = np.frombuffer(word.encode("ascii"), dtype=np.uint8)
+        free = ~self.is_answer[rr, cc]
+        shared = (self.letters[rr, cc] == encoded) & ((self.directions[rr, cc] & DIRECTION_BITS[direction]) == 0)
+        return bool(np.all(free | shared))
+
+    def find_slots(self, word: str) -> list[WordSlot]:
+        """
+        Enumerates every slot where ``word`` can be placed in the current grid.
+
+        Both the forward and the reversed spelling are checked in every direction, see
+        :meth:`_feasible_origins` for how the origins are found.
+
+        :param word: The word to place, upper case with spaces and hyphens removed.
+        :return: A list of feasible slots, empty if the word cannot be placed anywhere.
+        """
+        slots: list[WordSlot] = []
+        for direction, word_reversed, feasible in self._feasible_origins(word):
+            rows, cols = self._origins(feasible)
+            slots.extend(WordSlot(row, col, direction, word_reversed) for row, col in zip(rows.tolist(), cols.tolist()))
+        return slots
+
+    def pick_slot(self, word: str, rng: random.Random) -> WordSlot | None:
+        """
+        Picks one of the slots of :meth:`find_slots` uniformly at random, only the chosen slot
+        is built.
+
+        :param word: The word to place, upper case with spaces and hyphens removed.
+        :param rng: The random generator to pick with.
+        :return: The chosen slot, or None if the word cannot be placed anywhere.
+        """
+        origins = list(self._feasible_origins(word))
+        pick = rng.randrange(sum(feasible.bit_count() for *_, feasible in origins)) if len(origins) > 0 else -1
+        for direction, word_reversed, feasible in origins:
+            count = feasible.bit_count()
+            if pick < count:
+                rows, cols = self._origins(feasible)
+                return WordSlot(int(rows[pick]), int(cols[pick]), direction, word_reversed)
+            pick -= count
+        return None
+
+    def _origins(self, feasible: int) -> tuple[np.ndarray, np.ndarray]:
+        size = (self.rows * self._stride + 7) // 8
+        bits = np.unpackbits(np.frombuffer(feasible.to_bytes(size, "little"), dtype=np.uint8), bitorder="little")
+        return np.divmod(np.flatnonzero(bits), self._stride)
+
+    def count_slots(self, word: str) -> int:
+        """Returns ``len(self.find_slots(word))`` without building the slots."""
+        return sum(feasible.bit_count() for *_, feasible in self._feasible_origins(word))
+
+    def slot_cover(self, word: str) -> tuple[int, int]:
+        """
+        Returns the number of slots of ``word`` and the bitmask of the cells covered by any of them.
+        Placing a word only removes slots, and only slots through the cells it covers, so the
+        count of a word can only change when a placement touches its cover.
+        """
+        count = 0
+        cover = 0
+        for direction, _, feasible in self._feasible_origins(word):
+            count += feasible.bit_count()
+            cover |= self._smear(feasible, self._steps[direction], len(word))
+        return count, cover
+
+    @staticmethod
+    def _smear(mask: int, step: int, length: int) -> int:
+        """Returns the union of ``mask`` shifted by ``0`` to ``length - 1`` steps, in doubling shifts."""
+        span = 1
+        while span < length:
+            shift = min(span, length - span) * step
+            mask |= mask << shift if shift >= 0 else mask >> -shift
+            span += min(span, length - span)
+        return mask
+
+    def word_mask(self, row: int, col: int, direction: DirectionEnum, length: int) -> int:
+        """Returns the bitmask of the cells of a word of ``length`` letters laid out from ``(row, col)``."""
+        step = self._steps[direction]
+        origin = row * self._stride + col
+        return sum(1 << (origin + i * step) for i in range(length))
+
+    def _feasible_origins(self, word: str) -> Iterator[tuple[DirectionEnum, bool, int]]:
+        """
+        Yields the bitmask of feasible origins for each direction and spelling of ``word``.
+
+        A cell can take letter ``L`` in a direction when it is free, or already holds ``L`` from an
+        answer that does not run in that direction. The mask of those cells is shifted back by
+        ``i`` steps for the ``i``-th letter and the masks are and-ed, so the bits left set are the
+        origins at which every letter fits. Cells past the edge of the grid are never set in the
+        masks, which also rules out origins whose word would leave the grid.
+        """
+        if len(word) == 0:
+            return
+        encoded = word.encode("ascii")
+        spellings = [(False, encoded)] if word == word[::-1] else [(False, encoded), (True, encoded[::-1])]
+        free = self._board & ~self._occupied_bits
+        for direction, step in self._steps.items():
+            open_direction = ~self._direction_bits[direction]
+            fits: dict[int, int] = {}
+            for word_reversed, letters in spellings:
+                feasible = self._board
+                for i, letter in enumerate(letters):
+                    if letter not in fits:
+                        fits[letter] = free | (self._letter_bits.get(letter, 0) & open_direction)
+                    shift = i * step
+                    feasible &= fits[letter] >> shift if shift >= 0 else fits[letter] << -shift
+                    if not feasible:
+                        break
+                if feasible:
+                    yield direction, word_reversed, feasible
+
+    def set_word(self, word: str, row: int, col: int, direction: DirectionEnum) -> None:
+        rr, cc = self.word_coords(row, col, direction, len(word))
+        self.letters[rr, cc] = np.frombuffer(word.encode("ascii"), dtype=np.uint8)
+        self.directions[rr, cc] |= DIRECTION_BITS[direction]
+        self.is_answer[rr, cc] = True
+        for y, x in zip(rr, cc):
+            self._index_cell(int(x), int(y))
+
+    def remove_word(self, row: int, col: int, direction: DirectionEnum, length: int) -> None:
+        """
+        Undoes the :meth:`set_word` of the last word placed at ``(row, col)`` in ``direction``. The
+        cells lose the direction of the word, and cells no other answer runs through become empty.
+        """
+        rr, cc = self.word_coords(row, col, direction, length)
+        direction_bit = DIRECTION_BITS[direction]
+        self.directions[rr, cc] &= ~np.uint8(direction_bit)
+        for y, x in zip(rr.tolist(), cc.tolist()):
+            bit = 1 << (y * self._stride + x)
+            self._direction_bits[direction] &= ~bit
+            if self.directions[y, x] == 0:
+                letter = int(self.letters[y, x])
+                self._letter_bits[letter] &= ~bit
+                self._occupied_bits &= ~bit
+                self.letters[y, x] = EMPTY_LETTER
+                self.is_answer[y, x] = False
+
+    def set_letter(self, x: int, y: int, letter: str) -> None:
+        self.letters[y, x] = ord(letter)
+        if self.is_answer[y, x]:
+            self._rebuild_index()
+
+    def fill_empty(self, letters: list[str]) -> None:
+        """Writes ``letters`` into the cells that are not part of an answer, in row-major order."""
+        self.letters[~self.is_answer] = np.frombuffer("".join(letters).encode("ascii"), dtype=np.uint8)
+
+    def line_coords(self) -> dict[str, list[tuple[int, int]]]:
+        """
+        Returns the ``(x, y)`` coordinates of every row, column and diagonal of the grid,
+        keyed by the line names used in ``Puzzle.profanity``.
+        """
+        lines: dict[str, list[tuple[int, int]]] = {}
+        for y in range(self.rows):
+            lines[f"row{y}"] = [(x, y) for x in range(self.columns)]
+        for x in range(self.columns):
+            lines[f"col{x}"] = [(x, y) for y in range(self.rows)]
+        for j in range(-self.rows + 1, self.columns):
+            nwse_cords = f"0-{-j}" if j <= 0 else f"{j}-0"
+            nesw_cords = f"0-{self.rows + j}" if j <= 0 else f"{j}-{self.rows}"
+            steps = range(max(0, -j), min(self.rows, self.columns - j))
+            lines[f"nwse{nwse_cords}"] = [(i + j, i) for i in steps]
+            lines[f"swne{nesw_cords}"] = [(i + j, self.rows - 1 - i) for i in steps]
+        return lines
+
+    def lines_through(self, x: int, y: int) -> dict[str, list[tuple[int, int]]]:
+        """
+        Returns the ``(x, y)`` coordinates of the row, column and both diagonals through ``(x, y)``,
+        keyed by the same names as :meth:`line_coords`.
+        """
+        nwse = x - y
+        swne = x + y - self.rows + 1
+        nwse_cords = f"0-{-nwse}" if nwse <= 0 else f"{nwse}-0"
+        swne_cords = f"0-{self.rows + swne}" if swne <= 0 else f"{swne}-{self.rows}"
+        return {
+            f"row{y}": [(i, y) for i in range(self.columns)],
+            f"col{x}": [(x, i) for i in range(self.rows)],
+            f"nwse{nwse_cords}": [(i + nwse, i) for i in range(max(0, -nwse), min(self.rows, self.columns - nwse))],
+            f"swne{swne_cords}": [
+                (i + swne, self.rows - 1 - i) for i in range(max(0, -swne), min(self.rows, self.columns - swne))
+            ],
+        }
+
+    def value(self, x: int, y: int) -> str:
+        return chr(self.letters[y, x])
+
+    def cell(self, x: int, y: int) -> Cell:
+        """Builds a :class:`Cell` view of the cell at ``(x, y)``."""
+        bits = int(self.directions[y, x])
+        return Cell(
+            loc_x=x,
+            loc_y=y,
+            value=chr(self.letters[y, x]),
+            is_answer=bool(self.is_answer[y, x]),
+            is_profane=bool(self.is_profane[y, x]),
+            direction={direction: bool(bits & bit) for direction, bit in DIRECTION_BITS.items()},
+        )
+
+    def to_cells(self) -> list[list[Cell]]:
+        return [[self.cell(x, y) for x in range(self.columns)] for y in range(self.rows)]
+
+    @classmethod
+    def from_cells(cls, cells: list[list[Cell]]) -> "PuzzleGrid":
+        rows = len(cells)
+        columns = len(cells[0]) if rows > 0 else 0
+        grid = cls(rows=rows, columns=columns)
+        for row in cells:
+            for cell in row:
+                grid.letters[cell.loc_y, cell.loc_x] = ord(cell.value)
+                grid.is_answer[cell.loc_y, cell.loc_x] = cell.is_answer
+                grid.is_profane[cell.loc_y, cell.loc_x] = cell.is_profane
+                grid.directions[cell.loc_y, cell.loc_x] = sum(
+                    bit for direction, bit in DIRECTION_BITS.items() if cell.direction.get(direction, False)
+                )
+        grid._rebuild_index()
+        return grid
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, PuzzleGrid):
+            return NotImplemented
+        return (
+            self.rows == other.rows
+            and self.columns == other.columns
+            and np.array_equal(self.letters, other.letters)
+            and np.array_equal(self.directions, other.directions)
+            and np.array_equal(self.is_answer, other.is_answer)
+            and np.array_equal(self.is_profane, other.is_profane)
+        )
+
+    def __repr__(self) -> str:
+        return f"PuzzleGrid(rows={self.rows}, columns={self.columns})"
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source_type: Any, handler: GetCoreSchemaHandler) -> core_schema.CoreSchema:
+        cells_schema = handler.generate_schema(list[list[Cell]])
+        from_cells_schema = core_schema.no_info_after_validator_function(cls.from_cells, cells_schema)
+        return core_schema.json_or_python_schema(
+            json_schema=from_cells_schema,
+            python_schema=core_schema.union_schema([core_schema.is_instance_schema(cls), from_cells_schema]),
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                lambda grid: grid.to_cells(), return_schema=cells_schema
+            ),
+        )
@@ -0,0 +1,48 @@
+from pydantic import BaseModel, Field
+
+from .enums import DirectionEnum
+from .grid import DIRECTION_STEPS, WordSlot
+
+
+class WordPlacement(BaseModel):
+    """
+    Records where a word of the search list was placed in the grid.
+
+    The word is laid out from ``start`` in ``direction``. When ``reversed`` is set the word was
+    written back to front, so it reads from the last cell of the placement to ``start``.
+
+    :ivar word: The normalised word as it appears in the search list.
+    :type word: str
+    :ivar start: The ``(x, y)`` coordinates of the first cell of the placement.
+    :type start: tuple[int, int]
+    :ivar direction: The direction the placement runs in from ``start``.
+    :type direction: DirectionEnum
+    :ivar reversed: Whether the word was written back to front.
+    :type reversed: bool
+    """
+
+    word: str = Field(..., description="The normalised word that was placed", min_length=1)
+    start: tuple[int, int] = Field(..., description="The (x, y) coordinates of the first cell of the placement")
+    direction: DirectionEnum = Field(..., description="The direction the placement runs in from the start")
+    reversed: bool = Field(default=False, description="Whether the word was written back to front")
+
+    @classmethod
+    def from_slot(cls, word: str, slot: WordSlot) -> "WordPlacement":
+        return cls(word=word, start=(slot.col, slot.row), direction=slot.direction, reversed=slot.reversed)
+
+    @property
+    def step(self) -> tuple[int, int]:
+        """The ``(x, y)`` offset from one cell of the placement to the next."""
+        step_row, step_col = DIRECTION_STEPS[self.direction]
+        return step_col, step_row
+
+    @property
+    def end(self) -> tuple[int, int]:
+        """The ``(x, y)`` coordinates of the last cell of the placement."""
+        step_x, step_y = self.step
+        return self.start[0] + step_x * (len(self.word) - 1), self.start[1] + step_y * (len(self.word) - 1)
+
+    def coords(self) -> list[tuple[int, int]]:
+        """Returns the ``(x, y)`` coordinates of the cells of the placement, from ``start`` to ``end``."""
+        step_x, step_y = self.step
+        return [(self.start[0] + step_x * i, self.start[1] + step_y * i) for i in range(len(self.word))]
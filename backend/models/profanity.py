@@ -1,7 +1,7 @@
 from pathlib import Path as FilePath
 
 from pydantic import BaseModel, Field
-from backend.utils import get_profanity_list
+from backend.utils import get_profanity_automaton, get_profanity_index, get_profanity_list, get_profanity_version
 
 
 class ProfanityList(BaseModel):
@@ -14,6 +14,9 @@ class ProfanityList(BaseModel):
         with open(filename, "w") as fd:
             fd.write("\n".join(self.word_list))
         get_profanity_list.cache_clear()
+        get_profanity_index.cache_clear()
+        get_profanity_version.cache_clear()
+        get_profanity_automaton.cache_clear()
 
 
 class ProfanityPatch(BaseModel):
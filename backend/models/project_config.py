@@ -3,6 +3,8 @@ from pathlib import Path as FilePath
 
 from pydantic import BaseModel, Field
 
+from .enums import ColourModeEnum
+
 
 class ProjectConfig(BaseModel):
     dpi: int = Field(..., description="DPI for the output PDF")
@@ -38,6 +40,10 @@ class ProjectConfig(BaseModel):
     solution_page_rows: int = Field(..., description="Number of rows for solution pages")
     solution_page_banner_height_inches: float = Field(..., description="Banner height in inches for solution pages")
     solution_page_banner_font_size_inches: float = Field(..., description="Banner font size in inches for solution pages")
+    colour_mode: ColourModeEnum = Field(
+        default=ColourModeEnum.CMYK,
+        description="Colour mode of the printed pages, GRAYSCALE and BILEVEL pages are losslessly compressed black ink",
+    )
 
     @property
     def page_height_pixels(self) -> int:
@@ -185,6 +191,9 @@ class ProjectConfig(BaseModel):
     min_density: float = Field(..., description="Minimum density for puzzle generation")
     max_placement_attempts: int = Field(..., description="Maximum number of placement attempts for puzzle generation")
     enable_profanity_filter: bool = Field(..., description="Enable profanity filter for puzzle generation")
+    puzzle_candidates: int = Field(
+        default=1, ge=1, description="Number of candidate grids generated per puzzle, the best scoring one is kept"
+    )
 
     @property
     def max_columns(self) -> int:
@@ -198,6 +207,13 @@ class ProjectConfig(BaseModel):
     def max_rows(self) -> int:
         return self.grid_height_two_page // self.min_cell_size
 
+    def scaled(self, scale: float) -> "ScaledProjectConfig":
+        """
+        Returns a copy of the config whose pixel sizes are ``scale`` times these, for drawing a
+        reduced copy of a page element directly, see :class:`ScaledProjectConfig`.
+        """
+        return ScaledProjectConfig.model_validate({**self.model_dump(), "dpi": self.dpi * scale})
+
     def save_config(self, filename: FilePath) -> None:
         with open(filename, "w") as fd:
             fd.write(self.model_dump_json(indent=2))
@@ -206,3 +222,13 @@ class ProjectConfig(BaseModel):
     def get_project_settings_defaults() -> dict:
         with open(FilePath("backend/project_settings.json"), "r") as fd:
             return json.load(fd)
+
+
+class ScaledProjectConfig(ProjectConfig):
+    """
+    A :class:`ProjectConfig` drawn at a fraction of the dpi of the book, as returned by
+    :meth:`ProjectConfig.scaled`. Only the dpi differs and it may be fractional, the pixel sizes
+    are rounded down from it just as they are at the full dpi.
+    """
+
+    dpi: float = Field(..., gt=0, description="Fractional DPI the pixel sizes are computed at")
@@ -1,14 +1,28 @@
 import bisect
+import hashlib
+import heapq
 import random
+from math import ceil
+from typing import Any
 
-import numpy as np
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
-from backend.utils import Logger, get_profanity_list
+from backend.utils import Logger, get_profanity_automaton, get_profanity_version
 
-from .cell import Cell
-from .enums import DirectionEnum, LayoutEnum
+from .enums import LayoutEnum
+from .filler import LETTER_WEIGHTS, ProfanityAwareFiller
+from .grid import PuzzleGrid
+from .placement import WordPlacement
 from .project_config import ProjectConfig
+from .solver import DensitySolver
+
+SEED_RANGE = 2**32
+DENSITY_TOLERANCE = 1e-9
+PAGE_FIELDS = {"display_title", "rows", "columns", "cells", "puzzle_search_list", "placements", "long_fact", "density"}
+
+
+def new_seed() -> int:
+    return random.randrange(SEED_RANGE)
 
 
 class Puzzle(BaseModel):
@@ -23,15 +37,45 @@ class Puzzle(BaseModel):
     short_fact: str = Field(default="", description="the short fact of the puzzle")
     rows: int = Field(..., description="the height of the board in cells", ge=0)
     columns: int = Field(..., description="the width of the board in cells", ge=0)
-    cells: list[list[Cell]] = Field(
-        default_factory=lambda data: [[Cell(loc_y=h, loc_x=w) for w in range(data["columns"])] for h in range(data["rows"])],
+    cells: PuzzleGrid = Field(
+        default_factory=lambda data: PuzzleGrid(rows=data["rows"], columns=data["columns"]),
         description="the cells of the board",
     )
     puzzle_search_list: list[str] = Field(default_factory=list, description="the words used in this puzzle")
+    placements: list[WordPlacement] = Field(
+        default_factory=list, description="where each word of the search list was placed in the grid"
+    )
     density: float = Field(default=0.0, description="the density of words in the puzzle")
     profanity: dict[str, list[dict[str, str | bool | tuple[int, int] | list[tuple[int, int]]]]] = Field(
         default_factory=dict, description="the profanity of scores for rows/cols/diags in puzzle"
     )
+    profanity_version: str = Field(
+        default="", description="the version of the profanity list the profanity was last fully checked against"
+    )
+    seed: int = Field(default_factory=new_seed, description="the seed of the random generator used to build the puzzle")
+    _rng: random.Random = PrivateAttr()
+
+    def model_post_init(self, context: Any) -> None:
+        self._rng = random.Random(self.seed)
+
+    @property
+    def score(self) -> tuple[int, float, float]:
+        """
+        Ranks candidate grids of the same puzzle, higher is better: fewer unaccepted profanity hits,
+        then a larger share of the words placed, then a higher density up to ``max_density``. A
+        density within ``DENSITY_TOLERANCE`` of ``max_density`` counts as reaching it.
+        """
+        hits = sum(1 for words in self.profanity.values() for word in words if not word["accepted"])
+        unique_words = len(self._get_normalised_words())
+        placed = len(self.puzzle_search_list) / unique_words if unique_words > 0 else 1.0
+        density = self.density
+        if density >= self.project_config.max_density - DENSITY_TOLERANCE:
+            density = self.project_config.max_density
+        return -hits, placed, density
+
+    @property
+    def has_best_score(self) -> bool:
+        return self.score == (0, 1.0, self.project_config.max_density)
 
     def _get_density(self) -> None:
         if len(self.puzzle_search_list) == 0:
@@ -39,16 +83,20 @@ class Puzzle(BaseModel):
         self.density = self.calculate_density(self.rows, self.columns, self._occupied_cell_count())
 
     def puzzle_reset(self):
-        self.cells = [[Cell(loc_y=h, loc_x=w) for w in range(self.columns)] for h in range(self.rows)]
+        self._rng = random.Random(self.seed)
+        self.cells = PuzzleGrid(rows=self.rows, columns=self.columns)
         self.puzzle_search_list = []
+        self.placements = []
         self.density = 0
         self.profanity = {}
 
     def reset_profanity(self):
         self.profanity = {}
-        for y in range(len(self.cells)):
-            for x in range(len(self.cells[y])):
-                self.cells[y][x].is_profane = False
+        self.cells.is_profane[:] = False
+
+    def reseed(self, seed: int | None = None):
+        self.seed = new_seed() if seed is None else seed
+        self.puzzle_reset()
 
     def change_puzzle_size(self, height: int, width: int):
         self.rows = height
@@ -56,162 +104,111 @@ class Puzzle(BaseModel):
         self.puzzle_reset()
 
     def populate_puzzle(self):
+        """
+        Places the words one at a time without backtracking, longest word first with ties broken
+        at random. Every word is normalised once and drawn from the queue exactly once, it is
+        retired whether it was placed or had no slot left.
+        """
+        words = self._get_normalised_words()
+        queue = [
+            (-len(word), self._rng.random(), word, display_word)
+            for word, display_word in words.items()
+            if display_word not in self.puzzle_search_list
+        ]
+        heapq.heapify(queue)
         attempts = 0
         while (
-            attempts < self.project_config.max_placement_attempts
+            len(queue) > 0
+            and attempts < self.project_config.max_placement_attempts
             and self.density < self.project_config.max_density
-            and len(self.puzzle_search_list) < len(self.input_word_list)
         ):
-            word: str = random.choice(list(set(self.input_word_list) - set(self.puzzle_search_list))).upper()
-            Logger.get_logger().debug(f"placing word {word}")
-            if word in self.puzzle_search_list:
-                continue
-            if self.place_a_word(word.replace(" ", "").replace("-", "").upper()):
-                Logger.get_logger().debug(f"successfully placed {word}")
-                bisect.insort_left(self.puzzle_search_list, word)
+            _, _, word, display_word = heapq.heappop(queue)
+            Logger.get_logger().debug(f"placing word {display_word}")
+            attempts += 1
+            if self.place_a_word(word):
+                Logger.get_logger().debug(f"successfully placed {display_word}")
+                bisect.insort_left(self.puzzle_search_list, display_word)
                 self._get_density()
             else:
-                Logger.get_logger().debug(f"failed to place {word}, trying again (will get another word form input)")
-            attempts += 1
-        self._fill_empty_cells()
+                Logger.get_logger().debug(f"no slot for {display_word}, dropping it from this puzzle")
+        self.fill_empty_cells()
         Logger.get_logger().debug("Puzzle made, checking for profanity")
 
+    def solve_puzzle(self) -> bool:
+        """
+        Fills the puzzle using a backtracking search for a set of placements that reaches
+        ``min_density``, then greedily adds the remaining words up to ``max_density`` and, if
+        ``min_density`` was reached, fills the empty cells. The grid of a failed size is usually
+        thrown away, so its empty cells are left for :meth:`fill_empty_cells`.
+
+        :return: True if ``min_density`` was reached, False if it cannot be reached for the current
+            grid size within ``max_placement_attempts`` placements.
+        """
+        self.puzzle_reset()
+        words = self._get_normalised_words()
+        area = self.rows * self.columns
+        solver = DensitySolver(
+            grid=self.cells,
+            words=list(words),
+            target_cells=ceil(self.project_config.min_density * area),
+            max_steps=self.project_config.max_placement_attempts,
+            rng=self._rng,
+        )
+        reached = solver.solve()
+        solver.extend(ceil(self.project_config.max_density * area))
+        if reached:
+            outcome = "reached"
+        elif solver.exhausted:
+            outcome = "ran out of placements before reaching"
+        else:
+            outcome = "proved it cannot reach"
+        Logger.get_logger().debug(f"solver {outcome} min density after {solver.steps} placements")
+        self.cells = solver.grid
+        self.puzzle_search_list = sorted(words[word] for word in solver.placed)
+        self.placements = [WordPlacement.from_slot(word, slot) for word, slot in solver.placed.items()]
+        self._get_density()
+        if reached:
+            self.fill_empty_cells()
+        return reached
+
+    def _get_normalised_words(self) -> dict[str, str]:
+        """Maps each distinct normalised input word to the upper case word shown in the search list."""
+        words: dict[str, str] = {}
+        for input_word in self.input_word_list:
+            words.setdefault(self.normalise_word(input_word), input_word.upper())
+        return words
+
+    @staticmethod
+    def normalise_word(word: str) -> str:
+        return word.replace(" ", "").replace("-", "").upper()
+
     def place_a_word(self, word: str) -> bool:
-        direction = self._get_direction(word)
-        Logger.get_logger().debug(f"placing word {word} direction {direction}")
-        word_reversed = random.choice([True, False])
-        if word_reversed:
-            Logger.get_logger().debug(f"placing word {word} reversed")
-            word = word[::-1]
-
-        match direction:
-            case DirectionEnum.EW:
-                row = random.randint(0, self.rows - 1)
-                col = random.randint(0, self.columns - len(word))
-                space_available = all(
-                    (
-                        not self.cells[row][c].is_answer
-                        or (self.cells[row][c].value == word[i] and self.cells[row][c].direction != direction)
-                    )
-                    for i, c in enumerate(range(col, col + len(word)))
-                )
-                if space_available:
-                    for i, c in enumerate(range(col, col + len(word))):
-                        self.cells[row][c].set_answer(value=word[i], direction=direction)
-                    return True
-            case DirectionEnum.NWSE:
-                row = random.randint(0, self.rows - len(word))
-                col = random.randint(0, self.columns - len(word))
-
-                space_available = all(
-                    (
-                        not self.cells[r][c].is_answer
-                        or (self.cells[r][c].value == word[i] and self.cells[r][c].direction != direction)
-                    )
-                    for i, (r, c) in enumerate(zip(range(row, row + len(word)), range(col, col + len(word))))
-                )
-                if space_available:
-                    for i, (r, c) in enumerate(zip(range(row, row + len(word)), range(col, col + len(word)))):
-                        self.cells[r][c].set_answer(value=word[i], direction=DirectionEnum(direction))
-                    return True
-            case DirectionEnum.NS:
-                row = random.randint(0, self.rows - len(word))
-                col = random.randint(0, self.columns - 1)
-                space_available = all(
-                    (
-                        not self.cells[r][col].is_answer
-                        or (self.cells[r][col].value == word[i] and self.cells[r][col].direction != direction)
-                    )
-                    for i, r in enumerate(range(row, row + len(word)))
-                )
-                if space_available:
-                    for i, r in enumerate(range(row, row + len(word))):
-                        self.cells[r][col].set_answer(value=word[i], direction=DirectionEnum(direction))
-                    return True
-            case DirectionEnum.NESW:
-                row = random.randint(len(word) - 1, self.rows - 1)
-                col = random.randint(0, self.columns - len(word))
-                space_available = all(
-                    (
-                        not self.cells[r][c].is_answer
-                        or (self.cells[r][c].value == word[i] and self.cells[r][c].direction != direction)
-                    )
-                    for i, (r, c) in enumerate(zip(range(row, row - len(word), -1), range(col, col + len(word))))
-                )
-                if space_available:
-                    for i, (r, c) in enumerate(zip(range(row, row - len(word), -1), range(col, col + len(word)))):
-                        self.cells[r][c].set_answer(value=word[i], direction=DirectionEnum(direction))
-                    return True
-        return False
-
-    def _get_direction(self, word: str) -> DirectionEnum | None:
-        possible_directions = self._get_possible_directions(word)
-        if len(possible_directions) == 0:
-            return None
-        direction = random.choice(possible_directions)
-        return direction
-
-    def _get_possible_directions(self, word: str) -> list[str]:
-        possible_directions = list(DirectionEnum)
-        if len(word) > min(self.rows, self.columns):
-            possible_directions.remove(DirectionEnum.NWSE)
-            possible_directions.remove(DirectionEnum.NESW)
-        if len(word) > self.rows:
-            possible_directions.remove(DirectionEnum.NS)
-        if len(word) > self.columns:
-            possible_directions.remove(DirectionEnum.EW)
-        return possible_directions
+        slot = self.cells.pick_slot(word, self._rng)
+        if slot is None:
+            Logger.get_logger().debug(f"no slot available for word {word}")
+            return False
+        Logger.get_logger().debug(f"placing word {word} direction {slot.direction}{' reversed' if slot.reversed else ''}")
+        self.cells.set_word(word[::-1] if slot.reversed else word, slot.row, slot.col, slot.direction)
+        self.placements.append(WordPlacement.from_slot(word, slot))
+        return True
 
     def get_random_letters(self):
-        weighted_letters = {
-            "E": 12.7,
-            "T": 9.1,
-            "A": 8.2,
-            "O": 7.5,
-            "I": 7.0,
-            "N": 6.7,
-            "S": 6.3,
-            "H": 6.1,
-            "R": 6.0,
-            "D": 4.3,
-            "L": 4.0,
-            "C": 2.8,
-            "U": 2.8,
-            "M": 2.4,
-            "W": 2.4,
-            "F": 2.2,
-            "G": 2.0,
-            "Y": 2.0,
-            "P": 1.9,
-            "B": 1.5,
-            "V": 0.98,
-            "K": 0.77,
-            "J": 0.16,
-            "X": 0.15,
-            "Q": 0.12,
-            "Z": 0.074,
-        }
         total_cells = self.rows * self.columns
         occupied = self._occupied_cell_count()
-        random_list = random.choices(
-            population=list(weighted_letters.keys()), weights=list(weighted_letters.values()), k=total_cells - occupied
+        random_list = self._rng.choices(
+            population=list(LETTER_WEIGHTS.keys()), weights=list(LETTER_WEIGHTS.values()), k=total_cells - occupied
         )
         return random_list
 
-    def _fill_empty_cells(self):
-        random_list = self.get_random_letters()
-        for row in self.cells:
-            for cell in row:
-                if not cell.is_answer:
-                    cell.value = random_list.pop()
-
-    def _occupied_cell_count(self):
-        count = 0
-        for row in self.cells:
-            for cell in row:
-                if cell.is_answer:
-                    count += 1
-        return count
+    def fill_empty_cells(self) -> None:
+        if self.project_config.enable_profanity_filter:
+            filler = ProfanityAwareFiller(grid=self.cells, automaton=get_profanity_automaton(), rng=self._rng)
+            self.cells.fill_empty(filler.fill())
+        else:
+            self.cells.fill_empty(self.get_random_letters())
+
+    def _occupied_cell_count(self) -> int:
+        return self.cells.answer_count
 
     def get_puzzle_layout(self) -> LayoutEnum:
         if 0 < self.rows <= self.project_config.medium_rows:
@@ -220,60 +217,110 @@ class Puzzle(BaseModel):
             return LayoutEnum.DOUBLE
         raise ValueError("You fucked this, wills, you moron")
 
-    def check_for_inadvertent_profanity(self):
+    @property
+    def content_hash(self) -> str:
+        """A hash of the fields of the puzzle that are drawn on its pages, it changes whenever the pages would."""
+        return hashlib.sha256(self.model_dump_json(include=PAGE_FIELDS).encode()).hexdigest()
+
+    @property
+    def profanity_is_stale(self) -> bool:
+        return self.project_config.enable_profanity_filter and self.profanity_version != get_profanity_version()
+
+    def check_for_inadvertent_profanity(self, keep_accepted: bool = False):
+        """
+        Checks every line of the grid for words of the profanity list and records the version of
+        the list that was used.
+
+        :param keep_accepted: Keep the ``accepted`` flag of hits that were already accepted and are
+            still found, otherwise every hit starts unaccepted.
+        """
         if not self.project_config.enable_profanity_filter:
             return
+        accepted = (
+            {name: self._accepted_hits(bad_words) for name, bad_words in self.profanity.items()} if keep_accepted else {}
+        )
         self.reset_profanity()
         grid_strings: dict[str, list[tuple[str, tuple[int, int] | list[tuple[int, int]]]]] = self._get_grid_strings()
         for name, grid_string in grid_strings.items():
-            grid_string_substrings_forward = self._check_grid_string(grid_string)
-            gird_string_substrings_backward = self._check_grid_string(grid_string[::-1], "R")
-            bad_words = grid_string_substrings_forward + gird_string_substrings_backward
+            bad_words = self._check_line(grid_string)
             if len(bad_words) > 0:
+                self._restore_accepted(bad_words, accepted.get(name, set()))
                 for bad_word in bad_words:
                     for coord in bad_word["coords"]:
-                        self.cells[coord[1]][coord[0]].is_profane = True
+                        self.cells.is_profane[coord[1], coord[0]] = True
+                self.profanity[name] = bad_words
+        self.profanity_version = get_profanity_version()
+
+    def recheck_profanity_at(self, x: int, y: int):
+        """
+        Re-checks only the row, column and diagonals through the cell at ``(x, y)`` after its letter
+        changed. The entries of those lines in ``profanity`` are replaced, a hit that is still found
+        keeps its ``accepted`` flag, and the entries of every other line are left untouched.
+
+        :param x: The column of the changed cell.
+        :param y: The row of the changed cell.
+        """
+        if not self.project_config.enable_profanity_filter:
+            return
+        for name, coords in self.cells.lines_through(x, y).items():
+            accepted = self._accepted_hits(self.profanity.get(name, []))
+            bad_words = self._check_line([(self.cells.value(cx, cy), (cx, cy)) for cx, cy in coords])
+            self._restore_accepted(bad_words, accepted)
+            if len(bad_words) > 0:
                 self.profanity[name] = bad_words
+            else:
+                self.profanity.pop(name, None)
+        self.cells.is_profane[:] = False
+        for bad_words in self.profanity.values():
+            for bad_word in bad_words:
+                for coord in bad_word["coords"]:
+                    self.cells.is_profane[coord[1], coord[0]] = True
+
+    @staticmethod
+    def _accepted_hits(bad_words: list[dict]) -> set[tuple[str, str, tuple[int, int]]]:
+        return {
+            (bad_word["word"], bad_word["direction"], tuple(bad_word["word_range"]))
+            for bad_word in bad_words
+            if bad_word["accepted"]
+        }
+
+    @staticmethod
+    def _restore_accepted(bad_words: list[dict], accepted: set[tuple[str, str, tuple[int, int]]]) -> None:
+        for bad_word in bad_words:
+            bad_word["accepted"] = (bad_word["word"], bad_word["direction"], bad_word["word_range"]) in accepted
+
+    def _check_line(
+        self, grid_string: list[tuple[str, tuple[int, int]]]
+    ) -> list[dict[str, str | bool | tuple[int, int] | list[tuple[int, int]]]]:
+        return self._check_grid_string(grid_string) + self._check_grid_string(grid_string[::-1], "R")
 
     def _check_grid_string(
         self, grid_string: list[tuple[str, tuple[int, int]]], direction: str = "F"
     ) -> list[dict[str, str | bool | tuple[int, int] | list[tuple[int, int]]]]:
-        ret_var = []
-        for i in range(len(grid_string)):
-            for j in range(i + 1, len(grid_string) + 1):
-                word = "".join(letter[0] for letter in grid_string[i:j])
-                if self._check_a_word_against_profanity_list(word):
-                    ret_var.append(
-                        {
-                            "word": word,
-                            "accepted": False,
-                            "direction": direction,
-                            "word_range": (i, j),
-                            "coords": [letter[1] for letter in grid_string[i:j]],
-                        }
-                    )
-        return ret_var
+        """
+        Finds every word of the profanity list in a line of the grid with a single pass of the
+        profanity automaton.
 
-    @staticmethod
-    def _check_a_word_against_profanity_list(word: str) -> bool:
-        return word in get_profanity_list()
+        :param grid_string: The letters of the line with their ``(x, y)`` coordinates.
+        :param direction: ``F`` if the line is read forwards, ``R`` if it has been reversed.
+        :return: The matches ordered by ``word_range``.
+        """
+        text = "".join(letter[0] for letter in grid_string)
+        return [
+            {
+                "word": word,
+                "accepted": False,
+                "direction": direction,
+                "word_range": (start, end),
+                "coords": [letter[1] for letter in grid_string[start:end]],
+            }
+            for start, end, word in sorted(get_profanity_automaton().search(text))
+        ]
 
     def _get_grid_strings(self) -> dict[str, list[tuple[str, tuple[int, int]]]]:
-        return_strings: dict[str, list[tuple[str, tuple[int, int]]]] = {}
-        lattice = np.empty((self.rows, self.columns), dtype=object)
-        for row in self.cells:
-            for cell in row:
-                lattice[cell.loc_y, cell.loc_x] = (cell.value, (cell.loc_x, cell.loc_y))
-        for y in range(self.rows):
-            return_strings[f"row{y}"] = [(x[0], x[1]) for x in lattice[y, :]]
-        for x in range(self.columns):
-            return_strings[f"col{x}"] = [(x[0], x[1]) for x in lattice[:, x]]
-        for j in range(-self.rows + 1, self.columns):
-            nwse_cords = f"0-{-j}" if j <= 0 else f"{j}-0"
-            nesw_cords = f"0-{self.rows + j}" if j <= 0 else f"{j}-{self.rows}"
-            return_strings[f"nwse{nwse_cords}"] = [(x[0], x[1]) for x in lattice.diagonal(j)]
-            return_strings[f"swne{nesw_cords}"] = [(x[0], x[1]) for x in np.flipud(lattice).diagonal(j)]
-        return return_strings
+        return {
+            name: [(self.cells.value(x, y), (x, y)) for x, y in coords] for name, coords in self.cells.line_coords().items()
+        }
 
     @staticmethod
     def calculate_density(height: int, width: int, solution_count: int) -> float:
@@ -1,15 +1,23 @@
+import json
+import random
 import string
+from collections.abc import Mapping, MutableMapping
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import partial
 from math import ceil
+from multiprocessing import Manager
 from pathlib import Path as FilePath
+from typing import Callable
 
 from pydantic import BaseModel, Field, computed_field
 
-from backend.utils import Logger, clear_marker_file, set_marker_file
+from backend.utils import Logger, clear_marker_file, has_marker_file, set_marker_file
 
 from .enums import LayoutEnum
 from .grid_size import GridSize
 from .project_config import ProjectConfig
-from .puzzle import Puzzle
+from .puzzle import SEED_RANGE, Puzzle, new_seed
 from .wordlist import PuzzleInput, Wordlist
 
 
@@ -24,6 +32,7 @@ class PuzzleData(BaseModel):
     book_title: str = Field(..., description="Title of the book")
     wordlist: Wordlist = Field(..., description="List of words provided from LLM")
     puzzles: list[Puzzle] = Field(default_factory=list, description="List of created Puzzles")
+    seed: int = Field(default_factory=new_seed, description="The seed from which the seed of each puzzle is derived")
 
     @computed_field
     @property
@@ -39,25 +48,147 @@ class PuzzleData(BaseModel):
             pages += 1
         return pages
 
-    def create_and_save_data(self, filename: FilePath) -> None:
-        self.create_puzzles(filename=filename)
+    def create_and_save_data(self, filename: FilePath, workers: int = 1) -> None:
+        self.create_puzzles(filename=filename, workers=workers)
         self.save_data(filename)
 
-    def create_puzzles(self, filename: FilePath) -> None:
+    def create_puzzles(self, filename: FilePath, workers: int = 1) -> None:
+        """
+        Creates a puzzle for every category of the wordlist. Each category is generated
+        ``puzzle_candidates`` times from different seeds and the candidate with the best score is
+        kept. With more than one worker the candidates are generated in a process pool and the
+        puzzles are collected in category order.
+
+        Candidates that can no longer win are dropped early. The best score so far of each
+        category is shared with the running candidates, a candidate stops before its profanity
+        check once its grid is solved if it cannot beat that score, see :meth:`_is_dominated`. Once
+        a candidate reaches the best possible score the later candidates of its category are not
+        started. A dropped candidate could never have been kept, so the outcome does not depend on
+        completion order.
+
+        :param filename: The puzzle data file, used for the progress marker.
+        :param workers: The number of processes to generate puzzles in.
+        """
         Logger.get_logger().info("Creating puzzles")
-        base = len(self.wordlist.categories)
-        count = 0
-        for category in self.wordlist.categories:
-            self._add_a_puzzle(category)
-            count += 1
-            percentage = int(count / base * 90)
-            set_marker_file(filename, percentage)
+        jobs = [
+            (index, candidate, seed)
+            for index, category in enumerate(self.wordlist.categories)
+            for candidate, seed in enumerate(self.candidate_seeds(self.get_puzzle_id(category.puzzle_topic)))
+        ]
+        best: list[tuple[int, Puzzle] | None] = [None] * len(self.wordlist.categories)
+        if workers > 1 and len(jobs) > 1:
+            dropped = self._create_candidates_in_pool(jobs, best, filename, workers)
+        else:
+            dropped = self._create_candidates(jobs, best, filename)
+        if dropped > 0:
+            Logger.get_logger().info(
+                f"Dropped {dropped} of {len(jobs)} candidates that could not beat the best of their puzzle"
+            )
+        for _, puzzle in best:
+            self._log_puzzle(puzzle)
+            self.puzzles.append(puzzle)
         self._check_fix_puzzle_order()
         set_marker_file(filename, 95)
         self.add_puzzle_display_name()
         set_marker_file(filename, 99)
         Logger.get_logger().info("Completed creating puzzles")
 
+    def _create_candidates(
+        self, jobs: list[tuple[int, int, int]], best: list[tuple[int, Puzzle] | None], filename: FilePath
+    ) -> int:
+        """
+        Creates the candidates of ``jobs`` in order, keeping the best of each category in ``best``.
+
+        :return: The number of candidates dropped or skipped.
+        """
+        best_scores: dict[int, tuple[tuple[int, float, float], int]] = {}
+        dropped = 0
+        for count, (index, candidate, seed) in enumerate(jobs, start=1):
+            puzzle = None
+            if best[index] is None or not best[index][1].has_best_score:
+                puzzle = self._create_a_puzzle(
+                    self.project_config, self.wordlist.categories[index], seed, best_scores, index, candidate
+                )
+            if puzzle is None:
+                dropped += 1
+            else:
+                self._keep_best(best, index, candidate, puzzle, best_scores)
+            set_marker_file(filename, int(count / len(jobs) * 90))
+        return dropped
+
+    def _create_candidates_in_pool(
+        self, jobs: list[tuple[int, int, int]], best: list[tuple[int, Puzzle] | None], filename: FilePath, workers: int
+    ) -> int:
+        """
+        Creates the candidates of ``jobs`` in a process pool, keeping the best of each category in
+        ``best``. The best scores are shared with the workers through a manager when there is more
+        than one candidate per category.
+
+        :return: The number of candidates dropped or cancelled.
+        """
+        dropped = 0
+        shared = Manager() if self.project_config.puzzle_candidates > 1 else nullcontext()
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool, shared as manager:
+            best_scores = manager.dict() if manager is not None else None
+            futures = {
+                pool.submit(
+                    self._create_a_puzzle,
+                    self.project_config,
+                    self.wordlist.categories[index],
+                    seed,
+                    best_scores,
+                    index,
+                    candidate,
+                ): (index, candidate)
+                for index, candidate, seed in jobs
+            }
+            for count, future in enumerate(as_completed(futures), start=1):
+                index, candidate = futures[future]
+                puzzle = None if future.cancelled() else future.result()
+                if puzzle is None:
+                    dropped += 1
+                elif self._keep_best(best, index, candidate, puzzle, best_scores):
+                    for other, (other_index, other_candidate) in futures.items():
+                        if other_index == index and other_candidate > candidate:
+                            other.cancel()
+                set_marker_file(filename, int(count / len(jobs) * 90))
+        return dropped
+
+    @staticmethod
+    def _keep_best(
+        best: list[tuple[int, Puzzle] | None],
+        index: int,
+        candidate: int,
+        puzzle: Puzzle,
+        best_scores: MutableMapping[int, tuple[tuple[int, float, float], int]] | None = None,
+    ) -> bool:
+        """
+        Keeps ``puzzle`` as the best candidate of category ``index`` if it scores higher, ties go to
+        the earlier candidate. The score and candidate number of the best candidate are published
+        in ``best_scores`` for the candidates still running.
+
+        :return: True if the puzzle reaches the best possible score.
+        """
+        current = best[index]
+        if current is None or (puzzle.score, -candidate) > (current[1].score, -current[0]):
+            best[index] = (candidate, puzzle)
+            if best_scores is not None:
+                best_scores[index] = (puzzle.score, candidate)
+        return puzzle.has_best_score
+
+    @staticmethod
+    def _is_dominated(
+        bound: tuple[int, float, float], candidate: int, best_score: tuple[tuple[int, float, float], int] | None
+    ) -> bool:
+        """
+        Returns True if a candidate whose score can be at most ``bound`` cannot be kept over the
+        best candidate so far, it must score lower, or the same as an earlier candidate.
+        """
+        if best_score is None:
+            return False
+        score, best_candidate = best_score
+        return (bound, -candidate) < (tuple(score), -best_candidate)
+
     def save_data(self, filename: FilePath) -> None:
         Logger.get_logger().info(f"Saving puzzles to {filename}")
         with open(filename, "w") as fd:
@@ -65,16 +196,122 @@ class PuzzleData(BaseModel):
         clear_marker_file(filename)
         Logger.get_logger().info(f"Done saving puzzles to {filename}")
 
-    def _add_a_puzzle(self, category: PuzzleInput) -> None:
-        Logger.get_logger().debug(f"Creating puzzle: {category.puzzle_topic}")
+    @staticmethod
+    def rescan_stale_profanity(puzzle_data_path: FilePath) -> tuple[int, "PuzzleData | None"]:
+        """
+        Re-checks the puzzles of a puzzle data file whose profanity results were made with an
+        older version of the profanity list, keeping the accepted flags of hits that are still
+        found. The file is not written, see :meth:`rescan_stale_profanity_files`.
+
+        :param puzzle_data_path: The puzzle data file of a project.
+        :return: The number of puzzles re-checked, and the puzzle data to save if any were stale.
+        """
+        with open(puzzle_data_path, "r") as fd:
+            puzzle_data = PuzzleData(**json.load(fd))
+        stale = [puzzle for puzzle in puzzle_data.puzzles if puzzle.profanity_is_stale]
+        for puzzle in stale:
+            puzzle.check_for_inadvertent_profanity(keep_accepted=True)
+        return len(stale), puzzle_data if len(stale) > 0 else None
+
+    @staticmethod
+    def _save_rescan(
+        puzzle_data_path: FilePath,
+        rescan: Callable[[], tuple[int, "PuzzleData | None"]],
+        before_write: Callable[[FilePath], None] | None,
+    ) -> int:
+        """
+        Saves the result of re-checking one project, a project that fails is logged and skipped
+        so it does not stop the others. The progress marker of the project is always cleared.
+
+        :return: The number of puzzles re-checked.
+        """
+        try:
+            stale, puzzle_data = rescan()
+            if puzzle_data is not None:
+                if before_write is not None:
+                    before_write(puzzle_data_path)
+                puzzle_data.save_data(puzzle_data_path)
+            return stale
+        except Exception as e:
+            Logger.get_logger().error(f"Could not re-check profanity in {puzzle_data_path.parent.name}: {e}")
+            return 0
+        finally:
+            clear_marker_file(puzzle_data_path)
+
+    @staticmethod
+    def rescan_stale_profanity_files(
+        puzzle_data_paths: list[FilePath], workers: int = 1, before_write: Callable[[FilePath], None] | None = None
+    ) -> int:
+        """
+        Re-checks the stale puzzles of several projects, one project per worker process. Projects
+        with an active progress marker are being generated or re-checked already and are skipped.
+        The files are written by this process, ``before_write`` is called with the path of each
+        file just before it is rewritten, so cached copies of it can be dropped.
+
+        :param puzzle_data_paths: The puzzle data files of the projects.
+        :param workers: The number of processes to re-check projects in.
+        :param before_write: Called with the path of a puzzle data file before it is rewritten.
+        :return: The number of puzzles re-checked.
+        """
+        busy = [path for path in puzzle_data_paths if has_marker_file(path)]
+        for path in busy:
+            Logger.get_logger().info(f"Skipped re-checking profanity in {path.parent.name}, it is being worked on")
+        puzzle_data_paths = [path for path in puzzle_data_paths if path not in busy]
+        Logger.get_logger().info(f"Re-checking profanity in {len(puzzle_data_paths)} projects")
+        base = len(puzzle_data_paths)
+        rescanned = 0
+        count = 0
+        for path in puzzle_data_paths:
+            set_marker_file(path, 0)
+        try:
+            if workers > 1 and base > 1:
+                with ProcessPoolExecutor(max_workers=min(workers, base)) as pool:
+                    futures = {pool.submit(PuzzleData.rescan_stale_profanity, path): path for path in puzzle_data_paths}
+                    for future in as_completed(futures):
+                        rescanned += PuzzleData._save_rescan(futures[future], future.result, before_write)
+                        count += 1
+                        Logger.get_logger().info(f"Re-checked profanity in {futures[future].parent.name} ({count}/{base})")
+            else:
+                for path in puzzle_data_paths:
+                    rescanned += PuzzleData._save_rescan(path, partial(PuzzleData.rescan_stale_profanity, path), before_write)
+                    count += 1
+                    Logger.get_logger().info(f"Re-checked profanity in {path.parent.name} ({count}/{base})")
+        finally:
+            for path in puzzle_data_paths:
+                clear_marker_file(path)
+        Logger.get_logger().info(f"Completed re-checking profanity, {rescanned} puzzles were stale")
+        return rescanned
+
+    @staticmethod
+    def _create_a_puzzle(
+        project_config: ProjectConfig,
+        category: PuzzleInput,
+        seed: int,
+        best_scores: Mapping[int, tuple[tuple[int, float, float], int]] | None = None,
+        index: int = 0,
+        candidate: int = 0,
+    ) -> Puzzle | None:
+        """
+        Creates one candidate puzzle for a category, shrinking the grid until the solver reaches
+        ``min_density``.
+
+        Once the grid is solved the share of words placed and the density are final and the
+        profanity check can only lower the score, so if that score cannot beat the best candidate
+        of the category in ``best_scores`` the candidate is dropped before its profanity check.
+
+        :param best_scores: The score and candidate number of the best candidate of each category.
+        :param index: The category of the candidate, its key in ``best_scores``.
+        :param candidate: The number of the candidate within its category.
+        :return: The puzzle, or None if it was dropped.
+        """
+        Logger.get_logger().debug(f"Creating puzzle: {category.puzzle_topic} with seed {seed}")
         len_words = sum(len(word) for word in category.word_list)
-        size = GridSize(self.project_config, len_words, self.project_config.max_density)
+        size = GridSize(project_config, len_words, project_config.max_density)
         Logger.get_logger().debug(f"Puzzle Target Size: {size.columns}x{size.rows}")
         puzzle = Puzzle(
-            project_config=self.project_config,
-            puzzle_id=category.puzzle_topic.strip()
-            .upper()
-            .translate({ord(c): None for c in string.whitespace + string.digits + string.punctuation}),
+            project_config=project_config,
+            puzzle_id=PuzzleData.get_puzzle_id(category.puzzle_topic),
+            seed=seed,
             puzzle_title=category.puzzle_topic,
             input_word_list=category.word_list,
             long_fact=category.introduction,
@@ -82,22 +319,32 @@ class PuzzleData(BaseModel):
             columns=size.columns,
             rows=size.rows,
         )
-        puzzle.populate_puzzle()
-        count = 1
-        while puzzle.density < self.project_config.min_density:
-            Logger.get_logger().debug(f"Puzzle failed density check, trying again, actual density: {puzzle.density}")
-            if count % 5 == 0:
-                Logger.get_logger().debug("Reducing size of Puzzle before retry")
-                if puzzle.rows > puzzle.columns:
-                    puzzle.change_puzzle_size(puzzle.rows - 1, puzzle.columns)
-                else:
-                    puzzle.change_puzzle_size(puzzle.rows, puzzle.columns - 1)
+        best: Puzzle | None = None
+        while not puzzle.solve_puzzle():
+            Logger.get_logger().debug(
+                f"Puzzle cannot reach min density at {puzzle.columns}x{puzzle.rows}, actual density: {puzzle.density}"
+            )
+            if best is None or puzzle.density > best.density:
+                best = puzzle.model_copy(deep=True)
+            if min(puzzle.rows, puzzle.columns) <= 1:
+                Logger.get_logger().warn(f"Puzzle {puzzle.puzzle_title} cannot reach min density, keeping best attempt")
+                puzzle = best
+                puzzle.fill_empty_cells()
+                break
+            Logger.get_logger().debug("Reducing size of Puzzle before retry")
+            if puzzle.rows > puzzle.columns:
+                puzzle.change_puzzle_size(puzzle.rows - 1, puzzle.columns)
             else:
-                puzzle.puzzle_reset()
-            puzzle.populate_puzzle()
-            count += 1
-        if self.project_config.enable_profanity_filter:
+                puzzle.change_puzzle_size(puzzle.rows, puzzle.columns - 1)
+        if best_scores is not None and PuzzleData._is_dominated(puzzle.score, candidate, best_scores.get(index)):
+            Logger.get_logger().debug(f"Dropping candidate {candidate} of {category.puzzle_topic}, it cannot beat the best")
+            return None
+        if project_config.enable_profanity_filter:
             puzzle.check_for_inadvertent_profanity()
+        return puzzle
+
+    @staticmethod
+    def _log_puzzle(puzzle: Puzzle) -> None:
         if len(puzzle.profanity) > 0:
             for row, words in puzzle.profanity.items():
                 Logger.get_logger().warn(f"Profanity found in row {row}, words: {words}")
@@ -106,7 +353,33 @@ class PuzzleData(BaseModel):
             f"of {len(puzzle.input_word_list):02g}, size {puzzle.columns:02g}x{puzzle.rows:02g} with "
             f"a density of {puzzle.density:.2%}"
         )
-        self.puzzles.append(puzzle)
+
+    @staticmethod
+    def get_puzzle_id(puzzle_topic: str) -> str:
+        return (
+            puzzle_topic.strip()
+            .upper()
+            .translate({ord(c): None for c in string.whitespace + string.digits + string.punctuation})
+        )
+
+    @staticmethod
+    def derive_puzzle_seed(book_seed: int, puzzle_id: str) -> int:
+        """
+        Derives the seed of a puzzle from the book seed and the puzzle id, so each puzzle gets an
+        independent random stream that does not depend on the order or number of categories.
+        """
+        return random.Random(f"{book_seed}:{puzzle_id}").randrange(SEED_RANGE)
+
+    def candidate_seeds(self, puzzle_id: str) -> list[int]:
+        """
+        Returns the seeds of the ``puzzle_candidates`` candidates of a puzzle. The first candidate
+        uses the puzzle seed, so a single candidate gives the same puzzle as before.
+        """
+        puzzle_seed = self.derive_puzzle_seed(self.seed, puzzle_id)
+        return [puzzle_seed] + [
+            random.Random(f"{puzzle_seed}:{candidate}").randrange(SEED_RANGE)
+            for candidate in range(1, self.project_config.puzzle_candidates)
+        ]
 
     def _check_fix_puzzle_order(self) -> None:
         length = len(self.puzzles)
@@ -0,0 +1,124 @@
+import random
+
+from .grid import PuzzleGrid, WordSlot
+
+
+class DensitySolver:
+    """
+    Backtracking search for a set of word placements that reaches a target number of answer cells.
+
+    At every step the word with the fewest feasible slots is placed first, words that have no
+    slot left are dropped from the branch, and the branch is abandoned as soon as the words that
+    can still be placed could not cover the missing cells even without overlapping. Every slot
+    of a word is tried before the search carries on without that word. A placement is undone by
+    removing its word from the grid, and after a placement only the words whose slots ran through
+    its cells have their slots counted again, every other count is unchanged. The search is
+    bounded by ``max_steps`` placements, so a failed search either proves the target cannot be
+    reached for this grid size or stops at a predictable cost, see :attr:`exhausted`.
+
+    :ivar grid: The grid being filled.
+    :type grid: PuzzleGrid
+    :ivar words: The normalised words available to the search.
+    :type words: list[str]
+    :ivar target_cells: The number of answer cells the search has to reach.
+    :type target_cells: int
+    :ivar max_steps: The maximum number of placements the search may try.
+    :type max_steps: int
+    :ivar rng: The random generator used to order the slots of a word.
+    :type rng: random.Random
+    :ivar placed: The words placed in the grid with their slots, in placement order.
+    :type placed: dict[str, WordSlot]
+    """
+
+    def __init__(self, grid: PuzzleGrid, words: list[str], target_cells: int, max_steps: int, rng: random.Random) -> None:
+        self.grid: PuzzleGrid = grid
+        self.words: list[str] = words
+        self.target_cells: int = target_cells
+        self.max_steps: int = max_steps
+        self.rng: random.Random = rng
+        self.steps: int = 0
+        self.placed: dict[str, WordSlot] = {}
+
+    @property
+    def exhausted(self) -> bool:
+        """Whether the step budget ran out, a failed search that is not exhausted proved the target impossible."""
+        return self.steps >= self.max_steps
+
+    def solve(self) -> bool:
+        """
+        Searches for placements until the grid holds ``target_cells`` answer cells.
+
+        :return: True if the target was reached, False if it is impossible or the step budget ran out,
+            in which case the grid is left empty.
+        """
+        self.steps = 0
+        options = {word: self.grid.slot_cover(word) for word in self.words}
+        return self._search({word: option for word, option in options.items() if option[0] > 0})
+
+    def extend(self, max_cells: int) -> None:
+        """
+        Greedily places the words the search did not need, most constrained first and without
+        backtracking, until the grid holds ``max_cells`` answer cells or no word fits.
+
+        :param max_cells: The number of answer cells at which to stop.
+        """
+        remaining = [word for word in self.words if word not in self.placed]
+        while len(remaining) > 0 and self.grid.answer_count < max_cells:
+            options = self._get_options(remaining)
+            if len(options) == 0:
+                return
+            word, _ = min(options, key=self._constraint_order)
+            self._place(word, self.grid.pick_slot(word, self.rng))
+            remaining.remove(word)
+
+    def _search(self, options: dict[str, tuple[int, int]]) -> bool:
+        occupied = self.grid.answer_count
+        if occupied >= self.target_cells:
+            return True
+        if self.exhausted:
+            return False
+        if occupied + sum(len(word) for word in options) < self.target_cells:
+            return False
+        word = min(options, key=lambda other: self._constraint_order((other, options[other][0])))
+        rest = {other: option for other, option in options.items() if other != word}
+        slots = self.grid.find_slots(word)
+        self.rng.shuffle(slots)
+        for slot in slots:
+            if self.exhausted:
+                return False
+            self.steps += 1
+            self._place(word, slot)
+            if self._search(self._recount(rest, self.grid.word_mask(slot.row, slot.col, slot.direction, len(word)))):
+                return True
+            self._undo(word)
+        return self._search(rest)
+
+    def _recount(self, options: dict[str, tuple[int, int]], placed_mask: int) -> dict[str, tuple[int, int]]:
+        """
+        Returns ``options`` after a placement over the cells of ``placed_mask``, only the words whose
+        slots cover one of those cells are counted again and words left without a slot are dropped.
+        """
+        recounted = {}
+        for word, (count, cover) in options.items():
+            if cover & placed_mask:
+                count, cover = self.grid.slot_cover(word)
+            if count > 0:
+                recounted[word] = (count, cover)
+        return recounted
+
+    def _get_options(self, words: list[str]) -> list[tuple[str, int]]:
+        options = [(word, self.grid.count_slots(word)) for word in words]
+        return [(word, count) for word, count in options if count > 0]
+
+    @staticmethod
+    def _constraint_order(option: tuple[str, int]) -> tuple[int, int]:
+        word, count = option
+        return count, -len(word)
+
+    def _place(self, word: str, slot: WordSlot) -> None:
+        self.grid.set_word(word[::-1] if slot.reversed else word, slot.row, slot.col, slot.direction)
+        self.placed[word] = slot
+
+    def _undo(self, word: str) -> None:
+        slot = self.placed.pop(word)
+        self.grid.remove_word(slot.row, slot.col, slot.direction, len(word))
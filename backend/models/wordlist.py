@@ -3,10 +3,18 @@ import string
 from abc import ABC, abstractmethod
 from datetime import datetime
 from pathlib import Path as FilePath
+from typing import Iterator
 
 from pydantic import BaseModel, Field, field_validator
 
-from backend.utils import Logger, get_profanity_list
+from backend.utils import Logger, get_profanity_index, get_profanity_list
+
+TOKEN_PATTERN = re.compile(r"\S+")
+TOKEN_STRIP_CHARS = string.whitespace + string.punctuation
+ILLEGAL_CHAR_PATTERN = re.compile(r"[^A-Za-z -]")
+ROMAN_NUMERAL_PATTERN = re.compile(
+    r"\b(?:XC|XL|LX{0,3}|X{1,3})(?:IX|IV|VI{0,3}|I{1,3})\b|\b(?:XC|XL|LX{0,3}|X{1,3})\b|\b(?:IX|IV|VI{0,3}|I{1,3})\b"
+)
 
 
 class WordlistBase(BaseModel, ABC):
@@ -14,31 +22,66 @@ class WordlistBase(BaseModel, ABC):
     Abstract base class that serves as a foundation for implementing profanity
     filtering functionality in subclasses.
 
-    This class outlines the structure for subclasses to implement specific methods
-    for checking profanity in text inputs. It also includes utility methods to
-    validate a word list against a predefined profanity list and provides access
-    to a common profanity list.
+    Subclasses list the text fields to validate in :meth:`text_fields`, and every check is
+    made over them by :meth:`find_issues`. It also provides access to a common profanity
+    list.
     """
 
     @abstractmethod
-    def check_profanity(self):
+    def text_fields(self, prefix: str = "") -> Iterator[tuple[str, str, bool]]:
+        """
+        Yields every text field that is validated, in validation order.
+
+        :param prefix: Prepended to the field names, used to locate a category within a wordlist.
+        :return: ``(field, text, is_word)`` where ``is_word`` marks the entries of a word list.
+        """
         raise NotImplementedError("This method must be implemented by subclasses")
 
-    def _check_word_list(self, word_list: list[str]):
+    def find_issues(self) -> list[dict[str, str | int]]:
+        """
+        Checks every text field for profanity, and the entries of the word lists for illegal
+        characters as well, in a single pass.
+
+        :return: A position entry for each issue, with its kind, field, character range and value.
+        """
+        profanity_index = self.profanity_index()
+        positions = []
+        for field, text, is_word in self.text_fields():
+            positions += self._find_profanity(field, text, profanity_index)
+            if is_word:
+                positions += self._find_illegal_chars(field, text)
+        return positions
+
+    def check_profanity(self) -> list[str]:
+        """Returns the profane words found by :meth:`find_issues`."""
+        return [found["value"] for found in self.find_issues() if found["issue"] == "profanity"]
+
+    @staticmethod
+    def _find_profanity(field: str, text: str, profanity_index: frozenset[str]) -> list[dict[str, str | int]]:
         """
-        Validates a list of words to check for the presence of profanity using a predefined
-        profanity list. Logs a warning if any profane word is detected.
+        Finds the whitespace separated tokens of ``text`` that are in the profanity index once
+        surrounding punctuation is stripped.
 
-        :param word_list: A list of words to be validated.
-        :type word_list: list[str]
+        :return: A position entry for each profane token.
         """
-        profanity = []
-        for word in word_list:
-            if word.upper().strip(string.whitespace + string.punctuation) in self.profanity_list():
-                profanity.append(word)
-                Logger.get_logger().warn(f"Validating Input: Profanity found in word: {word}")
+        found = []
+        for match in TOKEN_PATTERN.finditer(text):
+            if match.group().upper().strip(TOKEN_STRIP_CHARS) in profanity_index:
+                Logger.get_logger().warn(f"Validating Input: Profanity found in word: {match.group()}")
+                found.append(
+                    {"issue": "profanity", "field": field, "start": match.start(), "end": match.end(), "value": match.group()}
+                )
+        return found
 
-        return profanity
+    @staticmethod
+    def _find_illegal_chars(field: str, word: str) -> list[dict[str, str | int]]:
+        found = []
+        for match in ILLEGAL_CHAR_PATTERN.finditer(word):
+            Logger.get_logger().warn(f"Validating Input: Illegal character found in word: {field} - {word}")
+            found.append(
+                {"issue": "illegal_char", "field": field, "start": match.start(), "end": match.end(), "value": match.group()}
+            )
+        return found
 
     @staticmethod
     def profanity_list() -> list[str]:
@@ -50,6 +93,16 @@ class WordlistBase(BaseModel, ABC):
         """
         return get_profanity_list()
 
+    @staticmethod
+    def profanity_index() -> frozenset[str]:
+        """
+        Retrieves the predefined profanity list as a set for constant time lookups.
+
+        :return: A set of profane words.
+        :rtype: frozenset[str]
+        """
+        return get_profanity_index()
+
 
 class PuzzleInput(WordlistBase):
     """
@@ -93,65 +146,27 @@ class PuzzleInput(WordlistBase):
     @field_validator("word_list", mode="after")
     @classmethod
     def check_word_list_length(cls, value):
-        exp = re.compile(
-            r"\b(?:XC|XL|LX{0,3}|X{1,3})(?:IX|IV|VI{0,3}|I{1,3})\b|\b(?:XC|XL|LX{0,3}|X{1,3})\b|\b(?:IX|IV|VI{0,3}|I{1,3})\b"
-        )
         for word in value:
-            for char in word:
-                if not (char.isascii() and char.isalpha() or char == " " or char == "-"):
-                    raise ValueError(
-                        f"Words in the wordlist must not contain numbers or punctuation.  {word} violates this rule, please try again"
-                    )
-            if exp.search(word):
+            if ILLEGAL_CHAR_PATTERN.search(word):
+                raise ValueError(
+                    f"Words in the wordlist must not contain numbers or punctuation.  {word} violates this rule, please try again"
+                )
+            if ROMAN_NUMERAL_PATTERN.search(word):
                 raise ValueError(
                     f"Words in the wordlist must not contain roman numerals. {word} violates this rule, please try again"
                 )
         return value
 
-    def check_profanity(self):
-        """
-        Checks for profane content within text fields of a given instance.
-
-        This method invokes a private word-checking utility on specific text fields
-        associated with the instance, ensuring none of the words or phrases contain
-        profanity. It processes multiple fields, including categories, long facts,
-        short facts, and phrases within a predefined word list.
+    def check_for_illegal_chars(self) -> list[str]:
+        """Returns the illegal characters found in the word list by :meth:`find_issues`."""
+        return [found["value"] for found in self.find_issues() if found["issue"] == "illegal_char"]
 
-        :param self: Refers to the instance of the class for which the method is being called.
-
-        :return: None
-        """
-        profanity = (
-            self._check_word_list(self.puzzle_topic.split())
-            + self._check_word_list(self.introduction.split())
-            + self._check_word_list(self.did_you_know.split())
-        )
-        for phrase in self.word_list:
-            profanity += self._check_word_list(phrase.split())
-        return profanity
-
-    def check_for_illegal_chars(self):
-        """
-        Checks the word list for illegal characters.
-
-        This method iterates through each word in the word list and every character
-        in each word, ensuring that they are valid. A valid character is ASCII,
-        alphabetic, a space, or a hyphen. If an illegal character is encountered,
-        a ValueError is raised with details about the offending word and its
-        category.
-
-        :raises ValueError:
-            If any illegal character is found in a word within the word list.
-        """
-        illegal_chars = []
-        for word in self.word_list:
-            for char in word:
-                if not (char.isascii() and char.isalpha() or char == " " or char == "-"):
-                    illegal_chars.append(char)
-                    Logger.get_logger().warn(
-                        f"Validating Input: Illegal character found in word: {self.puzzle_topic} - {word}"
-                    )
-        return illegal_chars
+    def text_fields(self, prefix: str = "") -> Iterator[tuple[str, str, bool]]:
+        yield f"{prefix}puzzle_topic", self.puzzle_topic, False
+        yield f"{prefix}introduction", self.introduction, False
+        yield f"{prefix}did_you_know", self.did_you_know, False
+        for index, word in enumerate(self.word_list):
+            yield f"{prefix}word_list[{index}]", word, True
 
 
 class WordlistInput(WordlistBase):
@@ -165,11 +180,10 @@ class WordlistInput(WordlistBase):
     )
     subtopic_list: list[str] = Field([], description="the list of subtopics to be used for the puzzle book")
 
-    def check_profanity(self):
-        profanity = self._check_word_list(self.title.split())
-        profanity += self._check_word_list(self.topic.split())
-        profanity += self._check_word_list(self.front_page_introduction.split())
-        return profanity
+    def text_fields(self, prefix: str = "") -> Iterator[tuple[str, str, bool]]:
+        yield f"{prefix}title", self.title, False
+        yield f"{prefix}topic", self.topic, False
+        yield f"{prefix}front_page_introduction", self.front_page_introduction, False
 
 
 class Wordlist(WordlistBase):
@@ -183,42 +197,27 @@ class Wordlist(WordlistBase):
     )
     categories: list[PuzzleInput] = Field(description="The category list")
 
-    def check_profanity(self):
-        """
-        Checks all text-based attributes and nested categories for instances of profanity.
-
-        This method splits and evaluates specific text attributes of the object for
-        inappropriate language using the `_check_word_list` method. Additionally, it
-        iterates through all objects in the `categories` and invokes their
-        `check_profanity` method.
-
-        :raises ValueError: If any profane words are detected in the text attributes.
-        """
-        profanity = self._check_word_list(self.title.split())
-        profanity += self._check_word_list(self.topic.split())
-        profanity += self._check_word_list(self.front_page_introduction.split())
-        for category in self.categories:
-            profanity += category.check_profanity()
-        return profanity
+    def text_fields(self, prefix: str = "") -> Iterator[tuple[str, str, bool]]:
+        yield f"{prefix}title", self.title, False
+        yield f"{prefix}topic", self.topic, False
+        yield f"{prefix}front_page_introduction", self.front_page_introduction, False
+        for index, category in enumerate(self.categories):
+            yield from category.text_fields(prefix=f"{prefix}categories[{index}].")
 
     def validate_word_lists(self):
         """
         Validates word lists by checking for profanity and ensuring no illegal characters
-        exist in the provided categories.
-
-        This function performs a dual validation process: it runs a profanity check
-        and iterates through a list of categories, where each category is subjected
-        to a character legality check.
+        exist in the provided categories, see :meth:`find_issues`.
 
-        :raises ValueError: Raised if profanity or illegal characters are detected during
-            the validation process.
-        :return: A dictionary with keys 'profanity' and 'illegal_chars' indicating validation results.
+        :return: A dictionary with keys 'profanity' and 'illegal_chars' indicating validation results,
+            and 'positions' locating each of them by field name and character range.
         """
-        profanity = self.check_profanity()
-        illegal_char_list = []
-        for category in self.categories:
-            illegal_char_list += category.check_for_illegal_chars()
-        return {"profanity": profanity, "illegal_chars": illegal_char_list}
+        positions = self.find_issues()
+        return {
+            "profanity": [found["value"] for found in positions if found["issue"] == "profanity"],
+            "illegal_chars": [found["value"] for found in positions if found["issue"] == "illegal_char"],
+            "positions": positions,
+        }
 
     def save_wordlist(self, filename: FilePath):
         with open(filename, "w") as fd:
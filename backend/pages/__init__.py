@@ -6,9 +6,13 @@ from .contents import (  # noqa: F401
     ContentsPuzzleWordlist,
     ContentsSolution,
 )
+from .page_cache import PageCache  # noqa: F401
+from .page_preview import MEDIA_TYPES, PagePreview  # noqa: F401
 from .pages import Page, Pages  # noqa: F401
-from .print_params import PrintParams  # noqa: F401
+from .pdf_writer import PdfImage, PdfCanvas, PdfFont, PdfWriter  # noqa: F401
+from .print_params import FONT_FILE, PrintParams, get_font  # noqa: F401
 from .sub_contents import (  # noqa: F401
+    GlyphAtlas,
     SubContents,
     SubContentsCell,
     SubContentsGrid,
@@ -17,3 +21,6 @@ from .sub_contents import (  # noqa: F401
     SubContentsPageNumber,
     SubContentsSearchList,
 )
+from .svg_canvas import SvgCanvas  # noqa: F401
+from .text_layout import layout_paragraph, place_lines, word_length  # noqa: F401
+from .vector_pages import VectorPages  # noqa: F401
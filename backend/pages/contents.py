@@ -1,6 +1,7 @@
+import hashlib
 from abc import ABC, abstractmethod
 
-from PIL import Image, ImageDraw, ImageOps, ImageText
+from PIL import Image, ImageText
 
 from backend.models import (
     BoardImageEnum,
@@ -23,13 +24,20 @@ class Contents(PrintParams, ABC):
     def __init__(self, *, project_config: ProjectConfig, print_debug: bool = False) -> None:
         super().__init__(project_config=project_config, print_debug=print_debug)
         self.size: tuple[int, int] = (self.config.content_width_pixels, self.config.content_height_pixels)
-        self.base_image: Image.Image = self._make_base_image()
-        self.draw: ImageDraw.ImageDraw = ImageDraw.Draw(self.base_image)
 
     @abstractmethod
     def get_content_image(self) -> Image.Image:
         raise NotImplementedError
 
+    def cache_inputs(self) -> list[str]:
+        """Returns the inputs of the content image besides the project config, the inputs of a blank page."""
+        return []
+
+    def cache_key(self) -> str:
+        """A hash of everything the content image is drawn from, equal keys give identical images."""
+        inputs = [type(self).__name__, self.config.model_dump_json(), str(self.print_debug), *self.cache_inputs()]
+        return hashlib.sha256("\n".join(inputs).encode()).hexdigest()
+
     def calculate_cells_size(self, columns: int, rows: int) -> int:
         if not self.config.variable_cell_size:
             return self.config.min_cell_size
@@ -51,14 +59,18 @@ class Contents(PrintParams, ABC):
 
 
 class ContentsFront(Contents):
+    front_title = "A Glorious Front Page Goes Here"
+
     def __init__(self, project_config: ProjectConfig, print_debug: bool = False) -> None:
         super().__init__(project_config=project_config, print_debug=print_debug)
 
+    def cache_inputs(self) -> list[str]:
+        return [self.front_title]
+
     def get_content_image(self) -> Image.Image:
         Logger.get_logger().debug(f"Generating {self.__class__} image")
-        words = "A Glorious Front Page Goes Here"
         text: ImageText.Text = ImageText.Text(
-            text=words,
+            text=self.front_title,
             font=self.fonts["TITLE_FONT"],
         )
         self.draw.text(
@@ -86,6 +98,9 @@ class ContentsPuzzleGrid(Contents):
         self.grid_page_type: LayoutEnum = grid_page_type
         self.grid_image_type: BoardImageEnum = grid_image_type
 
+    def cache_inputs(self) -> list[str]:
+        return [self.puzzle.content_hash, self.grid_page_type.value, self.grid_image_type.value]
+
     def get_content_image(self) -> Image.Image:
         Logger.get_logger().debug(
             f"Generating {self.__class__} image for puzzle grid of {self.puzzle.display_title} with layout {self.grid_page_type}"
@@ -100,6 +115,7 @@ class ContentsPuzzleGrid(Contents):
             cells=self.puzzle.cells,
             cell_size=cell_size,
             grid_type=self.grid_image_type,
+            placements=self.puzzle.placements,
             project_config=self.config,
             print_debug=self.print_debug,
         ).get_content_image()
@@ -157,6 +173,9 @@ class ContentsPuzzleWordlist(Contents):
         super().__init__(project_config=project_config, print_debug=print_debug)
         self.puzzle: Puzzle = puzzle
 
+    def cache_inputs(self) -> list[str]:
+        return [self.puzzle.content_hash]
+
     def get_content_image(self) -> Image.Image:
         Logger.get_logger().debug(f"Generating {self.__class__} image for puzzle wordlist for {self.puzzle.display_title}")
         title_image: Image.Image = SubContentsHeader(
@@ -230,24 +249,39 @@ class ContentsSolution(Contents):
         self.verso_page: bool = verso_page
         self.start, self.end = puzzle_range
 
-    def _create_solution_thumbnail(self, puzzle: Puzzle) -> Image.Image:
-        thumbnail: Image.Image = self._make_base_image()
+    def cache_inputs(self) -> list[str]:
+        return [str(self.verso_page), str(self.start), str(self.end), self.solution_title] + [
+            puzzle.content_hash for puzzle in self.puzzle_list
+        ]
+
+    def _paste_solution_thumbnail(self, puzzle: Puzzle, box: tuple[int, int], scale: float) -> None:
+        """
+        Draws the header and solution grid of ``puzzle`` at ``box``, as a copy of a puzzle page
+        reduced by ``scale`` with the grid fitted below the header. Both are drawn directly at
+        their final size.
+        """
+        header_config = self.config.scaled(scale)
         title_image: Image.Image = SubContentsHeader(
-            header_title=puzzle.display_title, project_config=self.config, print_debug=self.print_debug
+            header_title=puzzle.display_title, project_config=header_config, print_debug=self.print_debug
         ).get_content_image()
-        thumbnail.paste(im=title_image, box=(0, 0), mask=title_image)
+        self.base_image.paste(im=title_image, box=box, mask=title_image)
+        cell_size = self.calculate_cells_size(puzzle.columns, puzzle.rows)
+        offset = self.config.grid_pad_pixels + self.config.grid_border_pixels + self.config.grid_margin_pixels
+        grid_scale = min(
+            self.size[0] / (puzzle.columns * cell_size + 2 * offset),
+            (self.size[1] - self.config.title_box_height_pixels) / (puzzle.rows * cell_size + 2 * offset),
+        )
         grid_image: Image.Image = SubContentsGrid(
             rows=puzzle.rows,
             cols=puzzle.columns,
             cells=puzzle.cells,
-            cell_size=self.calculate_cells_size(puzzle.columns, puzzle.rows),
+            cell_size=max(round(cell_size * grid_scale * scale), 1),
             grid_type=BoardImageEnum.SOLUTION,
-            project_config=self.config,
+            placements=puzzle.placements,
+            project_config=self.config.scaled(grid_scale * scale),
             print_debug=self.print_debug,
         ).get_content_image()
-        grid_image = ImageOps.contain(image=grid_image, size=(thumbnail.width, thumbnail.height - title_image.height))
-        thumbnail.paste(im=grid_image, box=(0, title_image.height), mask=grid_image)
-        return thumbnail
+        self.base_image.paste(im=grid_image, box=(box[0], box[1] + title_image.height), mask=grid_image)
 
     def get_content_image(self) -> Image.Image:
         Logger.get_logger().debug(f"Generating {self.__class__} image for puzzle solution with {len(self.puzzle_list)}")
@@ -275,18 +309,17 @@ class ContentsSolution(Contents):
             )
         col_width = self.size[0] // self.config.solution_page_cols
         row_height = (self.size[1] - self.config.solution_page_banner_height_pixels) // self.config.solution_page_rows
+        scale = min(col_width / self.size[0], row_height / self.size[1])
         for n, puzzle in enumerate(self.puzzle_list):
-            solution_image: Image.Image = self._create_solution_thumbnail(puzzle)
-            solution_thumbnail = ImageOps.contain(image=solution_image, size=(col_width, row_height))
             x = n % self.config.solution_page_cols
             y = n // self.config.solution_page_cols
-            self.base_image.paste(
-                im=solution_thumbnail,
+            self._paste_solution_thumbnail(
+                puzzle,
                 box=(
-                    (x * col_width) + (col_width // 2) - (solution_thumbnail.width // 2),
+                    (x * col_width) + (col_width // 2) - int(self.size[0] * scale) // 2,
                     (y * row_height) + self.config.solution_page_banner_height_pixels,
                 ),
-                mask=solution_thumbnail,
+                scale=scale,
             )
         if self.print_debug:
             for x in range(1, self.config.solution_page_cols):
@@ -0,0 +1,101 @@
+import hashlib
+import zlib
+from pathlib import Path as FilePath
+
+from backend.utils import Logger
+
+from .contents import Contents
+from .pdf_writer import PdfImage
+
+
+class PageCache:
+    """
+    A disk cache of the encoded page images of a project's manuscript.
+
+    Each page is stored under a key built from everything it is drawn from, see
+    :meth:`page_key`, so a rebuild only renders the pages whose inputs changed. The cache is
+    kept under ``max_size`` bytes by evicting the least recently used pages. A page file holds a
+    one line header with the mode, size and filter of the encoded image and the CRC-32 of its
+    data, followed by the data. Pages are written to a ``.part`` file that is then moved into
+    place, and a page file that does not read back whole is treated as a miss and deleted.
+
+    :ivar folder: The folder the pages are stored in.
+    :type folder: FilePath
+    :ivar max_size: The maximum size of the cache in bytes.
+    :type max_size: int
+    """
+
+    VERSION = 4
+    FOLDER = "page_cache"
+
+    def __init__(self, folder: FilePath, max_size: int):
+        self.folder: FilePath = folder
+        self.max_size: int = max_size
+        self.hits: int = 0
+        self.misses: int = 0
+
+    @classmethod
+    def page_key(cls, contents: Contents, page_number: int) -> str:
+        """
+        Returns the key of a page, a hash of its contents and of its page number, which sets the
+        margins and is drawn on the page.
+        """
+        return hashlib.sha256(f"{cls.VERSION}\n{contents.cache_key()}\n{page_number}".encode()).hexdigest()
+
+    def _path(self, key: str) -> FilePath:
+        return self.folder / f"{key}.page"
+
+    def get(self, key: str) -> PdfImage | None:
+        """Returns the cached page of ``key``, or None if it is not cached or its file is damaged."""
+        path = self._path(key)
+        try:
+            page = self._decode(path.read_bytes())
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError) as e:
+            Logger.get_logger().warn(f"Discarding damaged cached page {path.name}: {e}")
+            self.misses += 1
+            path.unlink(missing_ok=True)
+            return None
+        path.touch()
+        self.hits += 1
+        return page
+
+    @staticmethod
+    def _decode(data: bytes) -> PdfImage:
+        """
+        Decodes a page file written by :meth:`put`.
+
+        :raises ValueError: If the header cannot be parsed or the data does not match its checksum.
+        """
+        header, data = data.split(b"\n", 1)
+        mode, width, height, image_filter, checksum = header.decode().split(" ")
+        if zlib.crc32(data) != int(checksum):
+            raise ValueError("page data does not match its checksum")
+        return PdfImage(data=data, size=(int(width), int(height)), mode=mode, filter=image_filter)
+
+    def put(self, key: str, page: PdfImage) -> None:
+        self.folder.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        part_path = path.with_name(f"{path.name}.part")
+        header = f"{page.mode} {page.size[0]} {page.size[1]} {page.filter} {zlib.crc32(page.data)}\n".encode()
+        part_path.write_bytes(header + page.data)
+        part_path.replace(path)
+
+    def evict(self) -> None:
+        """Deletes the least recently used pages until the cache fits in ``max_size``."""
+        if not self.folder.exists():
+            return
+        pages = sorted(
+            ((path.stat(), path) for path in self.folder.glob("*.page")), key=lambda page: page[0].st_mtime, reverse=True
+        )
+        size = 0
+        evicted = 0
+        for stat, path in pages:
+            size += stat.st_size
+            if size > self.max_size:
+                path.unlink(missing_ok=True)
+                evicted += 1
+        if evicted > 0:
+            Logger.get_logger().info(f"Evicted {evicted} pages from {self.folder}")
@@ -0,0 +1,83 @@
+import hashlib
+import io
+
+from backend.models import PreviewFormatEnum, PreviewPageEnum, ProjectConfig, PuzzleData
+
+from .contents import Contents, ContentsPuzzleGrid, ContentsPuzzleWordlist, ContentsSolution
+from .pages import Page
+from .svg_canvas import SvgCanvas
+from .vector_pages import VectorPages
+
+PREVIEW_CONTENTS: dict[PreviewPageEnum, type[Contents]] = {
+    PreviewPageEnum.PUZZLE: ContentsPuzzleGrid,
+    PreviewPageEnum.WORDLIST: ContentsPuzzleWordlist,
+    PreviewPageEnum.SOLUTION: ContentsSolution,
+}
+MEDIA_TYPES: dict[PreviewFormatEnum, str] = {
+    PreviewFormatEnum.PNG: "image/png",
+    PreviewFormatEnum.SVG: "image/svg+xml",
+}
+
+
+class PagePreview(VectorPages):
+    """
+    Draws single pages of the manuscript on demand, for checking a layout without building the
+    whole book.
+
+    The book is planned at the preview ``dpi`` with the same ``Contents`` objects as the
+    manuscript, then only the requested page is drawn, as a PNG through the raster pages or as
+    an SVG through the vector pages. The ETag of a page is built from the content hashes of its
+    puzzles, so a client can keep a preview until the puzzles on the page change.
+    """
+
+    def __init__(self, word_search_data: PuzzleData, project_config: ProjectConfig, dpi: int, print_debug: bool = False):
+        super().__init__(
+            word_search_data=word_search_data,
+            project_config=project_config.model_copy(update={"dpi": dpi}),
+            filename=None,
+            print_debug=print_debug,
+        )
+        self.plan_pages()
+
+    def find_page(self, puzzle_id: str, page_type: PreviewPageEnum) -> tuple[int, Contents]:
+        """
+        Returns the page number and contents of the ``page_type`` page of a puzzle.
+
+        :raises KeyError: If the puzzle has no page of that type.
+        """
+        for page_number, contents in enumerate(self.planned_pages, start=1):
+            if not isinstance(contents, PREVIEW_CONTENTS[page_type]):
+                continue
+            puzzles = contents.puzzle_list if isinstance(contents, ContentsSolution) else [contents.puzzle]
+            if any(puzzle.puzzle_id == puzzle_id for puzzle in puzzles):
+                return page_number, contents
+        raise KeyError(f"No {page_type.lower()} page for puzzle {puzzle_id}")
+
+    @staticmethod
+    def etag(contents: Contents, page_number: int, preview_format: PreviewFormatEnum) -> str:
+        """Returns the quoted ETag of a preview, a hash of its format and of the cache key of its page."""
+        key = f"{preview_format}\n{contents.cache_key()}\n{page_number}"
+        return f'"{hashlib.sha256(key.encode()).hexdigest()}"'
+
+    def draw_preview(self, contents: Contents, page_number: int, preview_format: PreviewFormatEnum) -> bytes:
+        """Draws ``contents`` as page ``page_number`` of the book in ``preview_format``."""
+        if preview_format == PreviewFormatEnum.SVG:
+            canvas = SvgCanvas(
+                font_file=self.font.font_file,
+                size=(self.config.page_width_pixels, self.config.page_height_pixels),
+                dpi=self.config.dpi,
+            )
+            self.draw_page(canvas, contents, page_number)
+            return canvas.finish()
+        page_image = Page(
+            content=contents.get_content_image(),
+            page_number=page_number,
+            project_config=self.config,
+            print_debug=self.print_debug,
+        ).get_page_image()
+        contents.release_images()
+        if page_image.mode == "CMYK":
+            page_image = page_image.convert("RGB")
+        buffer = io.BytesIO()
+        page_image.save(buffer, format="PNG", dpi=(self.config.dpi, self.config.dpi), optimize=True)
+        return buffer.getvalue()
@@ -1,8 +1,12 @@
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
 from pathlib import Path as FilePath
+from threading import Lock
 
-from PIL import Image, ImageDraw
+from PIL import Image
 
 from backend.models import (
+    ColourModeEnum,
     LayoutEnum,
     PageTypeEnum,
     ProjectConfig,
@@ -11,17 +15,30 @@ from backend.models import (
 from backend.utils import Logger, clear_marker_file, set_marker_file
 
 from .contents import (
+    Contents,
     ContentsBlank,
     ContentsFront,
     ContentsPuzzleGrid,
     ContentsPuzzleWordlist,
     ContentsSolution,
 )
+from .page_cache import PageCache
+from .pdf_writer import PdfImage, PdfWriter
 from .print_params import PrintParams
 from .sub_contents import SubContentsPageNumber
 
 
 class Page(PrintParams):
+    """
+    A printed page, the contents and the page number are composited on the page canvas.
+
+    For CMYK pages the canvas is converted to CMYK, for GRAYSCALE and BILEVEL pages it is a
+    grayscale canvas, which a BILEVEL page then dithers to one bit per pixel so the light grey
+    banners survive as a halftone. Pages printed with ``print_debug`` keep their RGB colours.
+    """
+
+    background = "SOLID_WHITE"
+
     def __init__(
         self, content: Image.Image, page_number: int, project_config: ProjectConfig, print_debug: bool = False
     ) -> None:
@@ -30,32 +47,46 @@ class Page(PrintParams):
         self.page_number: int = page_number
         self.page_type: PageTypeEnum = PageTypeEnum.RECTO if self.page_number % 2 == 1 else PageTypeEnum.VERSO
         self.size = (self.config.page_width_pixels, self.config.page_height_pixels)
-        self.base_image: Image.Image = self._make_base_image("SOLID_WHITE")
-        self.draw: ImageDraw.ImageDraw = ImageDraw.Draw(self.base_image)
+
+    @property
+    def black_ink(self) -> bool:
+        return not self.print_debug and self.config.colour_mode != ColourModeEnum.CMYK
+
+    def _make_base_image(self, background: str = None) -> Image.Image:
+        if not self.black_ink:
+            return super()._make_base_image(background)
+        return Image.new(mode="L", size=self.size, color=self.colours[background or "TRANSPARENT_BACKGROUND"][0])
+
+    @staticmethod
+    def get_margins(project_config: ProjectConfig, page_type: PageTypeEnum) -> tuple[int, int]:
+        """
+        Returns the x coordinates of the left and right margins of a page, the inner margin is
+        on the right of a verso page and on the left of a recto page.
+        """
+        if page_type == PageTypeEnum.VERSO:
+            return project_config.outer_margin_pixels, project_config.page_width_pixels - project_config.inner_margin_pixels
+        return project_config.inner_margin_pixels, project_config.page_width_pixels - project_config.outer_margin_pixels
+
+    @staticmethod
+    def get_page_number_location(
+        project_config: ProjectConfig, page_type: PageTypeEnum, size: tuple[int, int]
+    ) -> tuple[int, int]:
+        """Returns the top left corner of a page number box of ``size``, in the outer bottom corner of the page."""
+        left_margin_x_coord, right_margin_x_coord = Page.get_margins(project_config, page_type)
+        y_coord = project_config.page_height_pixels - project_config.bottom_margin_pixels - size[1]
+        if page_type == PageTypeEnum.RECTO:
+            return right_margin_x_coord - size[0], y_coord
+        return left_margin_x_coord, y_coord
 
     def get_page_image(self) -> Image.Image:
-        if self.page_type == PageTypeEnum.VERSO:
-            left_margin_x_coord = self.config.outer_margin_pixels
-            right_margin_x_coord = self.config.page_width_pixels - self.config.inner_margin_pixels
-        else:
-            left_margin_x_coord = self.config.inner_margin_pixels
-            right_margin_x_coord = self.config.page_width_pixels - self.config.outer_margin_pixels
+        left_margin_x_coord, right_margin_x_coord = self.get_margins(self.config, self.page_type)
         y_coord = self.config.top_margin_pixels
         self.base_image.paste(im=self.content, box=(left_margin_x_coord, y_coord), mask=self.content)
         if self.page_number > 1:
             page_number_image = SubContentsPageNumber(
                 page_number=str(self.page_number), project_config=self.config, print_debug=self.print_debug
             ).get_content_image()
-            if self.page_type == PageTypeEnum.RECTO:
-                page_number_location = (
-                    right_margin_x_coord - page_number_image.width,
-                    self.config.page_height_pixels - self.config.bottom_margin_pixels - page_number_image.height,
-                )
-            else:
-                page_number_location = (
-                    left_margin_x_coord,
-                    self.config.page_height_pixels - self.config.bottom_margin_pixels - page_number_image.height,
-                )
+            page_number_location = self.get_page_number_location(self.config, self.page_type, page_number_image.size)
             self.base_image.paste(
                 im=page_number_image,
                 box=page_number_location,
@@ -82,17 +113,42 @@ class Page(PrintParams):
                 width=2,
             )
             return self.base_image.convert("RGB")
+        if self.config.colour_mode == ColourModeEnum.GRAYSCALE:
+            return self.base_image
+        if self.config.colour_mode == ColourModeEnum.BILEVEL:
+            return self.base_image.convert("1")
         return self.base_image.convert("CMYK")
 
 
 class Pages(PrintParams):
+    """
+    Builds the manuscript of a book as a raster PDF.
+
+    The page sequence is planned first, then each page is rendered and written to the PDF in
+    order. With more than one worker the pages are rendered and encoded in a process pool, a
+    few pages ahead of the one being written, so memory stays bounded by a handful of pages.
+    Pages found in the page cache are written without being rendered again.
+    """
+
     def __init__(
-        self, word_search_data: PuzzleData, project_config: ProjectConfig, filename: FilePath, print_debug: bool = False
+        self,
+        word_search_data: PuzzleData,
+        project_config: ProjectConfig,
+        filename: FilePath,
+        print_debug: bool = False,
+        workers: int = 1,
+        cache: PageCache | None = None,
     ):
         super().__init__(project_config=project_config, print_debug=print_debug)
         self.word_search_data = word_search_data
         self.filename: FilePath = filename
-        self.puzzle_pages: list[Image.Image] = []
+        self.workers: int = workers
+        self.cache: PageCache | None = cache
+        self.writer: PdfWriter | None = None
+        self.planned_pages: list[Contents] = []
+        self.page_count: int = 0
+        self.finished_count: int = 0
+        self._progress_lock: Lock = Lock()
 
     def create_and_save_pages(self):
         self.create_pages()
@@ -103,97 +159,173 @@ class Pages(PrintParams):
         if len(self.word_search_data.puzzles) == 0:
             Logger.get_logger().warn("no puzzles in to make in to pages")
             raise ValueError("No puzzles in to make in to pages")
+        self.plan_pages()
+        try:
+            self._render_pages()
+        except Exception:
+            self._abort_pdf()
+            raise
+
+    def plan_pages(self) -> list[Contents]:
+        """
+        Plans the page sequence of the book, the contents of every page only depend on its
+        puzzles and on the parity of its page number so the whole book can be planned up front.
+
+        :return: The contents of each page, in page order.
+        """
+        self.planned_pages = []
         self._add_front_page()
         self._add_puzzle_pages()
-        if len(self.puzzle_pages) % 2 == 0:
+        if len(self.planned_pages) % 2 == 0:
             self._add_blank_page()
-        set_marker_file(self.filename, int(len(self.puzzle_pages) / self.word_search_data.page_count * 100))
         self._add_solution_pages()
-        if len(self.puzzle_pages) % 2 == 1:
+        if len(self.planned_pages) % 2 == 1:
             self._add_blank_page()
-        set_marker_file(self.filename, int(len(self.puzzle_pages) / self.word_search_data.page_count * 100))
+        return self.planned_pages
+
+    def _plan_page(self, contents: Contents):
+        self.planned_pages.append(contents)
+
+    def _set_progress(self):
+        set_marker_file(self.filename, int(self.finished_count / self.word_search_data.page_count * 100))
+
+    def _page_finished(self, *_):
+        with self._progress_lock:
+            self.finished_count += 1
+            self._set_progress()
+
+    def _get_writer(self) -> PdfWriter:
+        if self.writer is None:
+            self.writer = PdfWriter(self.filename)
+        return self.writer
+
+    def _abort_pdf(self):
+        """Drops the unfinished PDF of a failed build, so no descriptor or ``.part`` file is left behind."""
+        if self.writer is not None:
+            self.writer.abort()
+            self.writer = None
+
+    def _render_pages(self):
+        if self.workers > 1 and len(self.planned_pages) > 1:
+            self._render_pages_in_pool()
+        else:
+            for contents in self.planned_pages:
+                self._add_page(contents)
+                self._page_finished()
+        if self.cache is not None:
+            Logger.get_logger().info(f"Reused {self.cache.hits} of {len(self.planned_pages)} pages from the page cache")
+            self.cache.evict()
+
+    def _get_cached_page(self, contents: Contents, page_number: int) -> tuple[str | None, PdfImage | None]:
+        """Returns the cache key of a page and the page itself if it is cached, the key is None without a cache."""
+        if self.cache is None:
+            return None, None
+        key = PageCache.page_key(contents, page_number)
+        return key, self.cache.get(key)
+
+    def _finish_page(self, key: str | None, page: Future[PdfImage] | PdfImage):
+        """Writes a page that was cached or rendered, rendered pages are added to the cache."""
+        if isinstance(page, Future):
+            page = page.result()
+            if key is not None:
+                self.cache.put(key, page)
+        self._write_page(page)
+
+    def _render_pages_in_pool(self):
+        """
+        Renders the planned pages in a process pool and writes them in page order. At most two
+        pages per worker are in flight, progress is reported as each of them finishes.
+        """
+        in_flight: deque[tuple[str | None, Future[PdfImage] | PdfImage]] = deque()
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(self.planned_pages))) as pool:
+            for page_number, contents in enumerate(self.planned_pages, start=1):
+                key, page = self._get_cached_page(contents, page_number)
+                if page is None:
+                    page = pool.submit(Pages.render_page, contents, page_number, self.config, self.print_debug)
+                    page.add_done_callback(self._page_finished)
+                else:
+                    self._page_finished()
+                in_flight.append((key, page))
+                if len(in_flight) >= self.workers * 2:
+                    self._finish_page(*in_flight.popleft())
+            while len(in_flight) > 0:
+                self._finish_page(*in_flight.popleft())
+
+    @staticmethod
+    def render_page(contents: Contents, page_number: int, project_config: ProjectConfig, print_debug: bool) -> PdfImage:
+        """Renders ``contents`` as page ``page_number`` of the book and encodes it for the PDF."""
+        Logger.get_logger().debug(f"Rendering page {page_number}")
+        page_image = Page(
+            content=contents.get_content_image(),
+            page_number=page_number,
+            project_config=project_config,
+            print_debug=print_debug,
+        ).get_page_image()
+        contents.release_images()
+        return PdfImage.from_image(page_image)
+
+    def _write_page(self, page: PdfImage):
+        self.page_count += 1
+        self._get_writer().add_image_page(page, self.config.dpi)
+        Logger.get_logger().info(f"Added page {self.page_count} of {len(self.planned_pages)}")
+
+    def _add_page(self, contents: Contents):
+        """
+        Renders ``contents`` as the next page of the book, or takes it from the page cache, and
+        writes it to the PDF straight away, so only one page image is held in memory at a time.
+        """
+        page_number = self.page_count + 1
+        key, page = self._get_cached_page(contents, page_number)
+        if page is None:
+            page = self.render_page(contents, page_number, self.config, self.print_debug)
+            if key is not None:
+                self.cache.put(key, page)
+        self._write_page(page)
 
     def _add_solution_pages(self):
         for n in range(0, len(self.word_search_data.puzzles), self.config.solution_per_page):
-            Logger.get_logger().info(f"Adding solution page for {n + 1} to {n + self.config.solution_per_page}")
-            self.puzzle_pages.append(
-                Page(
-                    content=ContentsSolution(
-                        puzzle_list=self.word_search_data.puzzles[n : n + self.config.solution_per_page],
-                        project_config=self.config,
-                        print_debug=self.print_debug,
-                        verso_page=len(self.puzzle_pages) % 2 == 1,
-                        puzzle_range=(
-                            n - 5,
-                            n + len(self.word_search_data.puzzles[n : n + self.config.solution_per_page]),
-                        ),
-                    ).get_content_image(),
-                    page_number=len(self.puzzle_pages) + 1,
+            Logger.get_logger().info(f"Planning solution page for {n + 1} to {n + self.config.solution_per_page}")
+            self._plan_page(
+                ContentsSolution(
+                    puzzle_list=self.word_search_data.puzzles[n : n + self.config.solution_per_page],
                     project_config=self.config,
                     print_debug=self.print_debug,
-                ).get_page_image()
+                    verso_page=len(self.planned_pages) % 2 == 1,
+                    puzzle_range=(
+                        n - 5,
+                        n + len(self.word_search_data.puzzles[n : n + self.config.solution_per_page]),
+                    ),
+                )
             )
-            set_marker_file(self.filename, int(len(self.puzzle_pages) / self.word_search_data.page_count * 100))
 
     def _add_blank_page(self):
-        self.puzzle_pages.append(
-            Page(
-                content=ContentsBlank(project_config=self.config).get_content_image(),
-                page_number=len(self.puzzle_pages) + 1,
-                project_config=self.config,
-                print_debug=self.print_debug,
-            ).get_page_image()
-        )
+        self._plan_page(ContentsBlank(project_config=self.config))
 
     def _add_puzzle_pages(self):
         for puzzle in self.word_search_data.puzzles:
-            Logger.get_logger().info(f"Adding puzzle page for {puzzle.display_title}")
+            Logger.get_logger().info(f"Planning puzzle page for {puzzle.display_title}")
             layout = puzzle.get_puzzle_layout()
-            self.puzzle_pages.append(
-                Page(
-                    content=ContentsPuzzleGrid(
-                        puzzle=puzzle, grid_page_type=layout, project_config=self.config, print_debug=self.print_debug
-                    ).get_content_image(),
-                    page_number=len(self.puzzle_pages) + 1,
-                    project_config=self.config,
-                    print_debug=self.print_debug,
-                ).get_page_image()
+            self._plan_page(
+                ContentsPuzzleGrid(
+                    puzzle=puzzle, grid_page_type=layout, project_config=self.config, print_debug=self.print_debug
+                )
             )
             if layout == LayoutEnum.DOUBLE:
-                self.puzzle_pages.append(
-                    Page(
-                        content=ContentsPuzzleWordlist(
-                            puzzle=puzzle, project_config=self.config, print_debug=self.print_debug
-                        ).get_content_image(),
-                        page_number=len(self.puzzle_pages) + 1,
-                        project_config=self.config,
-                        print_debug=self.print_debug,
-                    ).get_page_image()
+                self._plan_page(
+                    ContentsPuzzleWordlist(puzzle=puzzle, project_config=self.config, print_debug=self.print_debug)
                 )
-            Logger.get_logger().debug(f"Added puzzle page for {puzzle.display_title}")
-            set_marker_file(self.filename, int(len(self.puzzle_pages) / self.word_search_data.page_count * 100))
 
     def _add_front_page(self):
-        self.puzzle_pages.append(
-            Page(
-                content=ContentsFront(project_config=self.config, print_debug=self.print_debug).get_content_image(),
-                page_number=len(self.puzzle_pages) + 1,
-                project_config=self.config,
-                print_debug=self.print_debug,
-            ).get_page_image()
-        )
-        set_marker_file(self.filename, int(len(self.puzzle_pages) / self.word_search_data.page_count * 100))
+        self._plan_page(ContentsFront(project_config=self.config, print_debug=self.print_debug))
 
     def save_pdf(self):
-        if len(self.puzzle_pages) <= 0:
+        if self.writer is None:
             raise ValueError("No puzzles in to save to pdf")
-        self.puzzle_pages[0].save(
-            self.filename,
-            format="PDF",
-            save_all=True,
-            append_images=self.puzzle_pages[1:],
-            resolution=self.config.dpi,
-            title=self.word_search_data.book_title,
-        )
+        try:
+            self.writer.close(title=self.word_search_data.book_title)
+        except Exception:
+            self._abort_pdf()
+            raise
+        self.writer = None
         Logger.get_logger().info(f"Saved to {self.filename}")
         clear_marker_file(self.filename)
@@ -0,0 +1,370 @@
+import io
+import zlib
+from contextlib import contextmanager
+from math import ceil
+from pathlib import Path as FilePath
+from typing import Iterator, NamedTuple
+
+from PIL import Image, ImageFont, ImageText, features
+
+from .print_params import get_font
+from .text_layout import place_lines
+
+BEZIER_CIRCLE = 0.5523
+WIN_ANSI_CODES = range(32, 256)
+COLOUR_SPACES: dict[str, str] = {
+    "1": "/ColorSpace /DeviceGray /BitsPerComponent 1",
+    "L": "/ColorSpace /DeviceGray /BitsPerComponent 8",
+    "RGB": "/ColorSpace /DeviceRGB /BitsPerComponent 8",
+    "CMYK": "/ColorSpace /DeviceCMYK /BitsPerComponent 8 /Decode [1 0 1 0 1 0 1 0]",
+}
+
+
+def pdf_string(data: bytes) -> str:
+    """Returns ``data`` as a PDF literal string, with the delimiters and escape character escaped."""
+    escaped = data.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+    return "(" + escaped.decode("latin-1") + ")"
+
+
+def pdf_number(value: float) -> str:
+    """Formats a number for a content stream without exponents or trailing zeros."""
+    text = f"{value:.3f}".rstrip("0").rstrip(".")
+    return text if text not in ("", "-0") else "0"
+
+
+class PdfImage(NamedTuple):
+    """
+    An encoded image, the form in which page images are written to a PDF. It is small and can
+    be pickled, so page images can be encoded in other processes.
+
+    Colour images are JPEG encoded as Pillow's PDF writer does. Grayscale images are Flate
+    compressed and bilevel images CCITT G4 compressed, both lossless.
+    """
+
+    data: bytes
+    size: tuple[int, int]
+    mode: str
+    filter: str
+
+    @classmethod
+    def from_image(cls, image: Image.Image) -> "PdfImage":
+        if image.mode not in COLOUR_SPACES:
+            raise ValueError(f"cannot write image mode {image.mode} to pdf")
+        if image.mode == "L":
+            return cls(data=zlib.compress(image.tobytes()), size=image.size, mode=image.mode, filter="FlateDecode")
+        if image.mode == "1":
+            strip = cls._group4_strip(image) if features.check("libtiff") else None
+            if strip is not None:
+                return cls(data=strip, size=image.size, mode=image.mode, filter="CCITTFaxDecode")
+            return cls(data=zlib.compress(image.tobytes()), size=image.size, mode=image.mode, filter="FlateDecode")
+        buffer = io.BytesIO()
+        image.save(buffer, format="JPEG")
+        return cls(data=buffer.getvalue(), size=image.size, mode=image.mode, filter="DCTDecode")
+
+    @staticmethod
+    def _group4_strip(image: Image.Image) -> bytes | None:
+        """
+        Returns the CCITT G4 data of a bilevel image, the single strip of the image saved as a G4
+        TIFF, or None if libtiff split the image in to more than one strip.
+        """
+        buffer = io.BytesIO()
+        image.save(buffer, format="TIFF", compression="group4", strip_size=ceil(image.width / 8) * image.height)
+        with Image.open(buffer) as tiff:
+            offsets, byte_counts = tiff.tag_v2[273], tiff.tag_v2[279]
+        if len(offsets) != 1:
+            return None
+        return buffer.getvalue()[offsets[0] : offsets[0] + byte_counts[0]]
+
+    @property
+    def entries(self) -> str:
+        """The entries of the image stream dictionary."""
+        entries = (
+            f"/Type /XObject /Subtype /Image /Width {self.size[0]} /Height {self.size[1]}"
+            f" {COLOUR_SPACES[self.mode]} /Filter /{self.filter}"
+        )
+        if self.filter == "CCITTFaxDecode":
+            entries += f" /DecodeParms << /K -1 /BlackIs1 true /Columns {self.size[0]} /Rows {self.size[1]} >>"
+        return entries
+
+
+class PdfWriter:
+    """
+    Writes a PDF file one object at a time.
+
+    Objects are written to the file as soon as they are complete and only their byte offsets
+    are kept, so the memory used does not grow with the content of the document. The page
+    tree, the document information and the cross reference table are written by :meth:`close`.
+    The document is written to a ``.part`` file next to ``filename`` that only replaces it once
+    it is complete, :meth:`abort` deletes it if the document cannot be finished.
+
+    :ivar filename: The path of the PDF file.
+    :type filename: FilePath
+    """
+
+    CATALOG_ID = 1
+    PAGES_ID = 2
+
+    def __init__(self, filename: FilePath) -> None:
+        self.filename: FilePath = filename
+        self._part_filename: FilePath = filename.with_name(f"{filename.name}.part")
+        self._fd = open(self._part_filename, "wb")
+        self._offsets: dict[int, int] = {}
+        self._next_id: int = 3
+        self._page_ids: list[int] = []
+        self._fonts: dict[str, tuple[str, int]] = {}
+        self._fd.write(b"%PDF-1.7\n%\xe2\xe3\xcf\xd3\n")
+
+    def new_object_id(self) -> int:
+        object_id = self._next_id
+        self._next_id += 1
+        return object_id
+
+    def write_object(self, object_id: int, body: str) -> None:
+        self._offsets[object_id] = self._fd.tell()
+        self._fd.write(f"{object_id} 0 obj\n{body}\nendobj\n".encode("latin-1"))
+
+    def write_stream(self, object_id: int, data: bytes, entries: str = "", compress: bool = True) -> None:
+        """
+        Writes a stream object.
+
+        :param object_id: The id of the object.
+        :param data: The content of the stream.
+        :param entries: Additional entries of the stream dictionary.
+        :param compress: Compress ``data`` with Flate, leave it unset if ``entries`` already gives a filter.
+        """
+        if compress:
+            data = zlib.compress(data)
+            entries = f"{entries} /Filter /FlateDecode"
+        self._offsets[object_id] = self._fd.tell()
+        self._fd.write(f"{object_id} 0 obj\n<< /Length {len(data)} {entries} >>\nstream\n".encode("latin-1"))
+        self._fd.write(data)
+        self._fd.write(b"\nendstream\nendobj\n")
+
+    def add_font(self, font: "PdfFont") -> str:
+        """
+        Embeds ``font`` the first time it is used in the document.
+
+        :return: The resource name of the font.
+        """
+        if font.font_file not in self._fonts:
+            name = f"F{len(self._fonts) + 1}"
+            self._fonts[font.font_file] = (name, font.write(self))
+        return self._fonts[font.font_file][0]
+
+    def write_image(self, object_id: int, image: Image.Image | PdfImage) -> None:
+        """Writes ``image`` as an image object, see :class:`PdfImage` for the compression of each mode."""
+        if isinstance(image, Image.Image):
+            image = PdfImage.from_image(image)
+        self.write_stream(object_id, image.data, entries=image.entries, compress=False)
+
+    def add_page(self, size: tuple[float, float], content: bytes, images: dict[str, int] | None = None) -> None:
+        """
+        Writes a page with its content stream, the page uses every font embedded so far.
+
+        :param size: The width and height of the page in points.
+        :param content: The content stream of the page.
+        :param images: The ids of the image objects drawn by the content stream, by resource name.
+        """
+        content_id = self.new_object_id()
+        self.write_stream(content_id, content)
+        fonts = " ".join(f"/{name} {object_id} 0 R" for name, object_id in self._fonts.values())
+        x_objects = " ".join(f"/{name} {object_id} 0 R" for name, object_id in (images or {}).items())
+        page_id = self.new_object_id()
+        self.write_object(
+            page_id,
+            f"<< /Type /Page /Parent {self.PAGES_ID} 0 R"
+            f" /MediaBox [0 0 {pdf_number(size[0])} {pdf_number(size[1])}]"
+            f" /Resources << /Font << {fonts} >> /XObject << {x_objects} >> >>"
+            f" /Contents {content_id} 0 R >>",
+        )
+        self._page_ids.append(page_id)
+
+    def add_image_page(self, image: Image.Image | PdfImage, dpi: int) -> None:
+        """
+        Writes a page that shows ``image`` at ``dpi``, the image can be freed as soon as this returns.
+
+        :param image: The page image, or the page image already encoded.
+        :param dpi: The resolution of the image, which sets the size of the page.
+        """
+        image_id = self.new_object_id()
+        self.write_image(image_id, image)
+        size = (image.size[0] * 72 / dpi, image.size[1] * 72 / dpi)
+        content = f"q {pdf_number(size[0])} 0 0 {pdf_number(size[1])} 0 0 cm /Im1 Do Q"
+        self.add_page(size, content.encode("latin-1"), images={"Im1": image_id})
+
+    def close(self, title: str = "") -> None:
+        """Writes the page tree, catalog, document information and cross reference table and closes the file."""
+        kids = " ".join(f"{page_id} 0 R" for page_id in self._page_ids)
+        self.write_object(self.PAGES_ID, f"<< /Type /Pages /Kids [{kids}] /Count {len(self._page_ids)} >>")
+        self.write_object(self.CATALOG_ID, f"<< /Type /Catalog /Pages {self.PAGES_ID} 0 R >>")
+        info_id = self.new_object_id()
+        self.write_object(info_id, f"<< /Title {pdf_string(title.encode('cp1252', errors='replace'))} >>")
+        xref_offset = self._fd.tell()
+        lines = [f"xref\n0 {self._next_id}\n", "0000000000 65535 f \n"]
+        lines += [f"{self._offsets[object_id]:010d} 00000 n \n" for object_id in range(1, self._next_id)]
+        lines.append(f"trailer\n<< /Size {self._next_id} /Root {self.CATALOG_ID} 0 R /Info {info_id} 0 R >>\n")
+        lines.append(f"startxref\n{xref_offset}\n%%EOF\n")
+        self._fd.write("".join(lines).encode("latin-1"))
+        self._fd.close()
+        self._part_filename.replace(self.filename)
+
+    def abort(self) -> None:
+        """Closes the file and deletes the ``.part`` file of an unfinished document, ``filename`` is left as it was."""
+        self._fd.close()
+        self._part_filename.unlink(missing_ok=True)
+
+
+class PdfFont:
+    """
+    A TrueType font embedded in a PDF as a simple font with ``WinAnsiEncoding``.
+
+    The glyph widths and metrics are taken from the same font file the raster pages are drawn
+    with, so text laid out for the raster pages lines up the same way in the PDF.
+
+    :ivar font_file: The path of the TrueType font file.
+    :type font_file: str
+    """
+
+    METRICS_SIZE = 1000
+
+    def __init__(self, font_file: str) -> None:
+        self.font_file: str = font_file
+        self._metrics: ImageFont.FreeTypeFont = get_font(font_file, self.METRICS_SIZE)
+
+    @staticmethod
+    def encode(text: str) -> bytes:
+        return text.encode("cp1252", errors="replace")
+
+    def _widths(self) -> list[int]:
+        widths = []
+        for code in WIN_ANSI_CODES:
+            try:
+                char = bytes([code]).decode("cp1252")
+            except UnicodeDecodeError:
+                widths.append(0)
+                continue
+            widths.append(round(self._metrics.getlength(char)))
+        return widths
+
+    def write(self, writer: PdfWriter) -> int:
+        """
+        Writes the font program, descriptor and font dictionary.
+
+        :return: The id of the font dictionary.
+        """
+        with open(self.font_file, "rb") as fd:
+            program = fd.read()
+        file_id = writer.new_object_id()
+        writer.write_stream(file_id, program, entries=f"/Length1 {len(program)}")
+        ascent, descent = self._metrics.getmetrics()
+        boxes = [self._metrics.getbbox(chr(code), anchor="ls") for code in range(33, 127)]
+        font_box = [min(b[0] for b in boxes), -max(b[3] for b in boxes), max(b[2] for b in boxes), -min(b[1] for b in boxes)]
+        cap_height = -self._metrics.getbbox("H", anchor="ls")[1]
+        font_name = self._metrics.getname()[0].replace(" ", "")
+        descriptor_id = writer.new_object_id()
+        writer.write_object(
+            descriptor_id,
+            f"<< /Type /FontDescriptor /FontName /{font_name} /Flags 32"
+            f" /FontBBox [{' '.join(str(round(v)) for v in font_box)}] /ItalicAngle 0"
+            f" /Ascent {ascent} /Descent {-descent} /CapHeight {cap_height} /StemV 80 /FontFile2 {file_id} 0 R >>",
+        )
+        font_id = writer.new_object_id()
+        writer.write_object(
+            font_id,
+            f"<< /Type /Font /Subtype /TrueType /BaseFont /{font_name}"
+            f" /FirstChar {WIN_ANSI_CODES.start} /LastChar {WIN_ANSI_CODES.stop - 1}"
+            f" /Widths [{' '.join(str(width) for width in self._widths())}]"
+            f" /Encoding /WinAnsiEncoding /FontDescriptor {descriptor_id} 0 R >>",
+        )
+        return font_id
+
+
+class PdfCanvas:
+    """
+    Builds the content stream of one PDF page with a drawing interface in the pixel coordinates
+    of the raster pages: the origin is the top left corner of the page and y grows downwards.
+
+    The pixel coordinates are mapped to points through the page transformation, so line widths,
+    radii and font sizes are given in pixels just as they are for Pillow. Text anchors and
+    multiline layout follow the rules Pillow uses for ``ImageDraw.text``.
+
+    :ivar size: The size of the page in pixels.
+    :type size: tuple[int, int]
+    :ivar dpi: The resolution the pixel coordinates are given in.
+    :type dpi: int
+    """
+
+    def __init__(self, writer: PdfWriter, font: PdfFont, size: tuple[int, int], dpi: int) -> None:
+        self.writer: PdfWriter = writer
+        self.font: PdfFont = font
+        self.size: tuple[int, int] = size
+        self.dpi: int = dpi
+        scale = 72 / dpi
+        self._ops: list[str] = [f"{pdf_number(scale)} 0 0 {pdf_number(-scale)} 0 {pdf_number(size[1] * scale)} cm"]
+
+    @property
+    def page_size(self) -> tuple[float, float]:
+        """The size of the page in points."""
+        return self.size[0] * 72 / self.dpi, self.size[1] * 72 / self.dpi
+
+    def finish(self) -> None:
+        """Writes the page to the document."""
+        self.writer.add_page(self.page_size, "\n".join(self._ops).encode("latin-1"))
+
+    @contextmanager
+    def translate(self, x: float, y: float, scale: float = 1.0) -> Iterator[None]:
+        """Moves the origin to ``(x, y)`` and scales the drawing inside the block by ``scale``."""
+        self._ops.append(f"q {pdf_number(scale)} 0 0 {pdf_number(scale)} {pdf_number(x)} {pdf_number(y)} cm")
+        yield
+        self._ops.append("Q")
+
+    @staticmethod
+    def _colour(fill: tuple[int, ...], stroke: bool) -> str:
+        if len(fill) <= 2:
+            return f"{pdf_number(fill[0] / 255)} {'G' if stroke else 'g'}"
+        red, green, blue = (pdf_number(value / 255) for value in fill[:3])
+        return f"{red} {green} {blue} {'RG' if stroke else 'rg'}"
+
+    def line(self, xy: list[tuple[float, float]], fill: tuple[int, ...], width: float, round_caps: bool = False) -> None:
+        path = " ".join(f"{pdf_number(x)} {pdf_number(y)} {'m' if index == 0 else 'l'}" for index, (x, y) in enumerate(xy))
+        self._ops.append(f"{self._colour(fill, True)} {pdf_number(width)} w {1 if round_caps else 0} J {path} S")
+
+    def rectangle(self, xy: list[tuple[float, float]], fill: tuple[int, ...]) -> None:
+        (x0, y0), (x1, y1) = xy
+        self._ops.append(
+            f"{self._colour(fill, False)} {pdf_number(x0)} {pdf_number(y0)} {pdf_number(x1 - x0)} {pdf_number(y1 - y0)} re f"
+        )
+
+    def rounded_rectangle(self, xy: list[tuple[float, float]], radius: float, outline: tuple[int, ...], width: float) -> None:
+        """Strokes a rounded rectangle whose outline lies inside ``xy``, as Pillow draws it."""
+        (x0, y0), (x1, y1) = xy
+        x0, y0, x1, y1 = x0 + width / 2, y0 + width / 2, x1 - width / 2, y1 - width / 2
+        r = max(radius - width / 2, 0)
+        k = r * (1 - BEZIER_CIRCLE)
+        n = pdf_number
+        self._ops.append(
+            f"{self._colour(outline, True)} {n(width)} w 0 J"
+            f" {n(x0 + r)} {n(y0)} m {n(x1 - r)} {n(y0)} l {n(x1 - k)} {n(y0)} {n(x1)} {n(y0 + k)} {n(x1)} {n(y0 + r)} c"
+            f" {n(x1)} {n(y1 - r)} l {n(x1)} {n(y1 - k)} {n(x1 - k)} {n(y1)} {n(x1 - r)} {n(y1)} c"
+            f" {n(x0 + r)} {n(y1)} l {n(x0 + k)} {n(y1)} {n(x0)} {n(y1 - k)} {n(x0)} {n(y1 - r)} c"
+            f" {n(x0)} {n(y0 + r)} l {n(x0)} {n(y0 + k)} {n(x0 + k)} {n(y0)} {n(x0 + r)} {n(y0)} c h S"
+        )
+
+    def text(
+        self, xy: tuple[float, float], text: ImageText.Text, fill: tuple[int, ...], anchor: str = "la", align: str = "left"
+    ) -> None:
+        """
+        Draws ``text`` with its font, and its line spacing for multiline text, anchored at ``xy``.
+
+        :param xy: The anchor coordinates of the text.
+        :param text: The text to draw.
+        :param fill: The colour of the text.
+        :param anchor: A Pillow horizontal and vertical anchor, vertical ``a``, ``m``, ``s`` or ``d``.
+        :param align: ``left``, ``center`` or ``right``, the alignment of the lines of multiline text.
+        """
+        name = self.writer.add_font(self.font)
+        ops = [f"BT {self._colour(fill, False)} /{name} {text.font.size} Tf"]
+        for line, left, baseline in place_lines(xy, text, anchor, align):
+            ops.append(f"1 0 0 -1 {pdf_number(left)} {pdf_number(baseline)} Tm {pdf_string(self.font.encode(line))} Tj")
+        ops.append("ET")
+        self._ops.append(" ".join(ops))
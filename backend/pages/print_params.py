@@ -1,9 +1,31 @@
-from PIL import Image, ImageFont
+from functools import cached_property, lru_cache
+
+from PIL import Image, ImageDraw, ImageFont
 
 from backend.models import ProjectConfig
 
+FONT_FILE = "backend/assets/verdana.ttf"
+
+
+@lru_cache(maxsize=1024)
+def get_font(font_file: str, size: int) -> ImageFont.FreeTypeFont:
+    """
+    Returns the font loaded from ``font_file`` at ``size`` pixels. The most recently used fonts are
+    kept loaded and shared by every rendering object, so they must not be modified by the caller.
+    The cache is bounded as previews and thumbnails draw at any number of sizes. Sizes that
+    round down to nothing, in heavily reduced drawings such as low resolution previews, are
+    loaded at one pixel.
+
+    :param font_file: The path of the TrueType font file.
+    :param size: The size of the font in pixels.
+    :return: The shared font object.
+    """
+    return ImageFont.truetype(font_file, size=max(size, 1))
+
 
 class PrintParams:
+    background: str = "TRANSPARENT_BACKGROUND"
+
     def __init__(self, *, project_config: ProjectConfig, print_debug: bool = False) -> None:
         self.config: ProjectConfig = project_config
         self.print_debug: bool = print_debug
@@ -29,24 +51,32 @@ class PrintParams:
                 "LIGHT_GREY": (192, 192),
             }
 
-        self.fonts: dict[str, ImageFont.FreeTypeFont] = {
-            "TITLE_FONT": ImageFont.truetype("backend/assets/verdana.ttf", size=self.config.title_font_size_pixels),
-            "HEADING_FONT": ImageFont.truetype(
-                "backend/assets/verdana.ttf", size=self.config.long_fact_heading_font_size_pixels
-            ),
-            "CONTENT_FONT": ImageFont.truetype(
-                "backend/assets/verdana.ttf", size=self.config.long_fact_content_font_size_pixels
-            ),
-            "CELL_FONT": ImageFont.truetype("backend/assets/verdana.ttf", size=self.config.cell_font_size_pixels),
-            "CELL_DEBUG_FONT": ImageFont.truetype("backend/assets/verdana.ttf", size=self.config.cell_font_size_pixels // 2),
-            "SEARCH_LIST_FONT": ImageFont.truetype(
-                "backend/assets/verdana.ttf", size=self.config.wordlist_font_size_pixels + 1
-            ),
-            "PAGE_NUMBER_FONT": ImageFont.truetype(
-                "backend/assets/verdana.ttf", size=self.config.page_number_font_size_pixels
-            ),
+    @cached_property
+    def fonts(self) -> dict[str, ImageFont.FreeTypeFont]:
+        return {
+            "TITLE_FONT": get_font(FONT_FILE, self.config.title_font_size_pixels),
+            "HEADING_FONT": get_font(FONT_FILE, self.config.long_fact_heading_font_size_pixels),
+            "CONTENT_FONT": get_font(FONT_FILE, self.config.long_fact_content_font_size_pixels),
+            "CELL_FONT": get_font(FONT_FILE, self.config.cell_font_size_pixels),
+            "CELL_DEBUG_FONT": get_font(FONT_FILE, self.config.cell_font_size_pixels // 2),
+            "SEARCH_LIST_FONT": get_font(FONT_FILE, self.config.wordlist_font_size_pixels + 1),
+            "PAGE_NUMBER_FONT": get_font(FONT_FILE, self.config.page_number_font_size_pixels),
         }
 
+    @cached_property
+    def base_image(self) -> Image.Image:
+        """The image the object is drawn on, only allocated when it is first drawn on."""
+        return self._make_base_image(self.background)
+
+    @cached_property
+    def draw(self) -> ImageDraw.ImageDraw:
+        return ImageDraw.Draw(self.base_image)
+
+    def release_images(self) -> None:
+        """Drops the base image once it has been used, it is allocated again if the object is drawn again."""
+        self.__dict__.pop("draw", None)
+        self.__dict__.pop("base_image", None)
+
     def _make_base_image(self, background: str = None) -> Image.Image:
         if background is None:
             background = "TRANSPARENT_BACKGROUND"
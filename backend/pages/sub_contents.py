@@ -1,19 +1,25 @@
 from abc import ABC, abstractmethod
-from copy import copy
+from collections import OrderedDict
+from functools import lru_cache
 from math import ceil
+from threading import Lock
 
-from PIL import Image, ImageDraw, ImageText
+from PIL import Image, ImageFont, ImageText
 
 from backend.models import (
     BoardImageEnum,
+    DIRECTION_BITS,
     Cell,
     DirectionEnum,
     LayoutEnum,
     ProjectConfig,
+    PuzzleGrid,
+    WordPlacement,
 )
 from backend.utils import Logger
 
-from .print_params import PrintParams
+from .print_params import FONT_FILE, PrintParams, get_font
+from .text_layout import layout_paragraph
 
 
 class SubContents(PrintParams, ABC):
@@ -26,13 +32,16 @@ class SubContents(PrintParams, ABC):
     def get_content_image(self) -> Image.Image:
         raise NotImplementedError
 
+    @staticmethod
+    def solution_stroke_width(cell_size: int) -> int:
+        """The width of the solution strokes of a grid with ``cell_size`` cells, at least one pixel."""
+        return max(int(cell_size / 10), 1)
+
 
 class SubContentsHeader(SubContents):
     def __init__(self, header_title: str, project_config: ProjectConfig, print_debug: bool = False) -> None:
         super().__init__(project_config=project_config, print_debug=print_debug)
         self.size: tuple[int, int] = (self.config.content_width_pixels, self.config.title_box_height_pixels)
-        self.base_image: Image.Image = self._make_base_image()
-        self.draw: ImageDraw.ImageDraw = ImageDraw.Draw(self.base_image)
         self.header_title: str = header_title
 
     def get_content_image(self) -> Image.Image:
@@ -63,8 +72,6 @@ class SubContentsSearchList(SubContents):
                 self.config.content_width_pixels,
                 (self.config.content_height_pixels - self.config.title_box_height_pixels) // 2,
             )
-        self.base_image: Image.Image = self._make_base_image()
-        self.draw: ImageDraw.ImageDraw = ImageDraw.Draw(self.base_image)
         self.wordlist: list[str] = wordlist
         self.layout_type: LayoutEnum = layout_type
 
@@ -95,34 +102,106 @@ class SubContentsSearchList(SubContents):
         return self.base_image
 
     def _calculate_font_size(self) -> tuple[int, list[ImageText.Text]]:
-        number_of_words = len(self.wordlist)
-        column_width = self.config.content_width_pixels // 3
-        columns: list[ImageText.Text] = []
-        font = copy(self.fonts["SEARCH_LIST_FONT"])
-        exceeds_size = True
-        while exceeds_size:
-            font = font.font_variant(size=font.size - 1)
-            if font.size <= 0:
-                raise ValueError("wordlist font too small")
-            dummy_text = ImageText.Text(text=self.wordlist[0], font=font)
-            line_height = int(dummy_text.get_bbox()[3]) + self.config.wordlist_line_spacing_pixels
-
-            max_sublist_length = int(self.base_image.height / line_height)
-            number_of_columns = max(ceil(number_of_words / max_sublist_length), 3)
-
-            chunk_size = ceil(number_of_words / number_of_columns)
-            column_width = self.config.content_width_pixels // number_of_columns
-
-            columns: list[ImageText.Text] = []
-            for column_number in range(number_of_columns):
-                text = ImageText.Text(
-                    text="\n".join(self.wordlist[column_number * chunk_size : (column_number * chunk_size) + chunk_size]),
-                    font=font,
-                    spacing=self.config.wordlist_line_spacing_pixels,
-                )
-                columns.append(text)
-            exceeds_size = any(x.get_bbox()[2] > column_width for x in columns)
-        return column_width, columns
+        """
+        Fits the search list in the box, as large as possible but smaller than ``SEARCH_LIST_FONT``,
+        spread over at least three columns.
+
+        :return: The width of a column and the text of each column.
+        """
+        font_size, number_of_columns = self.fit_wordlist(
+            tuple(self.wordlist),
+            self.fonts["SEARCH_LIST_FONT"].size - 1,
+            self.size[1],
+            self.config.content_width_pixels,
+            self.config.wordlist_line_spacing_pixels,
+        )
+        font = get_font(FONT_FILE, font_size)
+        chunk_size = ceil(len(self.wordlist) / number_of_columns)
+        columns: list[ImageText.Text] = [
+            ImageText.Text(
+                text="\n".join(self.wordlist[column_number * chunk_size : (column_number * chunk_size) + chunk_size]),
+                font=font,
+                spacing=self.config.wordlist_line_spacing_pixels,
+            )
+            for column_number in range(number_of_columns)
+        ]
+        return self.config.content_width_pixels // number_of_columns, columns
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _character_metrics(font_size: int) -> dict[str, tuple[float, float]]:
+        """The advance and the right of the box of each character met so far at ``font_size``, filled as words are measured."""
+        return {}
+
+    @staticmethod
+    @lru_cache(maxsize=65536)
+    def _shaped_word_right(font_size: int, word: str) -> float:
+        """The right of the box of ``word`` at ``font_size`` measured whole, kept for every probe of the same size."""
+        return get_font(FONT_FILE, font_size).getbbox(word)[2]
+
+    @staticmethod
+    def _word_right(font_size: int, word: str) -> float:
+        """
+        Returns the right of the box of ``word`` drawn at ``font_size``. Without kerning that is
+        the furthest right of a character box along the advances, so each character is only
+        measured once per size. A layout engine that shapes text, such as Raqm, can kern or
+        substitute glyphs, so words are measured whole and each word is only measured once per
+        size instead.
+        """
+        font = get_font(FONT_FILE, font_size)
+        if font.layout_engine != ImageFont.Layout.BASIC:
+            return SubContentsSearchList._shaped_word_right(font_size, word)
+        metrics = SubContentsSearchList._character_metrics(font_size)
+        advance = 0.0
+        right = 0.0
+        for character in word:
+            if character not in metrics:
+                metrics[character] = (font.getlength(character), font.getbbox(character)[2] if not character.isspace() else 0)
+            right = max(right, advance + metrics[character][1])
+            advance += metrics[character][0]
+        return max(right, ceil(advance))
+
+    @staticmethod
+    def _wordlist_columns(
+        wordlist: tuple[str, ...], font_size: int, box_height: int, box_width: int, line_spacing: int
+    ) -> int | None:
+        """Returns the number of columns the word list takes at ``font_size``, or None if it does not fit."""
+        line_height = int(get_font(FONT_FILE, font_size).getbbox(wordlist[0])[3]) + line_spacing
+        max_sublist_length = int(box_height / line_height)
+        if max_sublist_length <= 0:
+            return None
+        number_of_columns = max(ceil(len(wordlist) / max_sublist_length), 3)
+        widest = max(SubContentsSearchList._word_right(font_size, word) for word in wordlist)
+        return number_of_columns if widest <= box_width // number_of_columns else None
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def fit_wordlist(
+        wordlist: tuple[str, ...], max_font_size: int, box_height: int, box_width: int, line_spacing: int
+    ) -> tuple[int, int]:
+        """
+        Binary searches the largest font size up to ``max_font_size`` at which the word list fits
+        in the box. A larger font only ever needs more and wider columns, so the sizes that fit
+        are all below the ones that do not. The fit of a word list is kept, so the same list is
+        only fitted once per box.
+
+        :return: The font size and the number of columns.
+        """
+        low, high = 1, max_font_size
+        fit: tuple[int, int] | None = None
+        while low <= high:
+            font_size = (low + high) // 2
+            number_of_columns = SubContentsSearchList._wordlist_columns(
+                wordlist, font_size, box_height, box_width, line_spacing
+            )
+            if number_of_columns is None:
+                high = font_size - 1
+            else:
+                fit = (font_size, number_of_columns)
+                low = font_size + 1
+        if fit is None:
+            raise ValueError("wordlist font too small")
+        return fit
 
 
 class SubContentsCell(SubContents):
@@ -163,7 +242,7 @@ class SubContentsCell(SubContents):
     ):
         super().__init__(project_config=project_config, print_debug=print_debug)
         self.cell: Cell = cell
-        self.solution_line_width = int(cell_size / 10)
+        self.solution_line_width = self.solution_stroke_width(cell_size)
         if grid_type == BoardImageEnum.PUZZLE:
             self.size: tuple[int, int] = (cell_size, cell_size)
         else:
@@ -172,8 +251,6 @@ class SubContentsCell(SubContents):
                 cell_size + ceil(self.solution_line_width / 2 * self.ROOT_TWO_APPX),
             )
         self.grid_type: BoardImageEnum = grid_type
-        self.base_image: Image.Image = self._make_base_image()
-        self.draw: ImageDraw.ImageDraw = ImageDraw.Draw(self.base_image)
 
     def get_content_image(self) -> Image.Image:
         """
@@ -230,21 +307,108 @@ class SubContentsCell(SubContents):
         return self.base_image
 
 
+class GlyphAtlas:
+    """
+    Cache of rendered cell tiles shared by every grid drawn with the same cell size, grid type,
+    image mode and cell font size.
+
+    A tile is rendered by :class:`SubContentsCell` the first time a letter, together with its
+    solution strokes on a solution grid, is needed and is then reused for every other cell with
+    the same letter and strokes, so a grid is assembled by pasting tiles. Only the most recently
+    used ``MAX_ATLASES`` atlases are kept, as variable cell sizes give a new atlas per size.
+    Pages are drawn from several threads, so the shared atlases are only looked up under a lock.
+
+    :ivar cell_size: The size of a cell in pixels.
+    :type cell_size: int
+    :ivar grid_type: The type of grid the tiles are drawn for.
+    :type grid_type: BoardImageEnum
+    :ivar config: The project configuration the tiles are rendered with.
+    :type config: ProjectConfig
+    :ivar print_debug: Whether the tiles are rendered in debug mode.
+    :type print_debug: bool
+    """
+
+    MAX_ATLASES = 8
+    _atlases: OrderedDict[tuple[int, BoardImageEnum, bool, int], "GlyphAtlas"] = OrderedDict()
+    _atlases_lock: Lock = Lock()
+
+    def __init__(self, cell_size: int, grid_type: BoardImageEnum, project_config: ProjectConfig, print_debug: bool) -> None:
+        self.cell_size: int = cell_size
+        self.grid_type: BoardImageEnum = grid_type
+        self.config: ProjectConfig = project_config
+        self.print_debug: bool = print_debug
+        self._tiles: dict[tuple[str, int], Image.Image] = {}
+
+    @classmethod
+    def get_atlas(
+        cls, cell_size: int, grid_type: BoardImageEnum, project_config: ProjectConfig, print_debug: bool = False
+    ) -> "GlyphAtlas":
+        """
+        Returns the shared atlas for the given cell size, grid type, debug mode and cell font size,
+        creating it if needed.
+        """
+        key = (cell_size, grid_type, print_debug, project_config.cell_font_size_pixels)
+        with cls._atlases_lock:
+            atlas = cls._atlases.get(key)
+            if atlas is None:
+                atlas = cls(cell_size=cell_size, grid_type=grid_type, project_config=project_config, print_debug=print_debug)
+                cls._atlases[key] = atlas
+                if len(cls._atlases) > cls.MAX_ATLASES:
+                    cls._atlases.popitem(last=False)
+            else:
+                cls._atlases.move_to_end(key)
+        return atlas
+
+    def get_tile(self, value: str, direction_bits: int = 0) -> Image.Image:
+        """
+        Returns the tile for a cell, the image is shared and must not be drawn on.
+
+        :param value: The letter of the cell.
+        :param direction_bits: The directions of the answers through the cell as a bitmask of
+            ``DIRECTION_BITS``, only used on solution grids.
+        :return: The rendered tile.
+        """
+        if self.grid_type != BoardImageEnum.SOLUTION:
+            direction_bits = 0
+        key = (value, direction_bits)
+        tile = self._tiles.get(key)
+        if tile is None:
+            cell = Cell(
+                loc_x=0,
+                loc_y=0,
+                value=value,
+                direction={direction: bool(direction_bits & bit) for direction, bit in DIRECTION_BITS.items()},
+            )
+            tile = SubContentsCell(
+                cell=cell,
+                cell_size=self.cell_size,
+                grid_type=self.grid_type,
+                project_config=self.config,
+                print_debug=self.print_debug,
+            ).get_content_image()
+            self._tiles[key] = tile
+        return tile
+
+
 class SubContentsGrid(SubContents):
+    STROKE_REACH = 0.35
+
     def __init__(
         self,
         rows: int,
         cols: int,
-        cells: list[list[Cell]],
+        cells: PuzzleGrid,
         cell_size: int,
         project_config: ProjectConfig,
         grid_type: BoardImageEnum = BoardImageEnum.PUZZLE,
+        placements: list[WordPlacement] | None = None,
         print_debug: bool = False,
     ) -> None:
         super().__init__(project_config=project_config, print_debug=print_debug)
         self.rows: int = rows
         self.cols: int = cols
-        self.cells: list[list[Cell]] = cells
+        self.cells: PuzzleGrid = cells
+        self.placements: list[WordPlacement] = placements if placements is not None else []
         self.cell_size = cell_size
         self.grid_type: BoardImageEnum = grid_type
         self.offset = self.config.grid_pad_pixels + self.config.grid_border_pixels + self.config.grid_margin_pixels
@@ -252,48 +416,21 @@ class SubContentsGrid(SubContents):
             self.cols * self.cell_size + 2 * self.offset,
             self.rows * self.cell_size + 2 * self.offset,
         )
-        self.base_image: Image.Image = self._make_base_image()
-        self.draw: ImageDraw.ImageDraw = ImageDraw.Draw(self.base_image)
 
     def get_content_image(self) -> Image.Image:
         Logger.get_logger().debug(
             f"Generating {self.__class__} image for grid with {self.rows} rows, {self.cols} columns and grid type {self.grid_type}"
         )
-        for row in self.cells:
-            for cell in row:
-                tile_image = SubContentsCell(
-                    cell=cell,
-                    cell_size=self.cell_size,
-                    grid_type=self.grid_type,
-                    project_config=self.config,
-                    print_debug=self.print_debug,
-                ).get_content_image()
-                if self.grid_type == BoardImageEnum.PUZZLE:
-                    box = ((cell.loc_x * self.cell_size) + self.offset, (cell.loc_y * self.cell_size) + self.offset)
-                else:
-                    solution_offset = ceil(int(self.cell_size / 10) / 2 * self.ROOT_TWO_APPX)
-                    box = (
-                        (cell.loc_x * self.cell_size) + self.offset - solution_offset,
-                        (cell.loc_y * self.cell_size) + self.offset - solution_offset,
-                    )
-                self.base_image.paste(
-                    im=tile_image,
-                    box=box,
-                    mask=tile_image,
-                )
-
+        self._draw_cells()
+        # the box is inclusive, it ends on the last pixel so the border is as wide on every side,
+        # and reduced grids such as solution thumbnails keep a border at least a pixel wide
+        pad = self.config.grid_pad_pixels
         self.draw.rounded_rectangle(
-            [
-                (self.config.grid_pad_pixels, self.config.grid_pad_pixels),
-                (
-                    self.base_image.width - self.config.grid_pad_pixels,
-                    self.base_image.height - self.config.grid_pad_pixels,
-                ),
-            ],
+            [(pad, pad), (self.base_image.width - pad - 1, self.base_image.height - pad - 1)],
             radius=self.config.grid_border_radius_pixels,
             fill=None,
             outline=self.colours["SOLID_BLACK"],
-            width=self.config.grid_border_pixels,
+            width=max(self.config.grid_border_pixels, 1),
         )
         if self.print_debug:
             for r in range(self.rows):
@@ -454,6 +591,74 @@ class SubContentsGrid(SubContents):
 
         return self.base_image
 
+    @property
+    def stroke_width(self) -> int:
+        return self.solution_stroke_width(self.cell_size)
+
+    @property
+    def tile_pad(self) -> int:
+        """The amount a cell tile overhangs the cell, solution tiles are enlarged to fit their strokes."""
+        if self.grid_type == BoardImageEnum.PUZZLE:
+            return 0
+        return ceil(self.stroke_width / 2 * self.ROOT_TWO_APPX)
+
+    @property
+    def tile_centre(self) -> int:
+        """The offset of the centre of the top left cell from the edges of the grid image."""
+        return self.offset - self.tile_pad + (self.cell_size + self.tile_pad) // 2
+
+    def placement_stroke(self, placement: WordPlacement) -> list[tuple[float, float]]:
+        """
+        Works out the end points of the solution stroke of one word, on the line through the
+        centres of its cells. The stroke stops short of the cell edges at either end, so words
+        that meet end to end in the same direction stay distinguishable.
+
+        :param placement: The placement of the word.
+        :return: The start and end points of the stroke.
+        """
+        step_x, step_y = placement.step
+        reach = self.cell_size * self.STROKE_REACH
+        return [
+            (
+                self.tile_centre + x * self.cell_size + sign * step_x * reach,
+                self.tile_centre + y * self.cell_size + sign * step_y * reach,
+            )
+            for (x, y), sign in ((placement.start, -1), (placement.end, 1))
+        ]
+
+    def _draw_cells(self) -> None:
+        """
+        Pastes the tile of every cell from the glyph atlas. On a solution grid with recorded
+        placements the tiles are pasted without strokes and one round ended stroke is drawn
+        per word, otherwise the strokes come from the direction flags of each cell.
+        """
+        atlas = GlyphAtlas.get_atlas(
+            cell_size=self.cell_size, grid_type=self.grid_type, project_config=self.config, print_debug=self.print_debug
+        )
+        tile_offset = self.offset - self.tile_pad
+        draw_strokes = self.grid_type == BoardImageEnum.SOLUTION and len(self.placements) > 0
+        letters = self.cells.letters.tolist()
+        directions = self.cells.directions.tolist()
+        for y in range(self.rows):
+            for x in range(self.cols):
+                tile_image = atlas.get_tile(chr(letters[y][x]), 0 if draw_strokes else directions[y][x])
+                self.base_image.paste(
+                    im=tile_image,
+                    box=((x * self.cell_size) + tile_offset, (y * self.cell_size) + tile_offset),
+                    mask=tile_image,
+                )
+        if not draw_strokes:
+            return
+        width = self.stroke_width
+        for placement in self.placements:
+            ends = self.placement_stroke(placement)
+            self.draw.line(xy=ends, fill=self.colours["SOLID_BLACK"], width=width)
+            for end_x, end_y in ends:
+                self.draw.ellipse(
+                    xy=[(end_x - width / 2, end_y - width / 2), (end_x + width / 2, end_y + width / 2)],
+                    fill=self.colours["SOLID_BLACK"],
+                )
+
 
 class SubContentsLongFact(SubContents):
     def __init__(self, long_fact: str, project_config: ProjectConfig, print_debug: bool = False):
@@ -462,8 +667,6 @@ class SubContentsLongFact(SubContents):
             self.config.content_width_pixels,
             (self.config.content_height_pixels - self.config.title_box_height_pixels) // 2,
         )
-        self.base_image: Image.Image = self._make_base_image()
-        self.draw: ImageDraw.ImageDraw = ImageDraw.Draw(self.base_image)
         self.long_fact = long_fact
 
     def get_content_image(self) -> Image.Image:
@@ -485,23 +688,8 @@ class SubContentsLongFact(SubContents):
         return self.base_image
 
     def _get_paragraph(self, long_fact: str) -> ImageText.Text:
-        split_list = []
-        temp_list = []
-        for word in long_fact.split():
-            line = ImageText.Text(
-                text=" ".join(temp_list + [word]),
-                font=self.fonts["CONTENT_FONT"],
-            )
-            if line.get_length() < self.config.content_width_pixels:
-                temp_list.append(word)
-            else:
-                split_list.append(temp_list)
-                temp_list = [word]
-        paragraph = ImageText.Text(
-            "\n".join([" ".join(x) for x in split_list]),
-            font=self.fonts["CONTENT_FONT"],
-        )
-        return paragraph
+        lines = layout_paragraph(long_fact, self.fonts["CONTENT_FONT"], self.config.content_width_pixels)
+        return ImageText.Text("\n".join(lines), font=self.fonts["CONTENT_FONT"])
 
 
 class SubContentsPageNumber(SubContents):
@@ -511,8 +699,6 @@ class SubContentsPageNumber(SubContents):
             self.config.page_number_font_size_pixels + self.config.page_number_offset_pixels,
             self.config.page_number_font_size_pixels + self.config.page_number_offset_pixels,
         )
-        self.base_image: Image.Image = self._make_base_image()
-        self.draw: ImageDraw.ImageDraw = ImageDraw.Draw(self.base_image)
         self.page_number = page_number
 
     def get_content_image(self) -> Image.Image:
@@ -0,0 +1,109 @@
+import base64
+from contextlib import contextmanager
+from typing import Iterator
+from xml.sax.saxutils import escape
+
+from PIL import ImageText
+
+from .pdf_writer import pdf_number
+from .text_layout import place_lines
+
+FONT_FAMILY = "PageFont"
+
+
+class SvgCanvas:
+    """
+    Builds one page as an SVG document with the drawing interface of :class:`PdfCanvas`, in the
+    pixel coordinates of the raster pages: the origin is the top left corner of the page and y
+    grows downwards.
+
+    The pixel coordinates are the view box of the document and its printed size is set in
+    inches from the dpi, so line widths, radii and font sizes are given in pixels just as they
+    are for Pillow. The font file is embedded in the document so text is laid out with the same
+    metrics as the raster pages.
+
+    :ivar size: The size of the page in pixels.
+    :type size: tuple[int, int]
+    :ivar dpi: The resolution the pixel coordinates are given in.
+    :type dpi: int
+    """
+
+    def __init__(self, font_file: str, size: tuple[int, int], dpi: int) -> None:
+        self.font_file: str = font_file
+        self.size: tuple[int, int] = size
+        self.dpi: int = dpi
+        self._elements: list[str] = []
+
+    def finish(self) -> bytes:
+        """Returns the page as an SVG document."""
+        with open(self.font_file, "rb") as fd:
+            font_data = base64.b64encode(fd.read()).decode("ascii")
+        width, height = (pdf_number(value / self.dpi) for value in self.size)
+        return "\n".join(
+            [
+                f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}in" height="{height}in"'
+                f' viewBox="0 0 {self.size[0]} {self.size[1]}">',
+                f"<style>@font-face {{ font-family: {FONT_FAMILY}; src: url(data:font/ttf;base64,{font_data}); }}</style>",
+                f'<rect width="{self.size[0]}" height="{self.size[1]}" fill="#ffffff"/>',
+                *self._elements,
+                "</svg>",
+            ]
+        ).encode("utf-8")
+
+    @contextmanager
+    def translate(self, x: float, y: float, scale: float = 1.0) -> Iterator[None]:
+        """Moves the origin to ``(x, y)`` and scales the drawing inside the block by ``scale``."""
+        self._elements.append(f'<g transform="translate({pdf_number(x)} {pdf_number(y)}) scale({pdf_number(scale)})">')
+        yield
+        self._elements.append("</g>")
+
+    @staticmethod
+    def _colour(fill: tuple[int, ...]) -> str:
+        if len(fill) <= 2:
+            return f"#{fill[0]:02x}{fill[0]:02x}{fill[0]:02x}"
+        return f"#{fill[0]:02x}{fill[1]:02x}{fill[2]:02x}"
+
+    def line(self, xy: list[tuple[float, float]], fill: tuple[int, ...], width: float, round_caps: bool = False) -> None:
+        points = " ".join(f"{pdf_number(x)},{pdf_number(y)}" for x, y in xy)
+        self._elements.append(
+            f'<polyline points="{points}" fill="none" stroke="{self._colour(fill)}" stroke-width="{pdf_number(width)}"'
+            f' stroke-linecap="{"round" if round_caps else "butt"}"/>'
+        )
+
+    def rectangle(self, xy: list[tuple[float, float]], fill: tuple[int, ...]) -> None:
+        (x0, y0), (x1, y1) = xy
+        self._elements.append(
+            f'<rect x="{pdf_number(x0)}" y="{pdf_number(y0)}" width="{pdf_number(x1 - x0)}" height="{pdf_number(y1 - y0)}"'
+            f' fill="{self._colour(fill)}"/>'
+        )
+
+    def rounded_rectangle(self, xy: list[tuple[float, float]], radius: float, outline: tuple[int, ...], width: float) -> None:
+        """Strokes a rounded rectangle whose outline lies inside ``xy``, as Pillow draws it."""
+        (x0, y0), (x1, y1) = xy
+        x0, y0, x1, y1 = x0 + width / 2, y0 + width / 2, x1 - width / 2, y1 - width / 2
+        r = pdf_number(max(radius - width / 2, 0))
+        self._elements.append(
+            f'<rect x="{pdf_number(x0)}" y="{pdf_number(y0)}" width="{pdf_number(x1 - x0)}" height="{pdf_number(y1 - y0)}"'
+            f' rx="{r}" ry="{r}" fill="none" stroke="{self._colour(outline)}" stroke-width="{pdf_number(width)}"/>'
+        )
+
+    def text(
+        self, xy: tuple[float, float], text: ImageText.Text, fill: tuple[int, ...], anchor: str = "la", align: str = "left"
+    ) -> None:
+        """
+        Draws ``text`` with its font, and its line spacing for multiline text, anchored at ``xy``.
+
+        :param xy: The anchor coordinates of the text.
+        :param text: The text to draw.
+        :param fill: The colour of the text.
+        :param anchor: A Pillow horizontal and vertical anchor, vertical ``a``, ``m``, ``s`` or ``d``.
+        :param align: ``left``, ``center`` or ``right``, the alignment of the lines of multiline text.
+        """
+        spans = "".join(
+            f'<tspan x="{pdf_number(left)}" y="{pdf_number(baseline)}">{escape(line)}</tspan>'
+            for line, left, baseline in place_lines(xy, text, anchor, align)
+        )
+        self._elements.append(
+            f'<text font-family="{FONT_FAMILY}, Verdana, sans-serif" font-size="{text.font.size}" fill="{self._colour(fill)}"'
+            f' xml:space="preserve">{spans}</text>'
+        )
@@ -0,0 +1,80 @@
+from functools import lru_cache
+
+from PIL import ImageFont, ImageText
+
+
+@lru_cache(maxsize=65536)
+def word_length(font: ImageFont.FreeTypeFont, word: str) -> float:
+    """
+    Returns the advance of ``word`` in ``font``. Words are measured once per font, fonts are
+    shared through :func:`get_font` so the same font is always the same key.
+    """
+    return font.getlength(word)
+
+
+@lru_cache(maxsize=1024)
+def layout_paragraph(text: str, font: ImageFont.FreeTypeFont, width: int) -> tuple[str, ...]:
+    """
+    Wraps ``text`` greedily in to lines that are shorter than ``width``, a word that is too long
+    on its own gets a line to itself. Without kerning the length of a line is the sum of its
+    words and spaces, so each word is only measured once and the text is wrapped in linear time.
+    The layout of a text is kept for the next time it is wrapped in the same font and width.
+
+    :param text: The paragraph, words are separated by any white space.
+    :param font: The font the paragraph is drawn in.
+    :param width: The width the lines must be shorter than, in pixels.
+    :return: The lines of the paragraph.
+    """
+    additive = font.layout_engine == ImageFont.Layout.BASIC
+    space = word_length(font, " ")
+    lines: list[str] = []
+    line: list[str] = []
+    length = 0.0
+    for word in text.split():
+        if len(line) == 0:
+            line, length = [word], word_length(font, word)
+            continue
+        candidate = length + space + word_length(font, word) if additive else font.getlength(" ".join(line + [word]))
+        if candidate < width:
+            line.append(word)
+            length = candidate
+        else:
+            lines.append(" ".join(line))
+            line, length = [word], word_length(font, word)
+    if len(line) > 0:
+        lines.append(" ".join(line))
+    return tuple(lines)
+
+
+def place_lines(
+    xy: tuple[float, float], text: ImageText.Text, anchor: str = "la", align: str = "left"
+) -> list[tuple[str, float, float]]:
+    """
+    Places the lines of ``text`` the way Pillow does for ``ImageDraw.text``, for drawing text
+    on a vector canvas with the layout of the raster pages.
+
+    :param xy: The anchor coordinates of the text.
+    :param text: The text, with its font and the line spacing for multiline text.
+    :param anchor: A Pillow horizontal and vertical anchor, vertical ``a``, ``m``, ``s`` or ``d``.
+    :param align: ``left``, ``center`` or ``right``, the alignment of the lines of multiline text.
+    :return: Each line with the x coordinate of its start and the y coordinate of its baseline.
+    """
+    font: ImageFont.FreeTypeFont = text.font
+    ascent, descent = font.getmetrics()
+    baseline = {"a": ascent, "m": (ascent - descent) / 2, "s": 0, "d": -descent}[anchor[1]]
+    lines = text.text.split("\n")
+    widths = [font.getlength(line) for line in lines]
+    max_width = max(widths)
+    line_spacing = font.getbbox("A")[3] + text.spacing
+    top = xy[1]
+    if anchor[1] == "m":
+        top -= (len(lines) - 1) * line_spacing / 2
+    elif anchor[1] == "d":
+        top -= (len(lines) - 1) * line_spacing
+    placed = []
+    for line, width in zip(lines, widths):
+        left = xy[0] + {"left": 0, "center": (max_width - width) / 2, "right": max_width - width}[align]
+        left -= {"l": 0, "m": max_width / 2, "r": max_width}[anchor[0]]
+        placed.append((line, left, top + baseline))
+        top += line_spacing
+    return placed
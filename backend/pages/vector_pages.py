@@ -0,0 +1,229 @@
+from pathlib import Path as FilePath
+from typing import Callable
+
+from PIL import ImageText
+
+from backend.models import (
+    BoardImageEnum,
+    DirectionEnum,
+    LayoutEnum,
+    PageTypeEnum,
+    ProjectConfig,
+    Puzzle,
+    PuzzleData,
+)
+
+from .contents import (
+    Contents,
+    ContentsBlank,
+    ContentsFront,
+    ContentsPuzzleGrid,
+    ContentsPuzzleWordlist,
+    ContentsSolution,
+)
+from .pages import Page, Pages
+from .pdf_writer import PdfCanvas, PdfFont
+from .print_params import FONT_FILE
+from .svg_canvas import SvgCanvas
+from .sub_contents import (
+    SubContentsGrid,
+    SubContentsHeader,
+    SubContentsLongFact,
+    SubContentsPageNumber,
+    SubContentsSearchList,
+)
+
+
+class VectorPages(Pages):
+    """
+    Builds the manuscript as a vector PDF with no raster stage.
+
+    The pages are planned by :class:`Pages` and laid out with the same ``Contents`` and
+    ``SubContents`` objects and ``ProjectConfig`` pixel sizes as the raster manuscript, but
+    every page is drawn as PDF text and paths with an embedded copy of the font. The debug
+    overlays of ``print_debug`` are not drawn. Drawing is fast enough that the pages are drawn
+    in order in this process, with no worker pool.
+    """
+
+    def __init__(
+        self, word_search_data: PuzzleData, project_config: ProjectConfig, filename: FilePath, print_debug: bool = False
+    ):
+        super().__init__(
+            word_search_data=word_search_data, project_config=project_config, filename=filename, print_debug=print_debug
+        )
+        self.font: PdfFont = PdfFont(FONT_FILE)
+        self.renderers: dict[type[Contents], Callable[[PdfCanvas | SvgCanvas, Contents], None]] = {
+            ContentsFront: self._draw_front,
+            ContentsBlank: lambda canvas, contents: None,
+            ContentsPuzzleGrid: self._draw_puzzle_grid,
+            ContentsPuzzleWordlist: self._draw_puzzle_wordlist,
+            ContentsSolution: self._draw_solution,
+        }
+
+    def _add_page(self, contents: Contents):
+        self.page_count += 1
+        canvas = PdfCanvas(
+            writer=self._get_writer(),
+            font=self.font,
+            size=(self.config.page_width_pixels, self.config.page_height_pixels),
+            dpi=self.config.dpi,
+        )
+        self.draw_page(canvas, contents, self.page_count)
+        canvas.finish()
+
+    def draw_page(self, canvas: PdfCanvas | SvgCanvas, contents: Contents, page_number: int) -> None:
+        """Draws ``contents`` and the page number on ``canvas`` as page ``page_number`` of the book."""
+        page_type = PageTypeEnum.RECTO if page_number % 2 == 1 else PageTypeEnum.VERSO
+        left_margin_x_coord, _ = Page.get_margins(self.config, page_type)
+        with canvas.translate(left_margin_x_coord, self.config.top_margin_pixels):
+            self.renderers[type(contents)](canvas, contents)
+        if page_number > 1:
+            page_number_contents = SubContentsPageNumber(page_number=str(page_number), project_config=self.config)
+            x, y = Page.get_page_number_location(self.config, page_type, page_number_contents.size)
+            text = ImageText.Text(text=page_number_contents.page_number, font=page_number_contents.fonts["PAGE_NUMBER_FONT"])
+            canvas.text(
+                xy=(x + page_number_contents.size[0] // 2, y + page_number_contents.size[1] // 2),
+                text=text,
+                fill=self.colours["SOLID_BLACK"],
+                anchor="mm",
+            )
+
+    def _draw_front(self, canvas: PdfCanvas | SvgCanvas, contents: ContentsFront) -> None:
+        text = ImageText.Text(text=contents.front_title, font=contents.fonts["TITLE_FONT"])
+        canvas.text(
+            xy=(contents.size[0] // 2, contents.size[1] // 2), text=text, fill=self.colours["SOLID_BLACK"], anchor="mm"
+        )
+
+    def _draw_header(self, canvas: PdfCanvas | SvgCanvas, header: SubContentsHeader) -> None:
+        text = ImageText.Text(text=header.header_title, font=header.fonts["TITLE_FONT"])
+        canvas.text(xy=(header.size[0] // 2, header.size[1] // 2), text=text, fill=self.colours["SOLID_BLACK"], anchor="mm")
+
+    def _draw_grid(self, canvas: PdfCanvas | SvgCanvas, grid: SubContentsGrid) -> None:
+        letters = grid.cells.letters.tolist()
+        font = grid.fonts["CELL_FONT"]
+        for y in range(grid.rows):
+            for x in range(grid.cols):
+                canvas.text(
+                    xy=(grid.tile_centre + x * grid.cell_size, grid.tile_centre + y * grid.cell_size),
+                    text=ImageText.Text(text=chr(letters[y][x]), font=font),
+                    fill=self.colours["SOLID_BLACK"],
+                    anchor="mm",
+                )
+        if grid.grid_type == BoardImageEnum.SOLUTION:
+            if len(grid.placements) > 0:
+                for placement in grid.placements:
+                    canvas.line(
+                        xy=grid.placement_stroke(placement),
+                        fill=self.colours["SOLID_BLACK"],
+                        width=grid.stroke_width,
+                        round_caps=True,
+                    )
+            else:
+                self._draw_cell_strokes(canvas, grid)
+        pad = grid.config.grid_pad_pixels
+        canvas.rounded_rectangle(
+            xy=[(pad, pad), (grid.size[0] - pad, grid.size[1] - pad)],
+            radius=grid.config.grid_border_radius_pixels,
+            outline=self.colours["SOLID_BLACK"],
+            width=grid.config.grid_border_pixels,
+        )
+
+    def _draw_cell_strokes(self, canvas: PdfCanvas | SvgCanvas, grid: SubContentsGrid) -> None:
+        """Draws the solution strokes of a grid without placements from the direction flags of each cell."""
+        tile_size = grid.cell_size + grid.tile_pad
+        for y in range(grid.rows):
+            for x in range(grid.cols):
+                cell = grid.cells.cell(x, y)
+                left = grid.offset - grid.tile_pad + x * grid.cell_size
+                top = grid.offset - grid.tile_pad + y * grid.cell_size
+                segments = {
+                    DirectionEnum.NS: [(left + tile_size // 2, top), (left + tile_size / 2, top + tile_size)],
+                    DirectionEnum.EW: [(left, top + tile_size / 2), (left + tile_size, top + tile_size / 2)],
+                    DirectionEnum.NESW: [(left, top + tile_size), (left + tile_size, top)],
+                    DirectionEnum.NWSE: [(left, top), (left + tile_size, top + tile_size)],
+                }
+                for direction, segment in segments.items():
+                    if cell.direction[direction]:
+                        canvas.line(xy=segment, fill=self.colours["SOLID_BLACK"], width=grid.stroke_width)
+
+    def _draw_search_list(self, canvas: PdfCanvas | SvgCanvas, search_list: SubContentsSearchList) -> None:
+        column_width, columns = search_list._calculate_font_size()
+        for column_number, column in enumerate(columns):
+            canvas.text(
+                xy=(int(column_number * column_width) + (column_width // 2), 0),
+                text=column,
+                fill=self.colours["SOLID_BLACK"],
+                anchor="ma",
+                align="left",
+            )
+
+    def _draw_long_fact(self, canvas: PdfCanvas | SvgCanvas, long_fact: SubContentsLongFact) -> None:
+        title = ImageText.Text(text="Did you know?", font=long_fact.fonts["HEADING_FONT"])
+        canvas.text(xy=(0, 0), text=title, fill=self.colours["SOLID_BLACK"])
+        paragraph = long_fact._get_paragraph(long_fact.long_fact)
+        canvas.text(xy=(0, title.get_bbox()[3]), text=paragraph, fill=self.colours["SOLID_BLACK"], align="left")
+
+    def _make_grid(self, puzzle: Puzzle, grid_type: BoardImageEnum, cell_size: int) -> SubContentsGrid:
+        return SubContentsGrid(
+            rows=puzzle.rows,
+            cols=puzzle.columns,
+            cells=puzzle.cells,
+            cell_size=cell_size,
+            grid_type=grid_type,
+            placements=puzzle.placements,
+            project_config=self.config,
+        )
+
+    def _draw_puzzle_grid(self, canvas: PdfCanvas | SvgCanvas, contents: ContentsPuzzleGrid) -> None:
+        puzzle = contents.puzzle
+        self._draw_header(canvas, SubContentsHeader(header_title=puzzle.display_title, project_config=self.config))
+        cell_size = contents.calculate_cells_size(puzzle.columns, puzzle.rows)
+        grid = self._make_grid(puzzle, contents.grid_image_type, cell_size)
+        with canvas.translate(contents.size[0] // 2 - grid.size[0] // 2, self.config.title_box_height_pixels):
+            self._draw_grid(canvas, grid)
+        if contents.grid_page_type == LayoutEnum.SINGLE and contents.grid_image_type == BoardImageEnum.PUZZLE:
+            search_list = SubContentsSearchList(
+                wordlist=puzzle.puzzle_search_list, layout_type=LayoutEnum.SINGLE, project_config=self.config
+            )
+            with canvas.translate(0, contents.size[1] - self.config.wordlist_box_height_pixels):
+                self._draw_search_list(canvas, search_list)
+
+    def _draw_puzzle_wordlist(self, canvas: PdfCanvas | SvgCanvas, contents: ContentsPuzzleWordlist) -> None:
+        puzzle = contents.puzzle
+        self._draw_header(canvas, SubContentsHeader(header_title=puzzle.display_title, project_config=self.config))
+        search_list = SubContentsSearchList(
+            wordlist=puzzle.puzzle_search_list, layout_type=LayoutEnum.DOUBLE, project_config=self.config
+        )
+        with canvas.translate(contents.size[0] // 2 - search_list.size[0] // 2, self.config.title_box_height_pixels):
+            self._draw_search_list(canvas, search_list)
+        long_fact = SubContentsLongFact(long_fact=puzzle.long_fact, project_config=self.config)
+        half_height = (contents.size[1] - self.config.title_box_height_pixels) // 2
+        with canvas.translate(0, half_height + self.config.title_box_height_pixels):
+            self._draw_long_fact(canvas, long_fact)
+
+    def _draw_solution(self, canvas: PdfCanvas | SvgCanvas, contents: ContentsSolution) -> None:
+        banner_height = self.config.solution_page_banner_height_pixels
+        canvas.rectangle(xy=[(0, 0), (contents.size[0], banner_height)], fill=self.colours["LIGHT_GREY"])
+        if contents.verso_page:
+            text = ImageText.Text(text=contents.solution_title, font=contents.fonts["TITLE_FONT"])
+            canvas.text(xy=(0, banner_height // 2), text=text, fill=self.colours["SOLID_BLACK"], anchor="lm")
+        else:
+            text = ImageText.Text(text=f"{contents.start}-{contents.end} ", font=contents.fonts["TITLE_FONT"])
+            canvas.text(xy=(contents.size[0], banner_height // 2), text=text, fill=self.colours["SOLID_BLACK"], anchor="rm")
+        col_width = contents.size[0] // self.config.solution_page_cols
+        row_height = (contents.size[1] - banner_height) // self.config.solution_page_rows
+        thumbnail_scale = min(col_width / contents.size[0], row_height / contents.size[1])
+        for n, puzzle in enumerate(contents.puzzle_list):
+            x = n % self.config.solution_page_cols
+            y = n // self.config.solution_page_cols
+            left = (x * col_width) + (col_width // 2) - (contents.size[0] * thumbnail_scale / 2)
+            with canvas.translate(left, (y * row_height) + banner_height, thumbnail_scale):
+                self._draw_solution_thumbnail(canvas, contents, puzzle)
+
+    def _draw_solution_thumbnail(self, canvas: PdfCanvas | SvgCanvas, contents: ContentsSolution, puzzle: Puzzle) -> None:
+        header = SubContentsHeader(header_title=puzzle.display_title, project_config=self.config)
+        self._draw_header(canvas, header)
+        grid = self._make_grid(puzzle, BoardImageEnum.SOLUTION, contents.calculate_cells_size(puzzle.columns, puzzle.rows))
+        grid_scale = min(contents.size[0] / grid.size[0], (contents.size[1] - header.size[1]) / grid.size[1])
+        with canvas.translate(0, header.size[1], grid_scale):
+            self._draw_grid(canvas, grid)
@@ -22,6 +22,7 @@ from ..models import (
     PuzzleInput,
 )
 from ..models.wordlist import WordlistInput
+from ..pages import PageCache
 from ..utils import get_profanity_list
 
 
@@ -95,12 +96,23 @@ def load_wordlist(wordlist_path: Annotated[FilePath, Depends(check_wordlist_exis
     return wordlist
 
 
+class WordlistValidationError(HTTPException):
+    """
+    A 400 for a wordlist that failed validation. ``detail`` stays the readable summary, and the
+    position of each issue is returned next to it in ``positions``, see ``wordlist_validation_handler``.
+    """
+
+    def __init__(self, detail: str, positions: list[dict[str, str | int]]) -> None:
+        super().__init__(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+        self.positions: list[dict[str, str | int]] = positions
+
+
 def validate_word_lists(wordlist: Annotated[Wordlist, Depends(load_wordlist)]) -> Wordlist:
     validation_dict = wordlist.validate_word_lists()
     if validation_dict["profanity"] or validation_dict["illegal_chars"]:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
+        raise WordlistValidationError(
             detail=f"Wordlist contains invalid words. Profanity: {validation_dict['profanity']}, Illegal Chars: {validation_dict['illegal_chars']}",
+            positions=validation_dict["positions"],
         )
     return wordlist
 
@@ -119,6 +131,22 @@ def check_puzzle_data_exists(puzzle_data_path: Annotated[FilePath, Depends(get_p
     return puzzle_data_path
 
 
+def get_puzzle_data_paths(data_path: Annotated[FilePath, Depends(get_data_path)], req: Request) -> list[FilePath]:
+    return sorted(
+        project_dir / req.state.config.app.data_filename
+        for project_dir in data_path.iterdir()
+        if (project_dir / req.state.config.app.data_filename).is_file()
+    )
+
+
+def rescan_profanity_in_projects(puzzle_data_paths: list[FilePath], workers: int) -> None:
+    """Re-checks stale profanity, cached puzzle data is dropped before each file is rewritten."""
+    PuzzleData.rescan_stale_profanity_files(
+        puzzle_data_paths, workers, before_write=lambda puzzle_data_path: load_puzzle_data.cache_clear()
+    )
+    load_puzzle_data.cache_clear()
+
+
 @lru_cache(maxsize=5)
 def load_puzzle_data(
     puzzle_data_path: Annotated[FilePath, Depends(check_puzzle_data_exists)],
@@ -132,6 +160,12 @@ def get_manuscript_path(project_dir: Annotated[FilePath, Depends(get_project_pat
     return project_dir / req.state.config.app.output_filename
 
 
+def get_page_cache(manuscript_path: Annotated[FilePath, Depends(get_manuscript_path)], req: Request) -> PageCache | None:
+    if req.state.config.app.page_cache_size <= 0:
+        return None
+    return PageCache(folder=manuscript_path.parent / PageCache.FOLDER, max_size=req.state.config.app.page_cache_size * 1024**2)
+
+
 def check_manuscript_exists(manuscript_path: Annotated[FilePath, Depends(get_manuscript_path)]) -> FilePath:
     if not manuscript_path.exists():
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Manuscript not found")
@@ -175,14 +209,14 @@ def get_profanity_list_model() -> ProfanityList:
 
 
 def dir_copy(src: FilePath, dst: FilePath):
-    for root, dirs, files in src.walk():
-        for file in files:
-            with open(root / file, "rb") as fd:
-                with open(dst / file, "wb") as tfd:
-                    tfd.write(fd.read())
-        for directory in dirs:
-            (dst / directory).mkdir(parents=True)
-            dir_copy(root / directory, dst / directory)
+    for path in src.iterdir():
+        if path.is_dir():
+            (dst / path.name).mkdir(parents=True)
+            dir_copy(path, dst / path.name)
+            continue
+        with open(path, "rb") as fd:
+            with open(dst / path.name, "wb") as tfd:
+                tfd.write(fd.read())
 
 
 def convert_to_title_case(word: str) -> str:
@@ -1,16 +1,17 @@
 from pathlib import Path as FilePath
 from typing import Annotated
 
-from fastapi import APIRouter, BackgroundTasks, Depends, status
+from fastapi import APIRouter, BackgroundTasks, Depends, Request, status
 from starlette.responses import FileResponse
 
 from backend.models import PuzzleData
-from backend.pages import Pages
+from backend.pages import PageCache, Pages, VectorPages
 from backend.utils import clear_marker_file, set_marker_file
 
 from .. import (
     check_manuscript_exists,
     get_manuscript_path,
+    get_page_cache,
     load_puzzle_data,
 )
 
@@ -27,18 +28,35 @@ ProjectManuscriptRouter = APIRouter(
     status_code=status.HTTP_202_ACCEPTED,
 )
 def create_manuscript(
+    req: Request,
     print_debug: bool,
     bg_tasks: BackgroundTasks,
     puzzle_data: Annotated[PuzzleData, Depends(load_puzzle_data)],
     manuscript_path: Annotated[FilePath, Depends(get_manuscript_path)],
+    page_cache: Annotated[PageCache | None, Depends(get_page_cache)],
+    vector: bool = False,
 ) -> None:
-    """Create a manuscript for a project in the background."""
-    pages = Pages(
-        word_search_data=puzzle_data,
-        filename=manuscript_path,
-        project_config=puzzle_data.project_config,
-        print_debug=print_debug,
-    )
+    """
+    Create a manuscript for a project in the background, as a vector PDF if ``vector`` is set.
+    Raster pages are rendered in ``render_workers`` processes and kept in the page cache of the
+    project, so a rebuild only renders the pages that changed.
+    """
+    if vector:
+        pages = VectorPages(
+            word_search_data=puzzle_data,
+            filename=manuscript_path,
+            project_config=puzzle_data.project_config,
+            print_debug=print_debug,
+        )
+    else:
+        pages = Pages(
+            word_search_data=puzzle_data,
+            filename=manuscript_path,
+            project_config=puzzle_data.project_config,
+            print_debug=print_debug,
+            workers=req.state.config.app.render_workers,
+            cache=page_cache,
+        )
     clear_marker_file(manuscript_path)
     set_marker_file(manuscript_path, 0)
     bg_tasks.add_task(pages.create_and_save_pages)
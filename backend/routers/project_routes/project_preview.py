@@ -0,0 +1,56 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from starlette import status
+
+from backend.models import PreviewFormatEnum, PreviewPageEnum, PuzzleData
+from backend.pages import MEDIA_TYPES, PagePreview
+
+from .. import load_puzzle_data
+
+ProjectPreviewRouter = APIRouter(
+    prefix="/preview",
+    tags=["Project"],
+)
+
+
+@ProjectPreviewRouter.get(
+    "/{page_type}/{puzzle_id}/",
+    summary="Get a preview of a page of a puzzle.",
+    description="Get the puzzle, word list or solution page of a puzzle as a low resolution PNG or as SVG.",
+    status_code=status.HTTP_200_OK,
+    response_class=Response,
+    responses={
+        status.HTTP_200_OK: {"content": {media_type: {} for media_type in MEDIA_TYPES.values()}},
+        status.HTTP_304_NOT_MODIFIED: {"description": "The preview has not changed since the ETag in If-None-Match."},
+    },
+)
+def get_page_preview(
+    page_type: PreviewPageEnum,
+    puzzle_id: str,
+    puzzle_data: Annotated[PuzzleData, Depends(load_puzzle_data)],
+    preview_format: PreviewFormatEnum = PreviewFormatEnum.PNG,
+    dpi: Annotated[int, Query(ge=36, le=300)] = 96,
+    print_debug: bool = False,
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> Response:
+    """
+    Draws one page of the book on demand. The ETag of the preview only changes when a puzzle on
+    the page, the project settings or the request change, so a client revalidating with
+    If-None-Match gets a 304 without the page being drawn again.
+    """
+    preview = PagePreview(
+        word_search_data=puzzle_data, project_config=puzzle_data.project_config, dpi=dpi, print_debug=print_debug
+    )
+    try:
+        page_number, contents = preview.find_page(puzzle_id, page_type)
+    except KeyError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=e.args[0])
+    headers = {"ETag": preview.etag(contents, page_number, preview_format), "Cache-Control": "no-cache"}
+    if if_none_match is not None and headers["ETag"] in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(
+        content=preview.draw_preview(contents, page_number, preview_format),
+        media_type=MEDIA_TYPES[preview_format],
+        headers=headers,
+    )
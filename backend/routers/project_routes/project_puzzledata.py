@@ -1,7 +1,7 @@
 from pathlib import Path as FilePath
 from typing import Annotated
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request
 from starlette import status
 
 from backend.models import (
@@ -36,17 +36,21 @@ ProjectPuzzleDataRouter = APIRouter(
     status_code=status.HTTP_202_ACCEPTED,
 )
 def create_puzzledata(
+    req: Request,
     bg_tasks: BackgroundTasks,
     wordlist: Annotated[Wordlist, Depends(validate_word_lists)],
     puzzle_config: Annotated[ProjectConfig, Depends(load_project_settings)],
     puzzle_data_path: FilePath = Depends(get_puzzle_data_path),
+    seed: int | None = None,
 ) -> None:
-    """Create puzzle data for a project in the background."""
+    """Create puzzle data for a project in the background, optionally replaying the seed of an earlier run."""
     wordsearch = PuzzleData(project_config=puzzle_config, book_title=wordlist.title, wordlist=wordlist)
+    if seed is not None:
+        wordsearch.seed = seed
     clear_marker_file(puzzle_data_path)
     set_marker_file(puzzle_data_path, 0)
     load_puzzle_data.cache_clear()
-    bg_tasks.add_task(wordsearch.create_and_save_data, puzzle_data_path)
+    bg_tasks.add_task(wordsearch.create_and_save_data, puzzle_data_path, req.state.config.app.puzzle_workers)
 
     return None
 
@@ -129,7 +133,7 @@ def delete_puzzle(
         puzzle = puzzle_data.get_puzzle_by_id(puzzle_id)
     except KeyError:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Puzzle {puzzle_id} not found")
-    puzzle.puzzle_reset()
+    puzzle.reseed()
     puzzle.populate_puzzle()
     puzzle.check_for_inadvertent_profanity()
     puzzle_data.save_data(puzzle_data_path)
@@ -177,8 +181,8 @@ def change_letter_in_puzzle(
         puzzle = puzzle_data.get_puzzle_by_id(puzzle_id)
     except KeyError:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Puzzle {puzzle_id} not found")
-    puzzle.cells[y][x].value = new_letter.letter
-    puzzle.check_for_inadvertent_profanity()
+    puzzle.cells.set_letter(x, y, new_letter.letter)
+    puzzle.recheck_profanity_at(x, y)
     puzzle_data.save_data(puzzle_data_path)
     load_puzzle_data.cache_clear()
     return None
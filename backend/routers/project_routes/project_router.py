@@ -7,6 +7,7 @@ from backend.models import ProjectFolder
 
 from .. import get_project_files
 from .project_manuscript import ProjectManuscriptRouter
+from .project_preview import ProjectPreviewRouter
 from .project_puzzledata import ProjectPuzzleDataRouter
 from .project_settings import ProjectSettingsRouter
 from .project_wordlist import ProjectWordlistRouter
@@ -35,3 +36,4 @@ ProjectRouter.include_router(ProjectSettingsRouter)
 ProjectRouter.include_router(ProjectWordlistRouter)
 ProjectRouter.include_router(ProjectPuzzleDataRouter)
 ProjectRouter.include_router(ProjectManuscriptRouter)
+ProjectRouter.include_router(ProjectPreviewRouter)
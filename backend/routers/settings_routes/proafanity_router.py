@@ -2,10 +2,10 @@ import string
 from pathlib import Path as FilePath
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, status
 
 from backend.models import ProfanityList
-from backend.routers import get_profanity_list_model
+from backend.routers import get_profanity_list_model, get_puzzle_data_paths, rescan_profanity_in_projects
 from backend.utils import get_profanity_list
 
 ProfanityRouter = APIRouter(
@@ -30,12 +30,16 @@ async def profanity_list(profanity_model: Annotated[ProfanityList, Depends(get_p
     path="/",
     response_model=ProfanityList,
     summary="Add a profanity word.",
-    description="Adds a profanity word to the list.",
+    description="Adds a profanity word to the list and re-checks the puzzles of every project in the background.",
     response_description="The updated list of profanity words.",
     status_code=status.HTTP_200_OK,
 )
 async def add_profanity_word(
-    word: str, profanity_model: Annotated[ProfanityList, Depends(get_profanity_list_model)]
+    word: str,
+    profanity_model: Annotated[ProfanityList, Depends(get_profanity_list_model)],
+    req: Request,
+    bg_tasks: BackgroundTasks,
+    puzzle_data_paths: Annotated[list[FilePath], Depends(get_puzzle_data_paths)],
 ) -> ProfanityList:
     if len(word) == 0:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Word cannot be empty.")
@@ -44,6 +48,7 @@ async def add_profanity_word(
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Word already exists in list.")
     profanity_model.word_list.append(word)
     profanity_model.save_profanity_list(FilePath("backend/assets/profanity.txt"))
+    bg_tasks.add_task(rescan_profanity_in_projects, puzzle_data_paths, req.state.config.app.puzzle_workers)
     return ProfanityList(word_list=get_profanity_list())
 
 
@@ -51,10 +56,15 @@ async def add_profanity_word(
     path="/",
     response_model=ProfanityList,
     summary="replace entire profanity list with new list",
-    description="replace entire profanity list with new list",
+    description="replace entire profanity list with new list and re-check the puzzles of every project in the background",
     status_code=status.HTTP_200_OK,
 )
-async def replace_profanity_list(new_list: ProfanityList) -> ProfanityList:
+async def replace_profanity_list(
+    new_list: ProfanityList,
+    req: Request,
+    bg_tasks: BackgroundTasks,
+    puzzle_data_paths: Annotated[list[FilePath], Depends(get_puzzle_data_paths)],
+) -> ProfanityList:
     if not all(isinstance(word, str) for word in new_list.word_list):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="All list items must be strings.")
     new_list.word_list = [
@@ -62,6 +72,7 @@ async def replace_profanity_list(new_list: ProfanityList) -> ProfanityList:
         for x in new_list.word_list
     ]
     new_list.save_profanity_list(FilePath("backend/assets/profanity.txt"))
+    bg_tasks.add_task(rescan_profanity_in_projects, puzzle_data_paths, req.state.config.app.puzzle_workers)
     return ProfanityList(word_list=get_profanity_list())
 
 
@@ -69,15 +80,20 @@ async def replace_profanity_list(new_list: ProfanityList) -> ProfanityList:
     path="/",
     response_model=ProfanityList,
     summary="Remove a profanity word.",
-    description="Removes a profanity word from the list.",
+    description="Removes a profanity word from the list and re-checks the puzzles of every project in the background.",
     status_code=status.HTTP_200_OK,
 )
 async def remove_profanity_word(
-    word: str, profanity_model: Annotated[ProfanityList, Depends(get_profanity_list_model)]
+    word: str,
+    profanity_model: Annotated[ProfanityList, Depends(get_profanity_list_model)],
+    req: Request,
+    bg_tasks: BackgroundTasks,
+    puzzle_data_paths: Annotated[list[FilePath], Depends(get_puzzle_data_paths)],
 ) -> ProfanityList:
     word = word.strip().upper().translate({ord(c): None for c in string.whitespace + string.digits + string.punctuation})
     if word not in profanity_model.word_list:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Word not found in list.")
     profanity_model.word_list.remove(word)
     profanity_model.save_profanity_list(FilePath("backend/assets/profanity.txt"))
+    bg_tasks.add_task(rescan_profanity_in_projects, puzzle_data_paths, req.state.config.app.puzzle_workers)
     return profanity_model
@@ -0,0 +1,26 @@
+import random
+
+from backend.models.enums import DirectionEnum
+from backend.models.filler import ProfanityAwareFiller
+from backend.models.grid import PuzzleGrid
+from backend.utils.automaton import ProfanityAutomaton
+
+from ..test_utils import TestUtils
+
+
+class TestProfanityAwareFiller(TestUtils):
+    def test_fill_never_completes_profanity(self):
+        automaton = ProfanityAutomaton(["E", "TA"])
+        grid = PuzzleGrid(rows=6, columns=6)
+        grid.set_word("TOAST", 0, 0, DirectionEnum.EW)
+        grid.fill_empty(ProfanityAwareFiller(grid=grid, automaton=automaton, rng=random.Random(0)).fill())
+        lines = ["".join(grid.value(x, y) for x, y in coords) for coords in grid.line_coords().values()]
+        assert all(len(list(automaton.search(line + " " + line[::-1]))) == 0 for line in lines)
+
+    def test_fill_keeps_answer_cells(self):
+        grid = PuzzleGrid(rows=3, columns=3)
+        grid.set_word("CAT", 1, 0, DirectionEnum.EW)
+        letters = ProfanityAwareFiller(grid=grid, automaton=ProfanityAutomaton([]), rng=random.Random(0)).fill()
+        assert len(letters) == 6
+        grid.fill_empty(letters)
+        assert "".join(grid.value(x, 1) for x in range(3)) == "CAT"
@@ -0,0 +1,133 @@
+import random
+
+import pytest
+
+from backend.models.cell import Cell
+from backend.models.enums import DirectionEnum
+from backend.models.grid import PuzzleGrid
+
+from ..test_utils import TestUtils
+
+
+class TestPuzzleGrid(TestUtils):
+    @pytest.fixture
+    def grid(self):
+        return PuzzleGrid(rows=4, columns=5)
+
+    def test_new_grid_is_empty(self, grid):
+        assert grid.letters.shape == (4, 5)
+        assert grid.answer_count == 0
+        assert all(cell.value == "." for row in grid.to_cells() for cell in row)
+
+    @pytest.mark.parametrize(
+        "direction, row, col, expected",
+        [
+            (DirectionEnum.EW, 1, 0, [(0, 1), (1, 1), (2, 1)]),
+            (DirectionEnum.NS, 0, 2, [(2, 0), (2, 1), (2, 2)]),
+            (DirectionEnum.NWSE, 0, 0, [(0, 0), (1, 1), (2, 2)]),
+            (DirectionEnum.NESW, 3, 1, [(1, 3), (2, 2), (3, 1)]),
+        ],
+    )
+    def test_set_word_marks_cells(self, grid, direction, row, col, expected):
+        grid.set_word("CAT", row, col, direction)
+        assert grid.answer_count == 3
+        for letter, (x, y) in zip("CAT", expected):
+            cell = grid.cell(x, y)
+            assert cell.value == letter
+            assert cell.is_answer is True
+            assert cell.direction[direction] is True
+
+    def test_can_place_allows_shared_letter_in_other_direction(self, grid):
+        grid.set_word("CAT", 1, 0, DirectionEnum.EW)
+        assert grid.can_place("BAD", 0, 1, DirectionEnum.NS) is True
+        assert grid.can_place("BOD", 0, 1, DirectionEnum.NS) is False
+
+    def test_can_place_rejects_same_direction_overlap(self, grid):
+        grid.set_word("CAT", 1, 0, DirectionEnum.EW)
+        assert grid.can_place("AT", 1, 1, DirectionEnum.EW) is False
+
+    def test_fill_empty_leaves_answers(self, grid):
+        grid.set_word("CAT", 1, 0, DirectionEnum.EW)
+        grid.fill_empty(["Z"] * 17)
+        assert "".join(cell.value for cell in grid.to_cells()[1]) == "CATZZ"
+
+    def test_line_coords_cover_every_line(self, grid):
+        lines = grid.line_coords()
+        assert lines["row0"] == [(0, 0), (1, 0), (2, 0), (3, 0), (4, 0)]
+        assert lines["col4"] == [(4, 0), (4, 1), (4, 2), (4, 3)]
+        assert lines["nwse0-0"] == [(0, 0), (1, 1), (2, 2), (3, 3)]
+        assert lines["swne0-4"] == [(0, 3), (1, 2), (2, 1), (3, 0)]
+        assert len(lines) == 4 + 5 + 2 * (4 + 5 - 1)
+
+    def test_cells_round_trip(self, grid):
+        grid.set_word("CAT", 0, 0, DirectionEnum.NWSE)
+        grid.is_profane[3, 4] = True
+        cells = grid.to_cells()
+        assert all(isinstance(cell, Cell) for row in cells for cell in row)
+        assert PuzzleGrid.from_cells(cells) == grid
+
+    def test_find_slots_matches_exhaustive_search(self, grid):
+        grid.set_word("CAT", 1, 0, DirectionEnum.EW)
+        grid.set_word("TOE", 1, 2, DirectionEnum.NS)
+        expected = set()
+        for direction in DirectionEnum:
+            for word_reversed, spelling in ((False, "ACT"), (True, "TCA")):
+                for row in range(grid.rows):
+                    for col in range(grid.columns):
+                        rr, cc = grid.word_coords(row, col, direction, 3)
+                        in_bounds = rr.min() >= 0 and rr.max() < grid.rows and cc.min() >= 0 and cc.max() < grid.columns
+                        if in_bounds and grid.can_place(spelling, row, col, direction):
+                            expected.add((row, col, direction, word_reversed))
+        assert set(grid.find_slots("ACT")) == expected
+        assert grid.count_slots("ACT") == len(expected)
+
+    def test_slot_cover_is_the_cells_of_every_slot(self, grid):
+        grid.set_word("CAT", 1, 0, DirectionEnum.EW)
+        grid.set_word("TOE", 1, 2, DirectionEnum.NS)
+        slots = grid.find_slots("ACT")
+        count, cover = grid.slot_cover("ACT")
+        assert count == len(slots)
+        expected = 0
+        for slot in slots:
+            expected |= grid.word_mask(slot.row, slot.col, slot.direction, 3)
+        assert cover == expected
+
+    def test_remove_word_undoes_set_word(self, grid):
+        grid.set_word("CAT", 1, 0, DirectionEnum.EW)
+        expected = grid.copy()
+        grid.set_word("TOE", 1, 2, DirectionEnum.NS)
+        grid.remove_word(1, 2, DirectionEnum.NS, 3)
+        assert grid == expected
+        assert grid.find_slots("ACT") == expected.find_slots("ACT")
+        grid.remove_word(1, 0, DirectionEnum.EW, 3)
+        assert grid == PuzzleGrid(rows=4, columns=5)
+        assert grid.find_slots("ACT") == PuzzleGrid(rows=4, columns=5).find_slots("ACT")
+
+    def test_find_slots_empty_when_word_too_long(self, grid):
+        assert grid.find_slots("ELEPHANTS") == []
+
+    def test_pick_slot_returns_a_feasible_slot(self, grid):
+        grid.set_word("CAT", 1, 0, DirectionEnum.EW)
+        slots = set(grid.find_slots("TOE"))
+        rng = random.Random(0)
+        assert {grid.pick_slot("TOE", rng) for _ in range(200)} == slots
+        assert grid.pick_slot("ELEPHANTS", rng) is None
+
+    def test_slots_do_not_wrap_across_rows(self, grid):
+        grid.set_word("ABCDE", 0, 0, DirectionEnum.EW)
+        assert all(slot.col + 3 <= grid.columns for slot in grid.find_slots("EXYZ") if slot.direction == DirectionEnum.EW)
+
+    def test_index_survives_copy_and_round_trip(self, grid):
+        grid.set_word("CAT", 0, 0, DirectionEnum.NWSE)
+        grid.set_word("TOE", 2, 2, DirectionEnum.EW)
+        expected = grid.find_slots("CATS")
+        assert grid.copy().find_slots("CATS") == expected
+        assert PuzzleGrid.from_cells(grid.to_cells()).find_slots("CATS") == expected
+
+    def test_lines_through_match_line_coords(self, grid):
+        lines = grid.line_coords()
+        for y in range(grid.rows):
+            for x in range(grid.columns):
+                through = grid.lines_through(x, y)
+                assert len(through) == 4
+                assert all(lines[name] == coords and (x, y) in coords for name, coords in through.items())
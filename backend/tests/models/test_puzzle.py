@@ -0,0 +1,94 @@
+import pytest
+
+from backend.models.puzzle import Puzzle
+from backend.utils import get_profanity_list
+
+from ..test_utils import TestUtils
+
+
+class TestPuzzle(TestUtils):
+    @pytest.fixture
+    def puzzle(self, project_config):
+        return Puzzle(
+            project_config=project_config,
+            puzzle_id="ANIMALS",
+            puzzle_title="Animals",
+            input_word_list=["Cat", "Guinea Pig", "Elephant", "Guinea-Pig", "Dog"],
+            rows=12,
+            columns=12,
+            seed=7,
+        )
+
+    def test_populate_puzzle_draws_each_word_once_longest_first(self, puzzle, mocker):
+        place_a_word = mocker.patch.object(Puzzle, "place_a_word", return_value=False)
+        puzzle.populate_puzzle()
+        assert [call.args[0] for call in place_a_word.call_args_list][:2] == ["GUINEAPIG", "ELEPHANT"]
+        assert sorted(call.args[0] for call in place_a_word.call_args_list) == ["CAT", "DOG", "ELEPHANT", "GUINEAPIG"]
+
+    def test_populate_puzzle_places_words(self, puzzle):
+        puzzle.populate_puzzle()
+        assert puzzle.puzzle_search_list == ["CAT", "DOG", "ELEPHANT", "GUINEA PIG"]
+        assert puzzle.cells.answer_count > 0
+
+    def test_populate_puzzle_is_reproducible_from_seed(self, puzzle):
+        puzzle.populate_puzzle()
+        first = puzzle.cells.copy()
+        puzzle.puzzle_reset()
+        puzzle.populate_puzzle()
+        assert puzzle.cells == first
+
+    def test_placements_record_every_placed_word(self, puzzle):
+        for build in (puzzle.populate_puzzle, puzzle.solve_puzzle):
+            puzzle.puzzle_reset()
+            build()
+            assert sorted(placement.word for placement in puzzle.placements) == ["CAT", "DOG", "ELEPHANT", "GUINEAPIG"]
+            for placement in puzzle.placements:
+                letters = "".join(puzzle.cells.value(x, y) for x, y in placement.coords())
+                assert letters == (placement.word[::-1] if placement.reversed else placement.word)
+                assert placement.coords()[-1] == placement.end
+        puzzle.puzzle_reset()
+        assert puzzle.placements == []
+
+    def test_check_grid_string_matches_every_substring(self, puzzle):
+        profanity = get_profanity_list()
+        text = "XASSHOLEASSTITANALX"
+        grid_string = [(letter, (x, 0)) for x, letter in enumerate(text)]
+        expected = [
+            (text[i:j], (i, j)) for i in range(len(text)) for j in range(i + 1, len(text) + 1) if text[i:j] in profanity
+        ]
+        found = puzzle._check_grid_string(grid_string, "R")
+        assert [(hit["word"], hit["word_range"]) for hit in found] == expected
+        assert found[0]["coords"] == [(x, 0) for x in range(*found[0]["word_range"])]
+        assert all(hit["direction"] == "R" and hit["accepted"] is False for hit in found)
+
+    def test_recheck_profanity_at_matches_full_check_and_keeps_accepted(self, puzzle):
+        puzzle.populate_puzzle()
+        for x, letter in enumerate("TITS"):
+            puzzle.cells.set_letter(x + 2, 0, letter)
+        puzzle.check_for_inadvertent_profanity()
+        puzzle.profanity["row0"][0]["accepted"] = True
+        puzzle.cells.set_letter(11, 11, "Q")
+        puzzle.recheck_profanity_at(11, 11)
+        assert puzzle.profanity["row0"][0]["accepted"] is True
+        for x, letter in enumerate("ASS"):
+            puzzle.cells.set_letter(x + 5, 5, letter)
+            puzzle.recheck_profanity_at(x + 5, 5)
+        incremental = puzzle.model_copy(deep=True)
+        puzzle.check_for_inadvertent_profanity()
+        for bad_words in incremental.profanity.values():
+            for bad_word in bad_words:
+                bad_word["accepted"] = False
+        assert incremental.profanity == puzzle.profanity
+        assert (incremental.cells.is_profane == puzzle.cells.is_profane).all()
+
+    def test_check_for_inadvertent_profanity_keeps_accepted_hits(self, puzzle):
+        puzzle.populate_puzzle()
+        for x, letter in enumerate("TITS"):
+            puzzle.cells.set_letter(x + 2, 0, letter)
+        puzzle.check_for_inadvertent_profanity()
+        assert puzzle.profanity_is_stale is False
+        puzzle.profanity["row0"][0]["accepted"] = True
+        puzzle.check_for_inadvertent_profanity(keep_accepted=True)
+        assert puzzle.profanity["row0"][0]["accepted"] is True
+        puzzle.check_for_inadvertent_profanity()
+        assert puzzle.profanity["row0"][0]["accepted"] is False
@@ -0,0 +1,116 @@
+import json
+
+import pytest
+
+from backend.models.puzzle_data import PuzzleData
+from backend.models.wordlist import PuzzleInput, Wordlist
+from backend.utils import set_marker_file
+
+from ..test_utils import TestUtils
+
+
+class TestPuzzleData(TestUtils):
+    @pytest.fixture
+    def wordlist(self):
+        topics = {
+            "Animals": ["Cat", "Dog", "Elephant", "Giraffe", "Zebra"],
+            "Fruit": ["Apple", "Banana", "Cherry", "Grape", "Mango"],
+            "Colours": ["Red", "Green", "Blue", "Yellow", "Purple"],
+        }
+        return Wordlist(
+            topic="Test Wordlist",
+            title="Test Wordlist",
+            front_page_introduction="This is a test introduction.",
+            categories=[
+                PuzzleInput(puzzle_topic=topic, word_list=words, introduction="Introduction.", did_you_know="Fact.")
+                for topic, words in topics.items()
+            ],
+        )
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_create_puzzles_keeps_category_order(self, project_config, wordlist, workers, tmp_path):
+        puzzle_data = PuzzleData(project_config=project_config, book_title=wordlist.title, wordlist=wordlist)
+        puzzle_data.create_puzzles(filename=tmp_path / "puzzledata.json", workers=workers)
+        assert [puzzle.puzzle_title for puzzle in puzzle_data.puzzles] == ["Animals", "Fruit", "Colours"]
+        assert all(len(puzzle.puzzle_search_list) > 0 for puzzle in puzzle_data.puzzles)
+
+    def test_create_puzzles_without_categories(self, project_config, wordlist, tmp_path):
+        wordlist.categories = []
+        for workers in (1, 2):
+            puzzle_data = PuzzleData(project_config=project_config, book_title=wordlist.title, wordlist=wordlist)
+            puzzle_data.create_puzzles(filename=tmp_path / "puzzledata.json", workers=workers)
+            assert puzzle_data.puzzles == []
+
+    def test_create_puzzles_is_reproducible_from_seed(self, project_config, wordlist, tmp_path):
+        runs = []
+        for workers in (1, 2):
+            puzzle_data = PuzzleData(project_config=project_config, book_title=wordlist.title, wordlist=wordlist, seed=42)
+            puzzle_data.create_puzzles(filename=tmp_path / "puzzledata.json", workers=workers)
+            runs.append(puzzle_data.model_dump_json())
+        assert runs[0] == runs[1]
+
+    def test_derived_puzzle_seeds_differ_per_puzzle_and_book(self):
+        assert PuzzleData.derive_puzzle_seed(42, "ANIMALS") == PuzzleData.derive_puzzle_seed(42, "ANIMALS")
+        assert PuzzleData.derive_puzzle_seed(42, "ANIMALS") != PuzzleData.derive_puzzle_seed(42, "FRUIT")
+        assert PuzzleData.derive_puzzle_seed(42, "ANIMALS") != PuzzleData.derive_puzzle_seed(43, "ANIMALS")
+
+    def test_create_puzzles_keeps_best_candidate(self, project_config, wordlist, tmp_path):
+        project_config.puzzle_candidates = 3
+        puzzle_data = PuzzleData(project_config=project_config, book_title=wordlist.title, wordlist=wordlist, seed=42)
+        puzzle_data.create_puzzles(filename=tmp_path / "puzzledata.json", workers=2)
+        for puzzle, category in zip(puzzle_data.puzzles, wordlist.categories):
+            candidates = [
+                PuzzleData._create_a_puzzle(project_config, category, seed)
+                for seed in puzzle_data.candidate_seeds(puzzle.puzzle_id)
+            ]
+            assert puzzle.seed in puzzle_data.candidate_seeds(puzzle.puzzle_id)
+            assert puzzle.score == max(candidate.score for candidate in candidates)
+
+    def test_dropping_dominated_candidates_keeps_the_same_puzzles(self, project_config, wordlist, tmp_path):
+        project_config.puzzle_candidates = 3
+        runs = []
+        for workers in (1, 2):
+            puzzle_data = PuzzleData(project_config=project_config, book_title=wordlist.title, wordlist=wordlist, seed=7)
+            puzzle_data.create_puzzles(filename=tmp_path / "puzzledata.json", workers=workers)
+            runs.append(puzzle_data.model_dump_json())
+        assert runs[0] == runs[1]
+
+    def test_is_dominated(self):
+        best = ((0, 1.0, 0.45), 1)
+        assert not PuzzleData._is_dominated((0, 1.0, 0.45), 2, None)
+        assert PuzzleData._is_dominated((0, 1.0, 0.44), 0, best)
+        assert PuzzleData._is_dominated((0, 1.0, 0.45), 2, best)
+        assert not PuzzleData._is_dominated((0, 1.0, 0.45), 0, best)
+        assert not PuzzleData._is_dominated((0, 1.0, 0.46), 2, best)
+
+    def test_single_candidate_uses_puzzle_seed(self, project_config, wordlist):
+        puzzle_data = PuzzleData(project_config=project_config, book_title=wordlist.title, wordlist=wordlist, seed=42)
+        assert puzzle_data.candidate_seeds("ANIMALS") == [PuzzleData.derive_puzzle_seed(42, "ANIMALS")]
+
+    def test_rescan_stale_profanity_only_rewrites_stale_puzzles(self, project_config, wordlist, tmp_path):
+        puzzle_data_path = tmp_path / "puzzledata.json"
+        puzzle_data = PuzzleData(project_config=project_config, book_title=wordlist.title, wordlist=wordlist, seed=42)
+        puzzle_data.create_puzzles(filename=puzzle_data_path)
+        puzzle_data.puzzles[1].profanity_version = "stale"
+        puzzle_data.save_data(puzzle_data_path)
+        written = []
+        assert PuzzleData.rescan_stale_profanity_files([puzzle_data_path], before_write=written.append) == 1
+        assert written == [puzzle_data_path]
+        assert PuzzleData.rescan_stale_profanity(puzzle_data_path) == (0, None)
+        assert not any(path.name.endswith(".marker") for path in tmp_path.iterdir())
+
+    def test_rescan_skips_busy_and_broken_projects(self, project_config, wordlist, tmp_path):
+        paths = []
+        for name in ("broken", "busy", "good"):
+            (tmp_path / name).mkdir()
+            paths.append(tmp_path / name / "puzzledata.json")
+        paths[0].write_text("{")
+        puzzle_data = PuzzleData(project_config=project_config, book_title=wordlist.title, wordlist=wordlist, seed=42)
+        puzzle_data.create_puzzles(filename=paths[2])
+        puzzle_data.puzzles[0].profanity_version = "stale"
+        for path in paths[1:]:
+            puzzle_data.save_data(path)
+        set_marker_file(paths[1], 50)
+        assert PuzzleData.rescan_stale_profanity_files(paths) == 1
+        assert [path.parent.name for path in tmp_path.glob("*/*.marker")] == ["busy"]
+        assert json.loads(paths[1].read_text())["puzzles"][0]["profanity_version"] == "stale"
@@ -0,0 +1,57 @@
+import random
+
+import pytest
+
+from backend.models.grid import PuzzleGrid
+from backend.models.solver import DensitySolver
+
+from ..test_utils import TestUtils
+
+
+class TestDensitySolver(TestUtils):
+    @pytest.fixture
+    def grid(self):
+        return PuzzleGrid(rows=3, columns=3)
+
+    def test_solve_reaches_full_grid(self, grid):
+        solver = DensitySolver(grid=grid, words=["CAT", "ARE", "TEN"], target_cells=9, max_steps=1000, rng=random.Random(0))
+        assert solver.solve() is True
+        assert solver.grid.answer_count == 9
+        assert sorted(solver.placed) == ["ARE", "CAT", "TEN"]
+
+    def test_solve_proves_target_impossible(self, grid):
+        solver = DensitySolver(grid=grid, words=["CAT", "DOG"], target_cells=7, max_steps=1000, rng=random.Random(0))
+        assert solver.solve() is False
+        assert solver.exhausted is False
+        assert solver.grid.answer_count == 0
+
+    def test_backtracking_undoes_placements_in_place(self, grid, mocker):
+        copy = mocker.spy(PuzzleGrid, "copy")
+        solver = DensitySolver(
+            grid=grid, words=["AB", "CD", "EF", "GH", "IJ"], target_cells=9, max_steps=50, rng=random.Random(0)
+        )
+        assert solver.solve() is False
+        assert solver.steps == 50
+        assert copy.call_count == 0
+        assert solver.grid is grid
+        assert grid == PuzzleGrid(rows=3, columns=3)
+
+    def test_solve_stops_at_step_budget(self, grid):
+        solver = DensitySolver(
+            grid=grid, words=["AB", "CD", "EF", "GH", "IJ"], target_cells=9, max_steps=3, rng=random.Random(0)
+        )
+        assert solver.solve() is False
+        assert solver.steps == 3
+
+    def test_extend_stops_at_max_cells(self):
+        solver = DensitySolver(
+            grid=PuzzleGrid(rows=4, columns=4),
+            words=["CAT", "DOG", "EMU"],
+            target_cells=3,
+            max_steps=1000,
+            rng=random.Random(0),
+        )
+        assert solver.solve() is True
+        solver.extend(6)
+        assert solver.grid.answer_count == 6
+        assert len(solver.placed) == 2
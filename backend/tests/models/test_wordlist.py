@@ -48,6 +48,12 @@ class TestCategory(TestUtils):
         with pytest.raises(ValidationError):
             PuzzleInput(**valid_category_data)
 
+    def test_category_check_for_illegal_chars_reports_each_char(self, valid_category_data, logger_mock):
+        valid_category_data["word_list"] = ["Cat", "D&g", "Eleph@nt"]
+        category = PuzzleInput.model_construct(**valid_category_data)
+        assert category.check_for_illegal_chars() == ["&", "@"]
+        assert logger_mock.call_count == 2
+
 
 class TestWordlist(TestUtils):
     @pytest.fixture
@@ -55,8 +61,7 @@ class TestWordlist(TestUtils):
         return mocker.Mock(
             PuzzleInput,
             puzzle_topic="Animals",
-            check_for_illegal_chars=mocker.Mock(return_value=[]),
-            check_profanity=mocker.Mock(return_value=[]),
+            text_fields=mocker.Mock(return_value=[]),
         )
 
     @pytest.fixture
@@ -88,15 +93,34 @@ class TestWordlist(TestUtils):
         assert logger_mock.call_count == 2
         assert result == ["BADWORD", "BADWORD"]
 
-    def test_wordlist_validate_word_lists(self, profanity_mocks, logger_mock, mock_category):
-
-        wordlist = Wordlist(
-            topic="Topic BADWORD", title="Title BADWORD", front_page_introduction="", categories=[mock_category]
+    def test_wordlist_validate_word_lists(self, profanity_mocks, logger_mock):
+        category = PuzzleInput(
+            puzzle_topic="Animals",
+            word_list=["Cat", "Dog", "Elephant"],
+            introduction="Animals are BADWORD.",
+            did_you_know="Animals are vital.",
         )
+        wordlist = Wordlist(topic="Topic BADWORD", title="Title BADWORD", front_page_introduction="", categories=[category])
         result = wordlist.validate_word_lists()
-        assert logger_mock.call_count == 2
-        mock_category.check_for_illegal_chars.assert_called()
-        assert result == {"illegal_chars": [], "profanity": ["BADWORD", "BADWORD"]}
+        assert logger_mock.call_count == 3
+        assert result["illegal_chars"] == []
+        assert result["profanity"] == ["BADWORD", "BADWORD", "BADWORD."]
+        assert [(found["field"], found["start"], found["end"]) for found in result["positions"]] == [
+            ("title", 6, 13),
+            ("topic", 6, 13),
+            ("categories[0].introduction", 12, 20),
+        ]
+
+    def test_wordlist_validate_word_lists_reports_illegal_chars(self, profanity_mocks, logger_mock):
+        category = PuzzleInput.model_construct(
+            puzzle_topic="Animals", word_list=["Cat", "D&g"], introduction="Intro.", did_you_know="Fact."
+        )
+        wordlist = Wordlist.model_construct(topic="Topic", title="Title", front_page_introduction="", categories=[category])
+        result = wordlist.validate_word_lists()
+        assert result["illegal_chars"] == ["&"]
+        assert result["positions"] == [
+            {"issue": "illegal_char", "field": "categories[0].word_list[1]", "start": 1, "end": 2, "value": "&"}
+        ]
 
     def test_wordlist_profanity_list_retrieval(self):
         assert Wordlist.profanity_list() == get_profanity_list()
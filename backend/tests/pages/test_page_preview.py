@@ -0,0 +1,60 @@
+import pytest
+
+from backend.models import PreviewFormatEnum, PreviewPageEnum, PuzzleData
+from backend.models.wordlist import PuzzleInput, Wordlist
+from backend.pages import ContentsPuzzleGrid, ContentsSolution, PagePreview
+
+from ..test_utils import TestUtils
+
+
+class TestPagePreview(TestUtils):
+    @pytest.fixture
+    def puzzle_data(self, project_config, tmp_path):
+        topics = {
+            "Animals": ["Cat", "Dog", "Elephant", "Giraffe", "Zebra"],
+            "Fruit": ["Apple", "Banana", "Cherry", "Grape", "Mango"],
+        }
+        wordlist = Wordlist(
+            topic="Test Wordlist",
+            title="Test Wordlist",
+            front_page_introduction="This is a test introduction.",
+            categories=[
+                PuzzleInput(puzzle_topic=topic, word_list=words, introduction="Introduction.", did_you_know="Fact.")
+                for topic, words in topics.items()
+            ],
+        )
+        puzzle_data = PuzzleData(project_config=project_config, book_title=wordlist.title, wordlist=wordlist, seed=42)
+        puzzle_data.create_puzzles(filename=tmp_path / "puzzledata.json")
+        return puzzle_data
+
+    @pytest.fixture
+    def preview(self, puzzle_data):
+        return PagePreview(word_search_data=puzzle_data, project_config=puzzle_data.project_config, dpi=40)
+
+    def test_find_page(self, preview, puzzle_data):
+        puzzle = puzzle_data.puzzles[1]
+        page_number, contents = preview.find_page(puzzle.puzzle_id, PreviewPageEnum.PUZZLE)
+        assert isinstance(contents, ContentsPuzzleGrid) and contents.puzzle is puzzle
+        assert preview.planned_pages[page_number - 1] is contents
+        _, contents = preview.find_page(puzzle.puzzle_id, PreviewPageEnum.SOLUTION)
+        assert isinstance(contents, ContentsSolution) and puzzle in contents.puzzle_list
+        assert contents.config.dpi == 40
+        assert puzzle_data.project_config.dpi != 40
+        with pytest.raises(KeyError):
+            preview.find_page("missing", PreviewPageEnum.PUZZLE)
+
+    def test_etag_follows_puzzle_content(self, preview, puzzle_data):
+        puzzle_id = puzzle_data.puzzles[0].puzzle_id
+        page_number, contents = preview.find_page(puzzle_id, PreviewPageEnum.PUZZLE)
+        etag = preview.etag(contents, page_number, PreviewFormatEnum.PNG)
+        assert etag == preview.etag(contents, page_number, PreviewFormatEnum.PNG)
+        assert etag != preview.etag(contents, page_number, PreviewFormatEnum.SVG)
+        puzzle_data.puzzles[0].display_title = "1. Different"
+        assert etag != preview.etag(contents, page_number, PreviewFormatEnum.PNG)
+
+    def test_draw_preview(self, preview, puzzle_data):
+        page_number, contents = preview.find_page(puzzle_data.puzzles[0].puzzle_id, PreviewPageEnum.SOLUTION)
+        assert preview.draw_preview(contents, page_number, PreviewFormatEnum.PNG).startswith(b"\x89PNG")
+        svg = preview.draw_preview(contents, page_number, PreviewFormatEnum.SVG)
+        assert svg.startswith(b"<svg") and svg.endswith(b"</svg>")
+        assert puzzle_data.puzzles[0].display_title.replace("&", "&amp;").encode() in svg
@@ -0,0 +1,149 @@
+import json
+import os
+import re
+import warnings
+
+import pytest
+
+from backend.models import PuzzleData
+from backend.models.wordlist import PuzzleInput, Wordlist
+from backend.pages import ContentsBlank, ContentsSolution, PdfImage, PageCache, Pages
+
+from ..test_utils import TestUtils
+
+
+class TestPages(TestUtils):
+    @pytest.fixture
+    def puzzle_data(self, project_config, tmp_path):
+        project_config.dpi = 50
+        topics = {
+            "Animals": ["Cat", "Dog", "Elephant", "Giraffe", "Zebra"],
+            "Fruit": ["Apple", "Banana", "Cherry", "Grape", "Mango"],
+            "Colours": ["Red", "Green", "Blue", "Yellow", "Purple"],
+        }
+        wordlist = Wordlist(
+            topic="Test Wordlist",
+            title="Test Wordlist",
+            front_page_introduction="This is a test introduction.",
+            categories=[
+                PuzzleInput(puzzle_topic=topic, word_list=words, introduction="Introduction.", did_you_know="Fact.")
+                for topic, words in topics.items()
+            ],
+        )
+        puzzle_data = PuzzleData(project_config=project_config, book_title=wordlist.title, wordlist=wordlist, seed=42)
+        puzzle_data.create_puzzles(filename=tmp_path / "puzzledata.json")
+        return puzzle_data
+
+    def test_plan_pages_matches_page_count(self, puzzle_data, tmp_path):
+        pages = Pages(word_search_data=puzzle_data, project_config=puzzle_data.project_config, filename=tmp_path / "m.pdf")
+        planned = pages.plan_pages()
+        assert len(planned) == puzzle_data.page_count
+        assert isinstance(planned[-1], (ContentsBlank, ContentsSolution))
+        solution_pages = [n for n, contents in enumerate(planned, start=1) if isinstance(contents, ContentsSolution)]
+        assert all(planned[n - 1].verso_page == (n % 2 == 0) for n in solution_pages)
+
+    def test_workers_write_the_same_pages_in_order(self, puzzle_data, tmp_path):
+        images = []
+        for workers in (1, 2):
+            filename = tmp_path / f"manuscript_{workers}.pdf"
+            Pages(
+                word_search_data=puzzle_data,
+                project_config=puzzle_data.project_config,
+                filename=filename,
+                workers=workers,
+            ).create_and_save_pages()
+            data = filename.read_bytes()
+            assert f"/Count {puzzle_data.page_count}".encode() in data
+            assert list(tmp_path.glob("manuscript_*.marker")) == []
+            images.append(re.findall(rb"/DCTDecode >>\nstream\n(.*?)\nendstream", data, re.S))
+        assert len(images[0]) == puzzle_data.page_count
+        assert images[0] == images[1]
+
+    def test_failed_build_leaves_no_part_file(self, puzzle_data, tmp_path, mocker):
+        filename = tmp_path / "manuscript.pdf"
+        filename.write_bytes(b"previous build")
+        render_page = Pages.render_page
+        rendered = []
+
+        def fail_second_page(*args):
+            if len(rendered) == 1:
+                raise RuntimeError("render failed")
+            rendered.append(render_page(*args))
+            return rendered[-1]
+
+        mocker.patch.object(Pages, "render_page", side_effect=fail_second_page)
+        pages = Pages(word_search_data=puzzle_data, project_config=puzzle_data.project_config, filename=filename)
+        with pytest.raises(RuntimeError):
+            pages.create_and_save_pages()
+        assert pages.writer is None
+        assert list(tmp_path.glob("*.part")) == []
+        assert filename.read_bytes() == b"previous build"
+
+    def test_page_cache_only_renders_changed_pages(self, puzzle_data, tmp_path, mocker):
+        cache_folder = tmp_path / PageCache.FOLDER
+        filename = tmp_path / "manuscript.pdf"
+        Pages(
+            word_search_data=puzzle_data,
+            project_config=puzzle_data.project_config,
+            filename=filename,
+            cache=PageCache(folder=cache_folder, max_size=10 * 1024**2),
+        ).create_and_save_pages()
+        first = filename.read_bytes()
+        assert len(list(cache_folder.glob("*.page"))) == puzzle_data.page_count
+        render_page = mocker.spy(Pages, "render_page")
+        Pages(
+            word_search_data=puzzle_data,
+            project_config=puzzle_data.project_config,
+            filename=filename,
+            cache=PageCache(folder=cache_folder, max_size=10 * 1024**2),
+        ).create_and_save_pages()
+        assert render_page.call_count == 0
+        assert filename.read_bytes() == first
+        puzzle_data.puzzles[1].display_title = "2. Different"
+        cache = PageCache(folder=cache_folder, max_size=10 * 1024**2)
+        Pages(
+            word_search_data=puzzle_data, project_config=puzzle_data.project_config, filename=filename, cache=cache
+        ).create_and_save_pages()
+        assert render_page.call_count == 2
+        assert cache.misses == 2
+
+    def test_page_cache_evicts_least_recently_used(self, tmp_path):
+        cache = PageCache(folder=tmp_path, max_size=90)
+        for n, key in enumerate(["a", "b", "c"]):
+            cache.put(key, PdfImage(data=b"0" * 10, size=(1, 1), mode="L", filter="FlateDecode"))
+            os.utime(tmp_path / f"{key}.page", (n, n))
+        cache.evict()
+        assert sorted(path.name for path in tmp_path.glob("*.page")) == ["b.page", "c.page"]
+
+    def test_page_cache_discards_damaged_pages(self, tmp_path):
+        cache = PageCache(folder=tmp_path, max_size=10 * 1024**2)
+        page = PdfImage(data=b"0123456789", size=(1, 1), mode="L", filter="FlateDecode")
+        for key in ("truncated", "corrupt", "garbage", "good"):
+            cache.put(key, page)
+        path = tmp_path / "truncated.page"
+        path.write_bytes(path.read_bytes()[:-3])
+        path = tmp_path / "corrupt.page"
+        path.write_bytes(path.read_bytes().replace(b"0123", b"9123"))
+        (tmp_path / "garbage.page").write_bytes(b"\xff\xfe")
+        assert [cache.get(key) for key in ("truncated", "corrupt", "garbage", "good")] == [None, None, None, page]
+        assert (cache.hits, cache.misses) == (1, 3)
+        assert [path.name for path in tmp_path.iterdir()] == ["good.page"]
+
+    def test_solution_thumbnails_are_drawn_at_thumbnail_size(self, puzzle_data, tmp_path, mocker):
+        pages = Pages(word_search_data=puzzle_data, project_config=puzzle_data.project_config, filename=tmp_path / "m.pdf")
+        solution = next(contents for contents in pages.plan_pages() if isinstance(contents, ContentsSolution))
+        scaled = mocker.spy(type(puzzle_data.project_config), "scaled")
+        image = solution.get_content_image()
+        assert image.size == solution.size
+        assert len(scaled.call_args_list) == 2 * len(solution.puzzle_list)
+        config = puzzle_data.project_config
+        scale = min(
+            (solution.size[0] // config.solution_page_cols) / solution.size[0],
+            ((solution.size[1] - config.solution_page_banner_height_pixels) // config.solution_page_rows) / solution.size[1],
+        )
+        assert scaled.call_args_list[0].args[1] == scale
+        thumbnail_config = scaled.spy_return
+        assert isinstance(config.dpi, int) and isinstance(thumbnail_config.dpi, float)
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            assert json.loads(thumbnail_config.model_dump_json())["dpi"] == thumbnail_config.dpi
@@ -0,0 +1,115 @@
+import io
+import re
+import struct
+import zlib
+
+import pytest
+from PIL import Image, ImageText, features
+
+from backend.pages import FONT_FILE, PdfCanvas, PdfFont, PdfImage, PdfWriter, get_font
+
+from ..test_utils import TestUtils
+
+
+class TestPdfWriter(TestUtils):
+    @pytest.fixture
+    def pdf_path(self, tmp_path):
+        return tmp_path / "test.pdf"
+
+    @pytest.fixture
+    def canvas(self, pdf_path):
+        writer = PdfWriter(pdf_path)
+        return PdfCanvas(writer=writer, font=PdfFont(FONT_FILE), size=(300, 600), dpi=150)
+
+    def test_cross_reference_table_points_at_objects(self, pdf_path, canvas):
+        canvas.line(xy=[(0, 0), (10, 10)], fill=(0, 255), width=2)
+        canvas.finish()
+        canvas.writer.close(title="Book (1)")
+        data = pdf_path.read_bytes()
+        assert data.startswith(b"%PDF-1.7")
+        xref_offset = int(re.search(rb"startxref\n(\d+)", data).group(1))
+        entries = re.findall(rb"(\d{10}) 00000 n", data[xref_offset:])
+        for object_id, offset in enumerate(entries, start=1):
+            assert data[int(offset) :].startswith(f"{object_id} 0 obj".encode())
+        assert b"/Count 1" in data
+        assert b"/MediaBox [0 0 144 288]" in data
+        assert b"/Title (Book \\(1\\))" in data
+
+    def test_font_is_embedded_once(self, pdf_path, canvas):
+        text = ImageText.Text(text="ABC", font=get_font(FONT_FILE, 20))
+        canvas.text(xy=(0, 0), text=text, fill=(0, 255))
+        canvas.text(xy=(0, 50), text=text, fill=(0, 255))
+        canvas.finish()
+        canvas.writer.close()
+        data = pdf_path.read_bytes()
+        assert data.count(b"/FontFile2") == 1
+        assert data.count(b"/Subtype /TrueType") == 1
+
+    def test_image_page_is_written_before_close(self, pdf_path):
+        writer = PdfWriter(pdf_path)
+        writer.add_image_page(Image.new("CMYK", (300, 600), (0, 0, 0, 0)), dpi=150)
+        writer.add_image_page(Image.new("RGB", (300, 600), (255, 255, 255)), dpi=150)
+        assert not pdf_path.exists()
+        writer.close()
+        data = pdf_path.read_bytes()
+        assert not pdf_path.with_name("test.pdf.part").exists()
+        assert b"/Count 2" in data
+        assert data.count(b"/Filter /DCTDecode") == 2
+        assert b"/ColorSpace /DeviceCMYK /BitsPerComponent 8 /Decode [1 0 1 0 1 0 1 0]" in data
+        assert data.count(b"/MediaBox [0 0 144 288]") == 2
+
+    def test_black_ink_images_are_lossless(self):
+        image = Image.new("L", (300, 600), 255)
+        image.paste(128, (10, 10, 100, 100))
+        grayscale = PdfImage.from_image(image)
+        assert grayscale.filter == "FlateDecode"
+        assert zlib.decompress(grayscale.data) == image.tobytes()
+        assert "/ColorSpace /DeviceGray /BitsPerComponent 8" in grayscale.entries
+        bilevel = PdfImage.from_image(image.point(lambda value: 255 if value >= 128 else 0, mode="1"))
+        assert bilevel.filter in ("CCITTFaxDecode", "FlateDecode")
+        assert "/ColorSpace /DeviceGray /BitsPerComponent 1" in bilevel.entries
+        assert len(bilevel.data) < len(grayscale.data)
+
+    @staticmethod
+    def _g4_tiff(strip: bytes, size: tuple[int, int]) -> bytes:
+        """Wraps a G4 strip in a minimal single strip TIFF, so Pillow can decode it on its own."""
+        tags = [(256, 4, size[0]), (257, 4, size[1]), (258, 3, 1), (259, 3, 4), (262, 3, 1)]
+        tags += [(273, 4, 8 + 2 + 9 * 12 + 4), (277, 3, 1), (278, 4, size[1]), (279, 4, len(strip))]
+        ifd = struct.pack("<H", len(tags))
+        for tag, tag_type, value in tags:
+            field = struct.pack("<HH", value, 0) if tag_type == 3 else struct.pack("<I", value)
+            ifd += struct.pack("<HHI", tag, tag_type, 1) + field
+        return b"II*\x00" + struct.pack("<I", 8) + ifd + struct.pack("<I", 0) + strip
+
+    @pytest.mark.skipif(not features.check("libtiff"), reason="G4 encoding needs libtiff")
+    def test_bilevel_image_is_the_g4_strip(self):
+        image = Image.new("L", (300, 600), 255)
+        image.paste(0, (10, 10, 100, 100))
+        image.paste(0, (150, 300, 290, 590))
+        bilevel = image.convert("1")
+        encoded = PdfImage.from_image(bilevel)
+        assert encoded.filter == "CCITTFaxDecode"
+        buffer = io.BytesIO()
+        bilevel.save(buffer, format="TIFF", compression="group4", strip_size=38 * 600)
+        with Image.open(buffer) as tiff:
+            assert len(encoded.data) == tiff.tag_v2[279][0]
+        with Image.open(io.BytesIO(self._g4_tiff(encoded.data, bilevel.size))) as decoded:
+            assert decoded.convert("1").tobytes() == bilevel.tobytes()
+
+    def test_text_follows_pillow_anchors(self, pdf_path, canvas):
+        font = get_font(FONT_FILE, 20)
+        ascent, descent = font.getmetrics()
+        canvas.text(xy=(100, 40), text=ImageText.Text(text="AB", font=font), fill=(0, 255), anchor="mm")
+        canvas.text(
+            xy=(100, 80), text=ImageText.Text(text="AB\nA", font=font, spacing=3), fill=(0, 255), anchor="ma", align="left"
+        )
+        canvas.finish()
+        canvas.writer.close()
+        streams = re.findall(rb"stream\n(.*?)\nendstream", pdf_path.read_bytes(), re.S)
+        content = zlib.decompress(streams[-1]).decode()
+        positions = [(float(x), float(y)) for x, y in re.findall(r"1 0 0 -1 (\S+) (\S+) Tm", content)]
+        width = font.getlength("AB")
+        line_spacing = font.getbbox("A")[3] + 3
+        assert positions[0] == pytest.approx((100 - width / 2, 40 + (ascent - descent) / 2), abs=1e-3)
+        assert positions[1] == pytest.approx((100 - width / 2, 80 + ascent), abs=1e-3)
+        assert positions[2] == pytest.approx((100 - width / 2, 80 + ascent + line_spacing), abs=1e-3)
@@ -0,0 +1,18 @@
+from backend.pages import FONT_FILE, PrintParams, get_font
+
+from ..test_utils import TestUtils
+
+
+class TestPrintParams(TestUtils):
+    def test_fonts_are_shared_between_instances(self, project_config):
+        first = PrintParams(project_config=project_config)
+        second = PrintParams(project_config=project_config, print_debug=True)
+        assert first.fonts["CELL_FONT"] is second.fonts["CELL_FONT"]
+        assert first.fonts["CELL_FONT"] is get_font(FONT_FILE, project_config.cell_font_size_pixels)
+        assert first.fonts["CELL_DEBUG_FONT"].size == project_config.cell_font_size_pixels // 2
+
+    def test_fonts_are_loaded_lazily(self, project_config, mocker):
+        get_font_mock = mocker.patch("backend.pages.print_params.get_font")
+        params = PrintParams(project_config=project_config)
+        get_font_mock.assert_not_called()
+        assert params.fonts["TITLE_FONT"] is get_font_mock.return_value
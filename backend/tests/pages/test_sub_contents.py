@@ -1,10 +1,12 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
 from math import ceil
 
 import pytest
-from PIL import Image
+from PIL import Image, ImageFont, ImageText
 
-from backend.models import BoardImageEnum, DirectionEnum
-from backend.pages import SubContentsCell
+from backend.models import BoardImageEnum, Cell, DirectionEnum, LayoutEnum, PuzzleGrid
+from backend.pages import FONT_FILE, GlyphAtlas, SubContentsCell, SubContentsGrid, SubContentsSearchList, get_font
 
 from ..test_utils import TestUtils
 
@@ -75,3 +77,125 @@ class TestSubContentsCell(TestUtils):
         image = instance_solution.get_content_image()
         assert isinstance(image, Image.Image)
         assert image.size == solution_cell_size
+
+
+class TestGlyphAtlas(TestUtils):
+    """Test class for GlyphAtlas"""
+
+    def test_get_atlas_is_shared_per_key(self, project_config):
+        atlas = GlyphAtlas.get_atlas(cell_size=50, grid_type=BoardImageEnum.PUZZLE, project_config=project_config)
+        assert GlyphAtlas.get_atlas(cell_size=50, grid_type=BoardImageEnum.PUZZLE, project_config=project_config) is atlas
+        assert GlyphAtlas.get_atlas(cell_size=51, grid_type=BoardImageEnum.PUZZLE, project_config=project_config) is not atlas
+        assert (
+            GlyphAtlas.get_atlas(
+                cell_size=50, grid_type=BoardImageEnum.PUZZLE, project_config=project_config, print_debug=True
+            )
+            is not atlas
+        )
+
+    def test_get_atlas_builds_each_atlas_once_across_threads(self, project_config, mocker):
+        init = GlyphAtlas.__init__
+
+        def slow_init(*args, **kwargs):
+            time.sleep(0.05)
+            init(*args, **kwargs)
+
+        built = mocker.patch.object(GlyphAtlas, "__init__", side_effect=slow_init, autospec=True)
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            atlases = list(
+                pool.map(
+                    lambda _: GlyphAtlas.get_atlas(
+                        cell_size=47, grid_type=BoardImageEnum.PUZZLE, project_config=project_config
+                    ),
+                    range(4),
+                )
+            )
+        assert built.call_count == 1
+        assert all(atlas is atlases[0] for atlas in atlases)
+
+    def test_get_tile_renders_each_tile_once(self, project_config, mocker):
+        atlas = GlyphAtlas(cell_size=50, grid_type=BoardImageEnum.SOLUTION, project_config=project_config, print_debug=False)
+        render = mocker.spy(SubContentsCell, "get_content_image")
+        tile = atlas.get_tile("A", 2)
+        assert atlas.get_tile("A", 2) is tile
+        assert atlas.get_tile("A", 0) is not tile
+        assert render.call_count == 2
+
+    def test_get_tile_matches_cell_rendering(self, project_config):
+        atlas = GlyphAtlas(cell_size=50, grid_type=BoardImageEnum.SOLUTION, project_config=project_config, print_debug=False)
+        cell = Cell(
+            loc_x=0,
+            loc_y=0,
+            value="Q",
+            direction={DirectionEnum.NS: True, DirectionEnum.EW: False, DirectionEnum.NESW: True, DirectionEnum.NWSE: False},
+        )
+        expected = SubContentsCell(
+            cell=cell, cell_size=50, grid_type=BoardImageEnum.SOLUTION, project_config=project_config
+        ).get_content_image()
+        assert atlas.get_tile("Q", 5).tobytes() == expected.tobytes()
+
+    @pytest.mark.parametrize("cell_size", [4, 9, 10, 50])
+    def test_solution_tiles_match_the_grid_stroke(self, project_config, cell_size):
+        grid = SubContentsGrid(
+            rows=2,
+            cols=2,
+            cells=PuzzleGrid(rows=2, columns=2),
+            cell_size=cell_size,
+            grid_type=BoardImageEnum.SOLUTION,
+            project_config=project_config,
+        )
+        atlas = GlyphAtlas(
+            cell_size=cell_size, grid_type=BoardImageEnum.SOLUTION, project_config=project_config, print_debug=False
+        )
+        assert atlas.get_tile("A", 0).size == (cell_size + grid.tile_pad, cell_size + grid.tile_pad)
+        assert grid.stroke_width >= 1
+
+
+class TestSubContentsSearchList(TestUtils):
+    """Test class for SubContentsSearchList"""
+
+    @pytest.fixture
+    def wordlist(self):
+        return ["EDINBURGH CASTLE", "LOCH NESS", "BEN NEVIS", "SKYE", "GLENCOE", "HOLYROOD", "STIRLING", "IONA"] * 3
+
+    @staticmethod
+    def linear_fit(search_list: SubContentsSearchList) -> tuple[int, int]:
+        """Fits the search list the slow way, one pixel at a time measuring every column of text."""
+        for font_size in range(search_list.fonts["SEARCH_LIST_FONT"].size - 1, 0, -1):
+            font = get_font(FONT_FILE, font_size)
+            line_height = int(ImageText.Text(text=search_list.wordlist[0], font=font).get_bbox()[3])
+            rows = int(search_list.size[1] / (line_height + search_list.config.wordlist_line_spacing_pixels))
+            columns = max(ceil(len(search_list.wordlist) / rows), 3)
+            chunk = ceil(len(search_list.wordlist) / columns)
+            texts = [
+                ImageText.Text(text="\n".join(search_list.wordlist[n * chunk : (n + 1) * chunk]), font=font)
+                for n in range(columns)
+            ]
+            if all(text.get_bbox()[2] <= search_list.config.content_width_pixels // columns for text in texts):
+                return font_size, columns
+        raise ValueError("wordlist font too small")
+
+    @pytest.mark.parametrize("layout", [LayoutEnum.SINGLE, LayoutEnum.DOUBLE])
+    @pytest.mark.parametrize("dpi", [150, 300, 800])
+    def test_fit_matches_linear_search(self, project_config, wordlist, layout, dpi):
+        project_config.dpi = dpi
+        search_list = SubContentsSearchList(wordlist=wordlist, project_config=project_config, layout_type=layout)
+        column_width, columns = search_list._calculate_font_size()
+        font_size, number_of_columns = self.linear_fit(search_list)
+        assert (columns[0].font.size, len(columns)) == (font_size, number_of_columns)
+        assert column_width == project_config.content_width_pixels // number_of_columns
+
+    def test_shaped_words_are_measured_once_per_size(self, mocker):
+        font = mocker.Mock(layout_engine=ImageFont.Layout.RAQM, getbbox=mocker.Mock(return_value=(0, 0, 42, 10)))
+        mocker.patch("backend.pages.sub_contents.get_font", return_value=font)
+        SubContentsSearchList._shaped_word_right.cache_clear()
+        assert [SubContentsSearchList._word_right(17, "LOCH NESS") for _ in range(3)] == [42, 42, 42]
+        SubContentsSearchList._word_right(18, "LOCH NESS")
+        assert font.getbbox.call_count == 2
+        SubContentsSearchList._shaped_word_right.cache_clear()
+
+    def test_fit_is_reused_for_the_same_wordlist(self, project_config, wordlist, mocker):
+        SubContentsSearchList(wordlist=wordlist, project_config=project_config)._calculate_font_size()
+        columns = mocker.spy(SubContentsSearchList, "_wordlist_columns")
+        SubContentsSearchList(wordlist=list(wordlist), project_config=project_config)._calculate_font_size()
+        assert columns.call_count == 0
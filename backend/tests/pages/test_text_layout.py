@@ -0,0 +1,38 @@
+import pytest
+
+from backend.pages import FONT_FILE, SubContentsLongFact, get_font, layout_paragraph, word_length
+
+from ..test_utils import TestUtils
+
+
+class TestTextLayout(TestUtils):
+    @pytest.fixture
+    def font(self):
+        return get_font(FONT_FILE, 20)
+
+    @pytest.fixture
+    def text(self):
+        return (
+            "Scotland has over 790 islands, of which around 130 are inhabited. The largest is Lewis and Harris, "
+            "and the smallest inhabited island is Inchcolm in the Firth of Forth."
+        )
+
+    def test_lines_fit_and_keep_every_word(self, font, text):
+        lines = layout_paragraph(text, font, 300)
+        assert len(lines) > 1
+        assert " ".join(lines).split() == text.split()
+        assert all(font.getlength(line) < 300 for line in lines)
+        assert all(font.getlength(f"{line} {lines[n + 1].split()[0]}") >= 300 for n, line in enumerate(lines[:-1]))
+
+    def test_long_word_gets_its_own_line(self, font):
+        assert layout_paragraph("a supercalifragilistic word", font, 50) == ("a", "supercalifragilistic", "word")
+
+    def test_layout_is_reused(self, font, text, mocker):
+        layout_paragraph(text, font, 250)
+        length = mocker.patch("backend.pages.text_layout.word_length", wraps=word_length)
+        assert layout_paragraph(text, font, 250) == layout_paragraph(text, font, 250)
+        assert length.call_count == 0
+
+    def test_long_fact_keeps_final_line(self, project_config, text):
+        long_fact = SubContentsLongFact(long_fact=text, project_config=project_config)
+        assert long_fact._get_paragraph(text).text.split()[-1] == "Forth."
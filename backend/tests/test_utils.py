@@ -21,6 +21,7 @@ class TestUtils:
     @pytest.fixture
     def profanity_mocks(self, mocker, bad_words):
         profanity_check = mocker.patch("backend.models.wordlist.WordlistBase.profanity_list", return_value=bad_words)
+        mocker.patch("backend.models.wordlist.WordlistBase.profanity_index", return_value=frozenset(bad_words))
         return profanity_check
 
     @pytest.fixture
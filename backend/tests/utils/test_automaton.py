@@ -0,0 +1,21 @@
+from backend.utils.automaton import ProfanityAutomaton
+
+from ..test_utils import TestUtils
+
+
+class TestProfanityAutomaton(TestUtils):
+    def test_search_finds_overlapping_matches(self):
+        automaton = ProfanityAutomaton(["HE", "SHE", "HERS", "HIS"])
+        assert sorted(automaton.search("USHERS")) == [(1, 4, "SHE"), (2, 4, "HE"), (2, 6, "HERS")]
+
+    def test_search_matches_every_substring(self):
+        words = ["AB", "BAB", "ABABA", "B"]
+        automaton = ProfanityAutomaton(words)
+        text = "XABABABY"
+        expected = {(i, j, text[i:j]) for i in range(len(text)) for j in range(i + 1, len(text) + 1) if text[i:j] in words}
+        assert set(automaton.search(text)) == expected
+
+    def test_empty_words_are_ignored(self):
+        automaton = ProfanityAutomaton(["", "CAT"])
+        assert list(automaton.search("DOG")) == []
+        assert automaton.max_length == 3
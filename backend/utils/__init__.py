@@ -1,7 +1,9 @@
+import hashlib
 import string
 from functools import lru_cache
 from pathlib import Path as FilePath
 
+from .automaton import ProfanityAutomaton
 from .config import AIConfig, AppConfig, Config  # noqa: F401
 from .logging import Logger  # noqa: F401
 
@@ -30,6 +32,21 @@ def get_profanity_list() -> list[str]:
     return profanity_list
 
 
+@lru_cache(maxsize=1)
+def get_profanity_index() -> frozenset[str]:
+    return frozenset(get_profanity_list())
+
+
+@lru_cache(maxsize=1)
+def get_profanity_version() -> str:
+    return hashlib.sha256("\n".join(get_profanity_list()).encode()).hexdigest()[:16]
+
+
+@lru_cache(maxsize=1)
+def get_profanity_automaton() -> ProfanityAutomaton:
+    return ProfanityAutomaton(get_profanity_list())
+
+
 def _creat_dist_file_if_not_exists(dist_path: FilePath, target_path: FilePath):
     if not target_path.exists():
         with open(dist_path, "r") as fd:
@@ -55,3 +72,7 @@ def set_marker_file(filename: FilePath, percentage: int):
 def clear_marker_file(filename: FilePath):
     for p in filename.parent.glob(f"{filename.name}.*.marker"):
         p.unlink()
+
+
+def has_marker_file(filename: FilePath) -> bool:
+    return any(filename.parent.glob(f"{filename.name}.*.marker"))
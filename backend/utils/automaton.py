@@ -0,0 +1,67 @@
+from collections import deque
+from typing import Iterable, Iterator
+
+
+class ProfanityAutomaton:
+    """
+    Aho-Corasick automaton over a list of words, used to find every occurrence of any of the
+    words in a string with a single pass over its characters.
+
+    :ivar max_length: The length of the longest word in the automaton.
+    :type max_length: int
+    """
+
+    def __init__(self, words: Iterable[str]) -> None:
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._output: list[tuple[str, ...]] = [()]
+        self.max_length: int = 0
+        for word in words:
+            if len(word) > 0:
+                self._add_word(word)
+        self._build_failure_links()
+
+    def _add_word(self, word: str) -> None:
+        state = 0
+        for char in word:
+            if char not in self._goto[state]:
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+                self._goto[state][char] = len(self._goto) - 1
+            state = self._goto[state][char]
+        if word not in self._output[state]:
+            self._output[state] += (word,)
+        self.max_length = max(self.max_length, len(word))
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while len(queue) > 0:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                queue.append(child)
+                self._fail[child] = self.step(self._fail[state], char) if state > 0 else 0
+                self._output[child] += self._output[self._fail[child]]
+
+    def step(self, state: int, char: str) -> int:
+        """Returns the state reached from ``state`` by reading ``char``."""
+        while state > 0 and char not in self._goto[state]:
+            state = self._fail[state]
+        return self._goto[state].get(char, 0)
+
+    def matches(self, state: int) -> tuple[str, ...]:
+        """Returns the words that end at the last character read to reach ``state``."""
+        return self._output[state]
+
+    def search(self, text: str) -> Iterator[tuple[int, int, str]]:
+        """
+        Finds every occurrence of the words in ``text``, overlapping ones included.
+
+        :param text: The string to search.
+        :return: ``(start, end, word)`` for each occurrence, with ``end`` exclusive, in order of ``end``.
+        """
+        state = 0
+        for index, char in enumerate(text):
+            state = self.step(state, char)
+            for word in self._output[state]:
+                yield index + 1 - len(word), index + 1, word
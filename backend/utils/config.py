@@ -13,6 +13,11 @@ class AppConfig(BaseModel):
     data_filename: str = Field(default="puzzledata.json", description="The data file for the application.")
     output_filename: str = Field(default="manuscript.pdf", description="The output file for the application.")
     frontend_host_for_cors: str = Field(default="http://localhost:5001", description="The frontend host for CORS.")
+    puzzle_workers: int = Field(default=1, ge=1, description="The number of processes used to generate puzzles.")
+    render_workers: int = Field(default=1, ge=1, description="The number of processes used to render manuscript pages.")
+    page_cache_size: int = Field(
+        default=256, ge=0, description="The maximum size in MB of the rendered page cache of a project, 0 turns it off."
+    )
 
 
 class AIConfig(BaseModel):
@@ -15,6 +15,13 @@ export interface FoundProfanity {
   coords: number[][]
 }
 
+export interface WordPlacement {
+  word: string
+  start: number[]
+  direction: string
+  reversed: boolean
+}
+
 export interface PuzzleData {
   project_config: Record<string, string | number | boolean>
   puzzle_id: string
@@ -27,8 +34,11 @@ export interface PuzzleData {
   columns: number
   cells: Cell[][]
   puzzle_search_list: string[]
+  placements: WordPlacement[]
   density: number
   profanity: Record<string, FoundProfanity[]>
+  profanity_version: string
+  seed: number
 }
 
 export interface PuzzleBaseData {